@@ -1,10 +1,12 @@
 from django.contrib import admin
 
+from base.admin import LargeTableAdmin
+
 from .models import Account
 
 
 @admin.register(Account)
-class AccountAdmin(admin.ModelAdmin):
+class AccountAdmin(LargeTableAdmin):
     list_display = (
         "id",
         "total_donations_in_usd",
@@ -14,11 +16,9 @@ class AccountAdmin(admin.ModelAdmin):
         "near_social_profile_data",
     )
     search_fields = ("id",)  # Allow searching by account address
-    list_filter = (
-        "total_donations_in_usd",
-        "total_donations_out_usd",
-    )  # Filter by donation amounts
+    readonly_fields = ("search_text",)  # derived from the ID and profile on save
     ordering = ("-total_donations_in_usd",)  # Default ordering
+    raw_id_fields = ("chain",)
 
     # Optionally, format decimal fields for better readability in the admin
     def total_donations_in_usd_display(self, obj):
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Exists, OuterRef
 from django.utils import timezone
 from django.utils.decorators import method_decorator
@@ -17,12 +19,14 @@ from rest_framework.views import APIView
 from api.pagination import pagination_parameters
 from api.pagination import CustomSizePageNumberPagination
 from base.logging import logger
+from base.serializers import sparse_fieldset_parameters, sparse_queryset
 from donations.models import Donation
 from donations.serializers import (
     PAGINATED_DONATION_EXAMPLE,
     DonationSerializer,
     PaginatedDonationsResponseSerializer,
 )
+from donations.utils import donation_filter_parameters, filter_donations
 from lists.models import ListRegistration, ListRegistrationStatus
 from lists.serializers import PAGINATED_LIST_REGISTRATION_EXAMPLE, ListRegistrationSerializer, PaginatedListRegistrationsResponseSerializer
 from pots.models import Pot, PotApplication, PotApplicationStatus, PotPayout
@@ -40,12 +44,19 @@ from pots.serializers import (
 
 from .models import Account
 from .serializers import (
+    ACCOUNT_BATCH_EXAMPLE,
     PAGINATED_ACCOUNT_EXAMPLE,
     SIMPLE_ACCOUNT_EXAMPLE,
+    AccountBatchRequestSerializer,
+    AccountBatchResponseSerializer,
     AccountSerializer,
     PaginatedAccountsResponseSerializer,
 )
 
+ACCOUNT_DATA_KEY = "account_data:{account_id}"
+# cached for IDs with no account, so repeated lookups of them skip the query
+ACCOUNT_NOT_FOUND = "not_found"
+
 
 class DonorsAPI(APIView, CustomSizePageNumberPagination):
 
@@ -58,6 +69,7 @@ class DonorsAPI(APIView, CustomSizePageNumberPagination):
                 description="Sort by field, e.g., most_donated_usd",
             ),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -87,8 +99,9 @@ class DonorsAPI(APIView, CustomSizePageNumberPagination):
                 "-total_donations_out_usd"
             )  # TODO: this field name might be changing
         # TODO: add more sort options
+        donor_accounts = sparse_queryset(donor_accounts, request)
         results = self.paginate_queryset(donor_accounts, request, view=self)
-        serializer = AccountSerializer(results, many=True)
+        serializer = AccountSerializer(results, many=True, context={"request": request})
         return self.get_paginated_response(serializer.data)
 
 
@@ -97,6 +110,7 @@ class AccountsListAPI(APIView, CustomSizePageNumberPagination):
     @extend_schema(
         parameters=[
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -118,8 +132,9 @@ class AccountsListAPI(APIView, CustomSizePageNumberPagination):
     @method_decorator(cache_page(60 * 5))
     def get(self, request: Request, *args, **kwargs):
         accounts = Account.objects.all()
+        accounts = sparse_queryset(accounts, request)
         results = self.paginate_queryset(accounts, request, view=self)
-        serializer = AccountSerializer(results, many=True)
+        serializer = AccountSerializer(results, many=True, context={"request": request})
         return self.get_paginated_response(serializer.data)
 
 
@@ -128,6 +143,7 @@ class AccountDetailAPI(APIView):
     @extend_schema(
         parameters=[
             OpenApiParameter("account_id", str, OpenApiParameter.PATH),
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -156,10 +172,125 @@ class AccountDetailAPI(APIView):
             return Response(
                 {"message": f"Account with ID {account_id} not found."}, status=404
             )
-        serializer = AccountSerializer(account)
+        serializer = AccountSerializer(account, context={"request": request})
         return Response(serializer.data)
 
 
+account_batch_responses = {
+    200: OpenApiResponse(
+        response=AccountBatchResponseSerializer,
+        description="Returns the accounts by ID",
+        examples=[
+            OpenApiExample(
+                "example-1",
+                summary="Simple example",
+                description="Example response for a batch account lookup",
+                value=ACCOUNT_BATCH_EXAMPLE,
+                response_only=True,
+            ),
+        ],
+    ),
+    400: OpenApiResponse(description="Missing or too many account IDs"),
+    500: OpenApiResponse(description="Internal server error"),
+}
+
+
+class AccountsBatchAPI(APIView):
+    """Looks up many accounts at once (from the cache, then with a single query for the rest)."""
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "account_ids",
+                str,
+                OpenApiParameter.QUERY,
+                required=True,
+                description=f"Comma-separated account IDs (max {settings.ACCOUNT_BATCH_MAX_ACCOUNTS})",
+            ),
+        ],
+        responses=account_batch_responses,
+    )
+    def get(self, request: Request, *args, **kwargs):
+        return self.get_accounts(request.query_params.get("account_ids", "").split(","))
+
+    @extend_schema(
+        request=AccountBatchRequestSerializer,
+        responses=account_batch_responses,
+    )
+    def post(self, request: Request, *args, **kwargs):
+        account_ids = (
+            request.data.get("account_ids") if isinstance(request.data, dict) else None
+        )
+        if not isinstance(account_ids, list) or not all(
+            isinstance(account_id, str) for account_id in account_ids
+        ):
+            return Response(
+                {"message": "account_ids must be a list of account IDs."}, status=400
+            )
+        return self.get_accounts(account_ids)
+
+    def get_accounts(self, account_ids):
+        account_ids = list(
+            dict.fromkeys(
+                account_id.strip() for account_id in account_ids if account_id.strip()
+            )
+        )
+        if not account_ids:
+            return Response({"message": "account_ids is required."}, status=400)
+        if len(account_ids) > settings.ACCOUNT_BATCH_MAX_ACCOUNTS:
+            return Response(
+                {
+                    "message": f"At most {settings.ACCOUNT_BATCH_MAX_ACCOUNTS} accounts can be looked up at once."
+                },
+                status=400,
+            )
+
+        keys = {
+            account_id: ACCOUNT_DATA_KEY.format(account_id=account_id)
+            for account_id in account_ids
+        }
+        cached = cache.get_many(keys.values())
+        accounts = {
+            account_id: cached[key] for account_id, key in keys.items() if key in cached
+        }
+        missing = [
+            account_id for account_id in account_ids if account_id not in accounts
+        ]
+        # IDs known not to exist stay out of the query (and come back as null)
+        accounts = {
+            account_id: account
+            for account_id, account in accounts.items()
+            if account != ACCOUNT_NOT_FOUND
+        }
+        if missing:
+            found = {
+                account["id"]: account
+                for account in AccountSerializer(
+                    Account.objects.filter(id__in=missing), many=True
+                ).data
+            }
+            cache.set_many(
+                {keys[account_id]: account for account_id, account in found.items()},
+                settings.ACCOUNT_BATCH_CACHE_TIMEOUT,
+            )
+            cache.set_many(
+                {
+                    keys[account_id]: ACCOUNT_NOT_FOUND
+                    for account_id in missing
+                    if account_id not in found
+                },
+                settings.ACCOUNT_BATCH_NEGATIVE_CACHE_TIMEOUT,
+            )
+            accounts.update(found)
+        return Response(
+            {
+                "accounts": {
+                    account_id: accounts.get(account_id) for account_id in account_ids
+                }
+            }
+        )
+
+
 class AccountActivePotsAPI(APIView, CustomSizePageNumberPagination):
 
     @extend_schema(
@@ -173,6 +304,7 @@ class AccountActivePotsAPI(APIView, CustomSizePageNumberPagination):
                 description="Filter by pot status",
             ),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -207,13 +339,18 @@ class AccountActivePotsAPI(APIView, CustomSizePageNumberPagination):
             applicant=account, status=PotApplicationStatus.APPROVED
         )
         pot_ids = applications.values_list("pot_id", flat=True)
-        pots = Pot.objects.filter(account__in=pot_ids)
+        pots = (
+            Pot.objects.filter(account__in=pot_ids)
+            .select_related("deployer", "owner", "chef")
+            .prefetch_related("admins")
+        )
         if request.query_params.get("status") == "live":
             pots = pots.filter(
                 matching_round_start__lte=now, matching_round_end__gte=now
             )
+        pots = sparse_queryset(pots, request)
         results = self.paginate_queryset(pots, request, view=self)
-        serializer = PotSerializer(results, many=True)
+        serializer = PotSerializer(results, many=True, context={"request": request})
         return self.get_paginated_response(serializer.data)
 
 
@@ -229,6 +366,7 @@ class AccountPotApplicationsAPI(APIView, CustomSizePageNumberPagination):
                 description="Filter pot applications by status",
             ),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -259,7 +397,11 @@ class AccountPotApplicationsAPI(APIView, CustomSizePageNumberPagination):
                 {"message": f"Account with ID {account_id} not found."}, status=404
             )
 
-        applications = PotApplication.objects.filter(applicant=account)
+        applications = (
+            PotApplication.objects.filter(applicant=account)
+            .select_related("applicant", "pot__deployer", "pot__owner", "pot__chef")
+            .prefetch_related("pot__admins")
+        )
         status_param = request.query_params.get("status")
         if status_param:
             if status_param not in PotApplicationStatus.values:
@@ -267,8 +409,11 @@ class AccountPotApplicationsAPI(APIView, CustomSizePageNumberPagination):
                     {"message": f"Invalid status value: {status_param}"}, status=400
                 )
             applications = applications.filter(status=status_param)
+        applications = sparse_queryset(applications, request)
         results = self.paginate_queryset(applications, request, view=self)
-        serializer = PotApplicationSerializer(results, many=True)
+        serializer = PotApplicationSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
 
 
@@ -277,7 +422,9 @@ class AccountDonationsReceivedAPI(APIView, CustomSizePageNumberPagination):
     @extend_schema(
         parameters=[
             OpenApiParameter("account_id", str, OpenApiParameter.PATH),
+            *donation_filter_parameters,
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -293,6 +440,7 @@ class AccountDonationsReceivedAPI(APIView, CustomSizePageNumberPagination):
                     ),
                 ],
             ),
+            400: OpenApiResponse(description="Invalid filter or ordering value"),
             404: OpenApiResponse(description="Account not found"),
             500: OpenApiResponse(description="Internal server error"),
         },
@@ -307,9 +455,27 @@ class AccountDonationsReceivedAPI(APIView, CustomSizePageNumberPagination):
                 {"message": f"Account with ID {account_id} not found."}, status=404
             )
 
-        donations = Donation.objects.prefetch_related('donor', 'pot', 'recipient', 'referrer', 'chef', 'token').filter(recipient=account)
+        donations = Donation.objects.prefetch_related(
+            "donor",
+            "pot",
+            "recipient",
+            "referrer",
+            "chef",
+            "token",
+            "pot__deployer",
+            "pot__owner",
+            "pot__chef",
+            "pot__admins",
+        ).filter(recipient=account)
+        try:
+            donations = filter_donations(donations, request.query_params)
+        except ValueError as e:
+            return Response({"message": str(e)}, status=400)
+        donations = sparse_queryset(donations, request)
         results = self.paginate_queryset(donations, request, view=self)
-        serializer = DonationSerializer(results, many=True)
+        serializer = DonationSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
 
 
@@ -318,7 +484,9 @@ class AccountDonationsSentAPI(APIView, CustomSizePageNumberPagination):
     @extend_schema(
         parameters=[
             OpenApiParameter("account_id", str, OpenApiParameter.PATH),
+            *donation_filter_parameters,
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -334,6 +502,7 @@ class AccountDonationsSentAPI(APIView, CustomSizePageNumberPagination):
                     ),
                 ],
             ),
+            400: OpenApiResponse(description="Invalid filter or ordering value"),
             404: OpenApiResponse(description="Account not found"),
             500: OpenApiResponse(description="Internal server error"),
         },
@@ -348,9 +517,22 @@ class AccountDonationsSentAPI(APIView, CustomSizePageNumberPagination):
                 {"message": f"Account with ID {account_id} not found."}, status=404
             )
 
-        donations = Donation.objects.select_related('donor', 'pot', 'recipient', 'referrer', 'chef', 'token').prefetch_related('pot__admins').filter(donor=account) #TODO:  this takes more time than just doing a  prefetch_related for the fields.
+        donations = (
+            Donation.objects.select_related(
+                "donor", "pot", "recipient", "referrer", "chef", "token"
+            )
+            .prefetch_related("pot__deployer", "pot__owner", "pot__chef", "pot__admins")
+            .filter(donor=account)
+        )  # TODO:  this takes more time than just doing a  prefetch_related for the fields.
+        try:
+            donations = filter_donations(donations, request.query_params)
+        except ValueError as e:
+            return Response({"message": str(e)}, status=400)
+        donations = sparse_queryset(donations, request)
         results = self.paginate_queryset(donations, request, view=self)
-        serializer = DonationSerializer(results, many=True)
+        serializer = DonationSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
 
 
@@ -360,6 +542,7 @@ class AccountPayoutsReceivedAPI(APIView, CustomSizePageNumberPagination):
         parameters=[
             OpenApiParameter("account_id", str, OpenApiParameter.PATH),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -389,9 +572,16 @@ class AccountPayoutsReceivedAPI(APIView, CustomSizePageNumberPagination):
                 {"message": f"Account with ID {account_id} not found."}, status=404
             )
 
-        payouts = PotPayout.objects.filter(recipient=account, paid_at__isnull=False)
+        payouts = PotPayout.objects.filter(
+            recipient=account, paid_at__isnull=False
+        ).select_related(
+            "recipient", "token", "pot__deployer", "pot__owner", "pot__chef"
+        )
+        payouts = sparse_queryset(payouts, request)
         results = self.paginate_queryset(payouts, request, view=self)
-        serializer = PotPayoutSerializer(results, many=True)
+        serializer = PotPayoutSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
 
 
@@ -401,6 +591,7 @@ class AccountListRegistrationsAPI(APIView, CustomSizePageNumberPagination):
         parameters=[
             OpenApiParameter("account_id", str, OpenApiParameter.PATH),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -430,7 +621,9 @@ class AccountListRegistrationsAPI(APIView, CustomSizePageNumberPagination):
                 {"message": f"Account with ID {account_id} not found."}, status=404
             )
 
-        registrations = ListRegistration.objects.filter(registrant=account)
+        registrations = ListRegistration.objects.filter(
+            registrant=account
+        ).select_related("registrant", "registered_by", "list__owner")
         status_param = request.query_params.get("status")
         if status_param:
             if status_param not in ListRegistrationStatus.values:
@@ -438,6 +631,9 @@ class AccountListRegistrationsAPI(APIView, CustomSizePageNumberPagination):
                     {"message": f"Invalid status value: {status_param}"}, status=400
                 )
             registrations = registrations.filter(status=status_param)
+        registrations = sparse_queryset(registrations, request)
         results = self.paginate_queryset(registrations, request, view=self)
-        serializer = ListRegistrationSerializer(results, many=True)
+        serializer = ListRegistrationSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
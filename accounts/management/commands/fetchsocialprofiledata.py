@@ -1,23 +1,56 @@
-import time
-
 from django.core.management.base import BaseCommand
 
-from accounts.models import Account
+from accounts.profiles import refresh_social_profiles
 
 
 class Command(BaseCommand):
-    help = "Fetch social profile data for all accounts."
+    help = (
+        "Fetch social profile data for all accounts (resumes from the last checkpoint)."
+    )
 
-    def handle(self, *args, **options):
-        # Get all account addresses
-        account_addresses = [account.id for account in Account.objects.all()]
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Accounts per social get call",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="Number of batches fetched in parallel",
+        )
+        parser.add_argument(
+            "--rps",
+            type=float,
+            help="Max social RPC requests per second",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Max accounts to check in this run",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Refetch profiles even if they haven't changed since the last refresh",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint and start from the first account",
+        )
 
-        # Fetch social profile data for each account
-        for address in account_addresses:
-            account = Account.objects.get(id=address)
-            account.fetch_near_social_profile_data()
-            self.stdout.write(
-                self.style.SUCCESS(f"Fetched social profile data for {address}")
+    def handle(self, *args, **options):
+        checked, updated = refresh_social_profiles(
+            batch_size=options["batch_size"],
+            concurrency=options["concurrency"],
+            rps=options["rps"],
+            limit=options["limit"],
+            force=options["force"],
+            restart=options["restart"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} accounts, updated {updated} social profiles"
             )
-            # wait for 1 second to avoid rate limiting
-            time.sleep(1)
+        )
@@ -0,0 +1,112 @@
+# Generated by Django 5.0.6 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_alter_account_near_social_profile_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NftContractMetadata",
+            fields=[
+                (
+                    "failed",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the lookup failed.",
+                        verbose_name="failed",
+                    ),
+                ),
+                (
+                    "fetched_at",
+                    models.DateTimeField(
+                        help_text="Date the value was fetched.",
+                        verbose_name="fetched at",
+                    ),
+                ),
+                (
+                    "contract_id",
+                    models.CharField(
+                        help_text="NFT contract account ID.",
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="contract id",
+                    ),
+                ),
+                (
+                    "metadata",
+                    models.JSONField(
+                        blank=True,
+                        help_text="Result of the contract's nft_metadata view.",
+                        null=True,
+                        verbose_name="metadata",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="NftTokenMedia",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "failed",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the lookup failed.",
+                        verbose_name="failed",
+                    ),
+                ),
+                (
+                    "fetched_at",
+                    models.DateTimeField(
+                        help_text="Date the value was fetched.",
+                        verbose_name="fetched at",
+                    ),
+                ),
+                (
+                    "contract_id",
+                    models.CharField(
+                        help_text="NFT contract account ID.",
+                        max_length=64,
+                        verbose_name="contract id",
+                    ),
+                ),
+                (
+                    "token_id",
+                    models.CharField(
+                        help_text="NFT token ID.",
+                        max_length=255,
+                        verbose_name="token id",
+                    ),
+                ),
+                (
+                    "media",
+                    models.TextField(
+                        blank=True,
+                        help_text="Token metadata media.",
+                        null=True,
+                        verbose_name="media",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("contract_id", "token_id")},
+            },
+        ),
+    ]
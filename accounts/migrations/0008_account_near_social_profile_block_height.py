@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_nftcontractmetadata_nfttokenmedia"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="near_social_profile_block_height",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                help_text="Block height at which the stored NEAR social profile last changed.",
+                null=True,
+                verbose_name="NEAR social profile block height",
+            ),
+        ),
+    ]
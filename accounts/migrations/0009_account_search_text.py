@@ -0,0 +1,51 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:20
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+BACKFILL_SEARCH_TEXT_SQL = """
+UPDATE accounts_account SET search_text = concat_ws(
+    ' ',
+    id,
+    CASE WHEN jsonb_typeof(near_social_profile_data->'name') = 'string'
+        THEN near_social_profile_data->>'name' END,
+    (
+        SELECT string_agg(tag, ' ')
+        FROM jsonb_object_keys(
+            CASE WHEN jsonb_typeof(near_social_profile_data->'tags') = 'object'
+                THEN near_social_profile_data->'tags' END
+        ) AS tag
+    )
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_account_near_social_profile_block_height"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="account",
+            name="search_text",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="Account ID and NEAR social profile name and tags, for search.",
+                verbose_name="search text",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_TEXT_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="account",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_text"],
+                name="account_search_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
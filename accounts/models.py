@@ -1,13 +1,25 @@
+from datetime import timedelta
+
 import requests
 from asgiref.sync import sync_to_async
 from django import db
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.core.cache import cache
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from base.logging import logger
 from chains.models import Chain
 
+from .utils import (
+    NFT_IMAGE_TYPES,
+    get_profile_nft,
+    get_search_text,
+    merge_social_data,
+)
+
 
 class Account(models.Model):
     id = models.CharField(
@@ -60,9 +72,30 @@ class Account(models.Model):
         blank=True,
         help_text=_("NEAR social data contained under 'profile' key."),
     )
+    near_social_profile_block_height = models.PositiveBigIntegerField(
+        _("NEAR social profile block height"),
+        null=True,
+        blank=True,
+        help_text=_(
+            "Block height at which the stored NEAR social profile last changed."
+        ),
+    )
+    search_text = models.TextField(
+        _("search text"),
+        blank=True,
+        default="",
+        help_text=_("Account ID and NEAR social profile name and tags, for search."),
+    )
 
     class Meta:
         ordering = ["id"]
+        indexes = [
+            GinIndex(
+                fields=["search_text"],
+                name="account_search_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     async def fetch_near_social_profile_data_async(self):
         fetch_profile_data = sync_to_async(self.fetch_near_social_profile_data)
@@ -82,50 +115,10 @@ class Account(models.Model):
                         "profile"
                     ]  # TODO: validate/sanitize profile data?
                     # fetch NFT URLs if applicable
-                    for image_type in ["image", "backgroundImage"]:
-                        if (
-                            image_type in profile_data
-                            and "nft" in profile_data[image_type]
-                            and "contractId" in profile_data[image_type]["nft"]
-                            and "tokenId" in profile_data[image_type]["nft"]
-                        ):
-                            contract_id = profile_data[image_type]["nft"]["contractId"]
-                            token_id = profile_data[image_type]["nft"]["tokenId"]
-                            # get base_uri
-                            url = f"{settings.FASTNEAR_RPC_URL}/account/{contract_id}/view/nft_metadata"
-                            response = requests.get(url)
-                            if response.status_code == 200:
-                                metadata = response.json()
-                                if "base_uri" in metadata:
-                                    base_uri = metadata["base_uri"]
-                                    # store baseUri in profile_data
-                                    profile_data[image_type]["nft"][
-                                        "baseUri"
-                                    ] = base_uri
-                            else:
-                                logger.error(
-                                    f"Request for NFT metadata failed ({response.status_code}) with message: {response.text}"
-                                )
-                            # get token metadata
-                            url = f"{settings.FASTNEAR_RPC_URL}/account/{contract_id}/view/nft_token"
-                            json_data = {"token_id": token_id}
-                            response = requests.post(
-                                url, json=json_data
-                            )  # using a POST request here so that token_id is not coerced into an integer on fastnear's side, causing a contract view error
-                            if response.status_code == 200:
-                                token_metadata = response.json()
-                                if (
-                                    "metadata" in token_metadata
-                                    and "media" in token_metadata["metadata"]
-                                ):
-                                    # store media in profile_data
-                                    profile_data[image_type]["nft"]["media"] = (
-                                        token_metadata["metadata"]["media"]
-                                    )
-                            else:
-                                logger.error(
-                                    f"Request for NFT metadata failed ({response.status_code}) with message: {response.text}"
-                                )
+                    for image_type in NFT_IMAGE_TYPES:
+                        nft = get_profile_nft(profile_data, image_type)
+                        if nft:
+                            resolve_nft_image(nft)
                     self.near_social_profile_data = profile_data
                     if should_save:
                         self.save()
@@ -136,6 +129,54 @@ class Account(models.Model):
         except Exception as e:
             logger.error(f"Error fetching NEAR social profile data: {e}")
 
+    async def apply_near_social_profile_update_async(
+        self, profile_update: dict, block_height: int = None
+    ):
+        apply_update = sync_to_async(self.apply_near_social_profile_update)
+        await apply_update(profile_update, block_height)
+
+    def apply_near_social_profile_update(
+        self, profile_update: dict, block_height: int = None
+    ):
+        """
+        Merges a profile fragment from a NEAR Social `set` call into the stored profile.
+        NFT images are only resolved over RPC if they changed. Fragments from blocks older than the stored
+        profile's (e.g. when re-indexing an older range) are ignored, so the profile never goes back in time;
+        fragments from the stored profile's own block still apply, as a block can hold several `set` calls.
+        """
+        if (
+            block_height is not None
+            and self.near_social_profile_block_height is not None
+            and block_height < self.near_social_profile_block_height
+        ):
+            logger.info(
+                f"Skipping profile update for {self.id} from block {block_height} (stored profile is from block {self.near_social_profile_block_height})"
+            )
+            return
+        previous_profile = self.near_social_profile_data or {}
+        profile_data = merge_social_data(previous_profile, profile_update)
+        for image_type in NFT_IMAGE_TYPES:
+            nft = get_profile_nft(profile_data, image_type)
+            if not nft:
+                continue
+            previous_nft = get_profile_nft(previous_profile, image_type)
+            if (
+                previous_nft
+                and previous_nft["contractId"] == nft["contractId"]
+                and previous_nft["tokenId"] == nft["tokenId"]
+                and ("media" in nft or "baseUri" in nft)
+            ):
+                continue  # unchanged and already resolved
+            nft.pop("baseUri", None)
+            nft.pop("media", None)
+            resolve_nft_image(nft)
+        self.near_social_profile_data = profile_data
+        update_fields = ["near_social_profile_data"]
+        if block_height:
+            self.near_social_profile_block_height = block_height
+            update_fields.append("near_social_profile_block_height")
+        self.save(update_fields=update_fields)
+
     def save(self, *args, **kwargs):
         if self._state.adding:  # If the account is being created (not updated)
             if not self.chain_id:
@@ -144,4 +185,158 @@ class Account(models.Model):
             self.fetch_near_social_profile_data(
                 False  # don't save yet as we want to avoid infinite loop
             )
+        self.search_text = get_search_text(self.id, self.near_social_profile_data)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "near_social_profile_data" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "search_text"}
         super().save(*args, **kwargs)
+
+
+def call_nft_view(contract_id: str, method: str, args: dict = None):
+    """
+    Calls an NFT contract view method. Returns (result, failed); non-200 responses, network errors,
+    timeouts and invalid JSON all count as failures, so they are negatively cached alike.
+    """
+    url = f"{settings.FASTNEAR_RPC_URL}/account/{contract_id}/view/{method}"
+    try:
+        if args:
+            # POST so that e.g. token_id is not coerced into an integer on fastnear's side, causing a contract view error
+            response = requests.post(
+                url, json=args, timeout=settings.NFT_METADATA_REQUEST_TIMEOUT
+            )
+        else:
+            response = requests.get(url, timeout=settings.NFT_METADATA_REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            logger.error(
+                f"Request for NFT {method} failed ({response.status_code}) with message: {response.text}"
+            )
+            return None, True
+        return response.json(), False
+    except (requests.RequestException, ValueError) as e:
+        logger.error(f"Request for NFT {method} of {contract_id} failed: {e}")
+        return None, True
+
+
+class NftMetadataCacheEntry(models.Model):
+    """
+    Persistent cache entry for NFT view calls; failed lookups are kept for a shorter time
+    (negative caching) so broken contracts aren't queried on every profile update.
+    """
+
+    failed = models.BooleanField(
+        _("failed"),
+        default=False,
+        help_text=_("Whether the lookup failed."),
+    )
+    fetched_at = models.DateTimeField(
+        _("fetched at"),
+        help_text=_("Date the value was fetched."),
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def expires_in(self) -> int:
+        ttl = (
+            settings.NFT_METADATA_NEGATIVE_CACHE_TIMEOUT
+            if self.failed
+            else settings.NFT_METADATA_CACHE_TIMEOUT
+        )
+        expires_at = self.fetched_at + timedelta(seconds=ttl)
+        return int((expires_at - timezone.now()).total_seconds())
+
+
+class NftContractMetadata(NftMetadataCacheEntry):
+    contract_id = models.CharField(
+        _("contract id"),
+        primary_key=True,
+        max_length=64,
+        help_text=_("NFT contract account ID."),
+    )
+    metadata = models.JSONField(
+        _("metadata"),
+        null=True,
+        blank=True,
+        help_text=_("Result of the contract's nft_metadata view."),
+    )
+
+    @classmethod
+    def get_metadata(cls, contract_id: str) -> dict:
+        """Returns the contract's nft_metadata (empty if unavailable), from Redis, the table or RPC."""
+        cache_key = f"nft_metadata:{contract_id}"
+        metadata = cache.get(cache_key)
+        if metadata is not None:
+            return metadata
+        entry = cls.objects.filter(contract_id=contract_id).first()
+        if not entry or entry.expires_in <= 0:
+            metadata, failed = call_nft_view(contract_id, "nft_metadata")
+            entry, _ = cls.objects.update_or_create(
+                contract_id=contract_id,
+                defaults={
+                    "metadata": metadata if isinstance(metadata, dict) else None,
+                    "failed": failed,
+                    "fetched_at": timezone.now(),
+                },
+            )
+        metadata = entry.metadata or {}
+        cache.set(cache_key, metadata, max(entry.expires_in, 1))
+        return metadata
+
+
+class NftTokenMedia(NftMetadataCacheEntry):
+    contract_id = models.CharField(
+        _("contract id"),
+        max_length=64,
+        help_text=_("NFT contract account ID."),
+    )
+    token_id = models.CharField(
+        _("token id"),
+        max_length=255,
+        help_text=_("NFT token ID."),
+    )
+    media = models.TextField(
+        _("media"),
+        null=True,
+        blank=True,
+        help_text=_("Token metadata media."),
+    )
+
+    class Meta:
+        unique_together = (("contract_id", "token_id"),)
+
+    @classmethod
+    def get_media(cls, contract_id: str, token_id: str):
+        """Returns the token's metadata media (None if unavailable), from Redis, the table or RPC."""
+        cache_key = f"nft_media:{contract_id}:{token_id}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached["media"]
+        entry = cls.objects.filter(contract_id=contract_id, token_id=token_id).first()
+        if not entry or entry.expires_in <= 0:
+            token, failed = call_nft_view(
+                contract_id, "nft_token", {"token_id": token_id}
+            )
+            token_metadata = token.get("metadata") if isinstance(token, dict) else None
+            media = (token_metadata or {}).get("media")
+            entry, _ = cls.objects.update_or_create(
+                contract_id=contract_id,
+                token_id=token_id,
+                defaults={
+                    "media": media,
+                    "failed": failed,
+                    "fetched_at": timezone.now(),
+                },
+            )
+        cache.set(cache_key, {"media": entry.media}, max(entry.expires_in, 1))
+        return entry.media
+
+
+def resolve_nft_image(nft: dict):
+    """Stores the contract's `baseUri` and the token's `media` on a profile NFT reference."""
+    metadata = NftContractMetadata.get_metadata(nft["contractId"])
+    if "base_uri" in metadata:
+        nft["baseUri"] = metadata["base_uri"]
+    media = NftTokenMedia.get_media(nft["contractId"], str(nft["tokenId"]))
+    if media:
+        nft["media"] = media
@@ -0,0 +1,172 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from base.logging import logger
+
+from .models import Account, resolve_nft_image
+from .utils import NFT_IMAGE_TYPES, get_profile_nft, get_search_text
+
+CHECKPOINT_KEY = "social_profiles_refresh_checkpoint"
+SOCIAL_VIEW_URL = (
+    f"{settings.FASTNEAR_RPC_URL}/account/{settings.NEAR_SOCIAL_CONTRACT_ADDRESS}/view"
+)
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls out to at most `rps` per second."""
+
+    def __init__(self, rps: float):
+        self.interval = 1 / rps if rps > 0 else 0
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            wait_for = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+def social_view(method: str, args: dict, rate_limiter: RateLimiter):
+    rate_limiter.wait()
+    response = requests.post(f"{SOCIAL_VIEW_URL}/{method}", json=args)
+    if response.status_code != 200:
+        raise ValueError(
+            f"Social {method} failed ({response.status_code}) with message: {response.text}"
+        )
+    return response.json() or {}
+
+
+def refresh_batch(accounts, rate_limiter: RateLimiter, force=False):
+    """
+    Refreshes profiles for a batch of accounts with one social `keys` call (to find the block each
+    profile last changed at) and one `get` call for the profiles that changed.
+    Returns (number updated, failed).
+    """
+    try:
+        block_heights = social_view(
+            "keys",
+            {
+                "keys": [f"{account.id}/profile" for account in accounts],
+                "options": {"return_type": "BlockHeight"},
+            },
+            rate_limiter,
+        )
+        changed = {}
+        for account in accounts:
+            block_height = (block_heights.get(account.id) or {}).get("profile")
+            if not isinstance(block_height, int):
+                continue  # no profile
+            if force or block_height != account.near_social_profile_block_height:
+                account.near_social_profile_block_height = block_height
+                changed[account.id] = account
+        if not changed:
+            return 0, False
+
+        data = social_view(
+            "get",
+            {"keys": [f"{account_id}/profile/**" for account_id in changed]},
+            rate_limiter,
+        )
+        for account_id, account in changed.items():
+            profile_data = (data.get(account_id) or {}).get("profile")
+            if isinstance(profile_data, dict):
+                for image_type in NFT_IMAGE_TYPES:
+                    nft = get_profile_nft(profile_data, image_type)
+                    if nft:
+                        resolve_nft_image(nft)
+            account.near_social_profile_data = profile_data
+            account.search_text = get_search_text(account_id, profile_data)
+        Account.objects.bulk_update(
+            changed.values(),
+            [
+                "near_social_profile_data",
+                "near_social_profile_block_height",
+                "search_text",
+            ],
+        )
+        return len(changed), False
+    except Exception as e:
+        logger.error(f"Error refreshing social profiles for batch: {e}")
+        return 0, True
+    finally:
+        connection.close()  # batches run on worker threads
+
+
+def refresh_social_profiles(
+    batch_size=None, concurrency=None, rps=None, limit=None, force=False, restart=False
+):
+    """
+    Refreshes NEAR Social profiles for all accounts, `concurrency` batches at a time within a shared
+    requests-per-second budget. Progress is checkpointed after every round of batches, so an interrupted
+    or `limit`ed run resumes where it stopped; the checkpoint resets once every account has been visited.
+    Failed batches are retried with backoff; if they still fail, the run stops with the checkpoint before
+    the first failed batch, so its accounts are picked up again on the next run.
+    Returns (accounts checked, profiles updated).
+    """
+    batch_size = batch_size or settings.SOCIAL_PROFILE_REFRESH_BATCH_SIZE
+    concurrency = concurrency or settings.SOCIAL_PROFILE_REFRESH_CONCURRENCY
+    rate_limiter = RateLimiter(rps or settings.SOCIAL_PROFILE_REFRESH_RPS)
+    if restart:
+        cache.delete(CHECKPOINT_KEY)
+    checkpoint = cache.get(CHECKPOINT_KEY, "")
+
+    def run_batch(batch):
+        return refresh_batch(batch, rate_limiter, force)
+
+    checked = updated = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while limit is None or checked < limit:
+            round_size = batch_size * concurrency
+            if limit is not None:
+                round_size = min(round_size, limit - checked)
+            accounts = list(
+                Account.objects.filter(id__gt=checkpoint)
+                .order_by("id")
+                .only("id", "near_social_profile_block_height")[:round_size]
+            )
+            if not accounts:
+                # every account has been visited; start over on the next run
+                cache.delete(CHECKPOINT_KEY)
+                break
+            batches = [
+                accounts[i : i + batch_size]
+                for i in range(0, len(accounts), batch_size)
+            ]
+            results = dict(enumerate(executor.map(run_batch, batches)))
+            for attempt in range(settings.SOCIAL_PROFILE_REFRESH_RETRIES):
+                retry = [i for i, (_, batch_failed) in results.items() if batch_failed]
+                if not retry:
+                    break
+                time.sleep(2**attempt)
+                results.update(
+                    zip(retry, executor.map(run_batch, [batches[i] for i in retry]))
+                )
+            failed_batches = [
+                i for i, (_, batch_failed) in results.items() if batch_failed
+            ]
+            failed += len(failed_batches)
+            updated += sum(batch_updated for batch_updated, _ in results.values())
+            # only advance past the batches before the first one that failed
+            done = batches[: min(failed_batches, default=len(batches))]
+            if done:
+                checked += sum(len(batch) for batch in done)
+                checkpoint = done[-1][-1].id
+                cache.set(CHECKPOINT_KEY, checkpoint, None)
+            logger.info(
+                f"Social profiles: checked {checked}, updated {updated}, failed batches {failed} (up to {checkpoint})"
+            )
+            if failed_batches:
+                logger.error(
+                    f"Stopping social profile refresh: {len(failed_batches)} batches failed after {settings.SOCIAL_PROFILE_REFRESH_RETRIES} retries"
+                )
+                break
+    return checked, updated
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
+from base.serializers import SparseFieldsetsMixin
+
 from .models import Account
+from .utils import get_profile_image_url
 
 # near social profile data serializers (for Swagger schema)
 
@@ -52,7 +55,7 @@ class NearSocialProfileDataSerializer(serializers.Serializer):
     )
 
 
-class AccountSerializer(serializers.ModelSerializer):
+class AccountSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Account
         fields = [
@@ -77,6 +80,24 @@ class AccountSerializer(serializers.ModelSerializer):
     near_social_profile_data = NearSocialProfileDataSerializer(required=False)
 
 
+class AccountReferenceSerializer(ModelSerializer):
+    """How accounts are embedded in other resources unless expanded (`?expand=<field>`)."""
+
+    class Meta:
+        model = Account
+        fields = ["id", "name", "image_url"]
+
+    name = SerializerMethodField()
+    image_url = SerializerMethodField()
+
+    def get_name(self, obj) -> str | None:
+        profile_data = obj.near_social_profile_data
+        return profile_data.get("name") if isinstance(profile_data, dict) else None
+
+    def get_image_url(self, obj) -> str | None:
+        return get_profile_image_url(obj.near_social_profile_data)
+
+
 SIMPLE_ACCOUNT_EXAMPLE = {
     "id": "user.near",
     "total_donations_in_usd": "740.00",
@@ -107,6 +128,12 @@ SIMPLE_ACCOUNT_EXAMPLE = {
     },
 }
 
+ACCOUNT_REFERENCE_EXAMPLE = {
+    "id": "user.near",
+    "name": "Illia",
+    "image_url": "https://ipfs.nftstorage.link/ipfs/bafybeie6mpnk6iya3wvwtxtogzmzpprw5734dydoeujo5esqqxmmirug6y",
+}
+
 PAGINATED_ACCOUNT_EXAMPLE = {
     "count": 1,
     "next": None,
@@ -120,3 +147,22 @@ class PaginatedAccountsResponseSerializer(serializers.Serializer):
     next = serializers.CharField(allow_null=True)
     previous = serializers.CharField(allow_null=True)
     results = AccountSerializer(many=True)
+
+
+class AccountBatchRequestSerializer(serializers.Serializer):
+    account_ids = serializers.ListField(child=serializers.CharField())
+
+
+class AccountBatchResponseSerializer(serializers.Serializer):
+    accounts = serializers.DictField(
+        child=AccountSerializer(allow_null=True),
+        help_text="Accounts by ID, in the order requested (null for unknown IDs)",
+    )
+
+
+ACCOUNT_BATCH_EXAMPLE = {
+    "accounts": {
+        "user.near": SIMPLE_ACCOUNT_EXAMPLE,
+        "unknown.near": None,
+    }
+}
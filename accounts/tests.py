@@ -1,3 +1,46 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Account
+
+
+@mock.patch.object(Account, "fetch_near_social_profile_data")
+class ApplyNearSocialProfileUpdateTestCase(TestCase):
+    def setUp(self):
+        self.account = Account.objects.create(id="user.near")
+        self.account.near_social_profile_data = {"name": "Current", "tags": {"a": ""}}
+        self.account.near_social_profile_block_height = 200
+        self.account.save()
+
+    def test_applies_newer_fragment(self, _):
+        self.account.apply_near_social_profile_update({"name": "Newer"}, 201)
+
+        self.account.refresh_from_db()
+        self.assertEqual(
+            self.account.near_social_profile_data, {"name": "Newer", "tags": {"a": ""}}
+        )
+        self.assertEqual(self.account.near_social_profile_block_height, 201)
+
+    def test_ignores_fragment_from_older_block(self, _):
+        self.account.apply_near_social_profile_update(
+            {"name": "Stale", "tags": None}, 150
+        )
+
+        self.account.refresh_from_db()
+        self.assertEqual(
+            self.account.near_social_profile_data,
+            {"name": "Current", "tags": {"a": ""}},
+        )
+        self.assertEqual(self.account.near_social_profile_block_height, 200)
+
+    def test_applies_fragments_from_same_block(self, _):
+        self.account.apply_near_social_profile_update({"name": "First"}, 201)
+        self.account.apply_near_social_profile_update({"description": "Second"}, 201)
+
+        self.account.refresh_from_db()
+        self.assertEqual(
+            self.account.near_social_profile_data,
+            {"name": "First", "description": "Second", "tags": {"a": ""}},
+        )
+        self.assertEqual(self.account.near_social_profile_block_height, 201)
@@ -0,0 +1,59 @@
+from django.conf import settings
+
+NFT_IMAGE_TYPES = ("image", "backgroundImage")
+
+
+def merge_social_data(existing, update: dict) -> dict:
+    """
+    Deep-merges a NEAR Social `set` fragment into previously stored data.
+    As in SocialDB, a null value deletes the key.
+    """
+    merged = dict(existing) if isinstance(existing, dict) else {}
+    for key, value in update.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict):
+            merged[key] = merge_social_data(merged.get(key), value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def get_profile_nft(profile_data, image_type):
+    """Returns the NFT reference for a profile image, if it has one."""
+    image = profile_data.get(image_type) if isinstance(profile_data, dict) else None
+    nft = image.get("nft") if isinstance(image, dict) else None
+    if isinstance(nft, dict) and "contractId" in nft and "tokenId" in nft:
+        return nft
+    return None
+
+
+def get_search_text(account_id, profile_data):
+    """Text an account is found by in search: its ID and its profile's name and tags."""
+    parts = [account_id]
+    if isinstance(profile_data, dict):
+        if isinstance(profile_data.get("name"), str):
+            parts.append(profile_data["name"])
+        if isinstance(profile_data.get("tags"), dict):
+            parts.extend(str(tag) for tag in profile_data["tags"])
+    return " ".join(parts)
+
+
+def get_profile_image_url(profile_data, image_type="image"):
+    """URL of a profile image, whether it is given as a URL, an IPFS CID or an NFT (once resolved)."""
+    image = profile_data.get(image_type) if isinstance(profile_data, dict) else None
+    if not isinstance(image, dict):
+        return None
+    if image.get("url"):
+        return image["url"]
+    if image.get("ipfs_cid"):
+        return f"{settings.IPFS_GATEWAY_URL}{image['ipfs_cid']}"
+    nft = image.get("nft")
+    media = nft.get("media") if isinstance(nft, dict) else None
+    if not media:
+        return None
+    if media.startswith(("http://", "https://", "data:")):
+        return media
+    if nft.get("baseUri"):
+        return f"{nft['baseUri'].rstrip('/')}/{media}"
+    return f"{settings.IPFS_GATEWAY_URL}{media}"
@@ -1,11 +1,13 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
+from base.admin import LargeTableAdmin
+
 from .models import Account, Activity
 
 
 @admin.register(Activity)
-class ActivityAdmin(admin.ModelAdmin):
+class ActivityAdmin(LargeTableAdmin):
     list_display = (
         "id",
         "signer_address",
@@ -15,11 +17,12 @@ class ActivityAdmin(admin.ModelAdmin):
         "transaction_link",
         "action_result",
     )
-    list_filter = ("timestamp", "type", "signer", "receiver")
+    list_filter = ("timestamp", "type")
     search_fields = ("signer__id", "receiver__id", "tx_hash")
     date_hierarchy = "timestamp"
     ordering = ("-timestamp",)
     autocomplete_fields = ["signer", "receiver"]
+    list_select_related = ("signer", "receiver")
 
     def signer_address(self, obj):
         return obj.signer.id
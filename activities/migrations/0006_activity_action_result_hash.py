@@ -0,0 +1,54 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:20
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def backfill_action_result_hash(apps, schema_editor):
+    Activity = apps.get_model("activities", "Activity")
+    batch = []
+    for activity in (
+        Activity.objects.filter(action_result__isnull=False)
+        .only("id", "action_result")
+        .iterator(chunk_size=2000)
+    ):
+        canonical = json.dumps(
+            activity.action_result, sort_keys=True, separators=(",", ":")
+        )
+        activity.action_result_hash = hashlib.sha256(canonical.encode()).hexdigest()
+        batch.append(activity)
+        if len(batch) >= 2000:
+            Activity.objects.bulk_update(batch, ["action_result_hash"])
+            batch = []
+    if batch:
+        Activity.objects.bulk_update(batch, ["action_result_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activities", "0005_alter_activity_action_result_alter_activity_tx_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activity",
+            name="action_result_hash",
+            field=models.CharField(
+                blank=True,
+                help_text="SHA-256 of the canonical action result JSON, used for dedupe.",
+                max_length=64,
+                null=True,
+                verbose_name="action result hash",
+            ),
+        ),
+        migrations.RunPython(
+            backfill_action_result_hash, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AlterUniqueTogether(
+            name="activity",
+            unique_together={("action_result_hash", "type")},
+        ),
+    ]
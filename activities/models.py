@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -51,6 +54,13 @@ class Activity(models.Model):
         blank=True,
         help_text=_("Activity action result."),
     )
+    action_result_hash = models.CharField(
+        _("action result hash"),
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text=_("SHA-256 of the canonical action result JSON, used for dedupe."),
+    )
     tx_hash = models.CharField(
         _("transaction hash"),
         max_length=64,
@@ -69,4 +79,15 @@ class Activity(models.Model):
     class Meta:
         verbose_name_plural = "Activities"
 
-        unique_together = (("action_result", "type"),)
+        unique_together = (("action_result_hash", "type"),)
+
+    @staticmethod
+    def hash_action_result(action_result):
+        if action_result is None:
+            return None
+        canonical = json.dumps(action_result, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.action_result_hash = self.hash_action_result(self.action_result)
+        super().save(*args, **kwargs)
@@ -13,26 +13,34 @@ from accounts.api import (
     AccountListRegistrationsAPI,
     AccountPayoutsReceivedAPI,
     AccountPotApplicationsAPI,
+    AccountsBatchAPI,
     AccountsListAPI,
     DonorsAPI,
 )
-from base.api import StatsAPI
-from donations.api import DonationContractConfigAPI
+from base.api import SearchAPI, StatsAPI
+from donations.api import (
+    DonationContractConfigAPI,
+    DonationHistogramAPI,
+    LeaderboardAPI,
+)
 from lists.api import (
     ListDetailAPI,
     ListRandomRegistrationAPI,
     ListRegistrationsAPI,
     ListsListAPI,
 )
+from nadabot.api import IsHumanAPI
 from pots.api import (
     PotApplicationsAPI,
     PotDetailAPI,
     PotDonationsAPI,
     PotFactoriesAPI,
+    PotMatchingAPI,
     PotPayoutsAPI,
     PotsListAPI,
     PotSponsorsAPI,
 )
+from tokens.api import TokenIconAPI
 
 urlpatterns = [
     # schema
@@ -47,6 +55,8 @@ urlpatterns = [
     ),
     # accounts
     path("v1/accounts", AccountsListAPI.as_view(), name="accounts_api"),
+    # before accounts/<account_id> so it isn't taken for an account ID
+    path("v1/accounts/batch", AccountsBatchAPI.as_view(), name="accounts_batch_api"),
     path(
         "v1/accounts/<str:account_id>",
         AccountDetailAPI.as_view(),
@@ -88,8 +98,20 @@ urlpatterns = [
         DonationContractConfigAPI.as_view(),
         name="donate_contract_config_api",
     ),
+    # donation histogram
+    path(
+        "v1/donations/histogram",
+        DonationHistogramAPI.as_view(),
+        name="donation_histogram_api",
+    ),
     # donors
     path("v1/donors", DonorsAPI.as_view(), name="donors_api"),
+    # leaderboards
+    path(
+        "v1/leaderboards/<str:board>",
+        LeaderboardAPI.as_view(),
+        name="leaderboards_api",
+    ),
     # lists
     path("v1/lists", ListsListAPI.as_view(), name="lists_api"),
     path("v1/lists/<int:list_id>", ListDetailAPI.as_view(), name="lists_api_by_id"),
@@ -103,6 +125,8 @@ urlpatterns = [
         ListRandomRegistrationAPI.as_view(),
         name="lists_api_by_id_registrations",
     ),
+    # nadabot
+    path("v1/nadabot/is_human", IsHumanAPI.as_view(), name="nadabot_is_human_api"),
     # pots
     path("v1/pots", PotsListAPI.as_view(), name="pots_api"),
     path("v1/pots/<str:pot_id>/", PotDetailAPI.as_view(), name="pots_api_by_id"),
@@ -124,9 +148,22 @@ urlpatterns = [
     path(
         "v1/pots/<str:pot_id>/payouts", PotPayoutsAPI.as_view(), name="pots_payouts_api"
     ),
+    path(
+        "v1/pots/<str:pot_id>/matching",
+        PotMatchingAPI.as_view(),
+        name="pots_matching_api",
+    ),
     path(
         "v1/potfactories", PotFactoriesAPI.as_view(), name="pot_factories_api"
     ),
+    # search
+    path("v1/search", SearchAPI.as_view(), name="search_api"),
     # stats
     path("v1/stats", StatsAPI.as_view(), name="stats_api"),
+    # tokens
+    path(
+        "v1/token_icons/<str:icon_hash>",
+        TokenIconAPI.as_view(),
+        name="token_icon_api",
+    ),
 ]
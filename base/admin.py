@@ -0,0 +1,44 @@
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many (estimated) rows an exact COUNT(*) is cheap enough
+ESTIMATED_COUNT_THRESHOLD = 100000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that takes the row count of unfiltered changelists from Postgres' planner
+    statistics (pg_class.reltuples) instead of a COUNT(*) over the whole table.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.where:
+            estimate = self.estimated_count()
+            if estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+    def estimated_count(self):
+        model = self.object_list.model
+        with connections[self.object_list.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else -1  # -1 when the table was never analyzed
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Base admin for tables too large for the default changelist: estimated counts, no
+    "show all" count query, and FK columns loaded with a join (set list_select_related).
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
@@ -1,4 +1,7 @@
-from django.db.models import Count, Exists, OuterRef, Sum
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
@@ -14,8 +17,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import Account
+from accounts.serializers import SIMPLE_ACCOUNT_EXAMPLE, AccountSerializer
 from donations.models import Donation
-from pots.models import PotPayout
+from lists.models import List
+from lists.serializers import SIMPLE_LIST_EXAMPLE, ListSerializer
+from pots.models import Pot, PotPayout
+from pots.serializers import SIMPLE_POT_EXAMPLE, PotSerializer
 
 
 class StatsResponseSerializer(serializers.Serializer):
@@ -87,3 +94,146 @@ class StatsAPI(APIView):
                 "total_recipients_count": total_recipients_count,
             }
         )
+
+
+class SearchResponseSerializer(serializers.Serializer):
+    accounts = AccountSerializer(many=True, required=False)
+    pots = PotSerializer(many=True, required=False)
+    lists = ListSerializer(many=True, required=False)
+
+
+def search_accounts(query):
+    """Accounts whose ID or NEAR Social profile name or tags match `query`, best matches first."""
+    return (
+        Account.objects.filter(search_text__trigram_word_similar=query)
+        .annotate(rank=TrigramWordSimilarity(query, "search_text"))
+        .order_by("-rank", "-total_donations_in_usd", "id")
+    )
+
+
+def search_pots(query):
+    """Pots whose name or description match `query`, best matches first (name matches rank higher)."""
+    return (
+        Pot.objects.filter(
+            Q(name__trigram_word_similar=query)
+            | Q(description__trigram_word_similar=query)
+        )
+        .annotate(
+            rank=Greatest(
+                TrigramWordSimilarity(query, "name"),
+                TrigramWordSimilarity(query, "description") * 0.5,
+            )
+        )
+        .select_related("deployer", "owner", "chef")
+        .prefetch_related("admins")
+        .order_by("-rank", "-deployed_at")
+    )
+
+
+def search_lists(query):
+    """Lists whose name matches `query`, best matches first."""
+    return (
+        List.objects.filter(name__trigram_word_similar=query)
+        .annotate(rank=TrigramWordSimilarity(query, "name"))
+        .select_related("owner")
+        .prefetch_related("admins")
+        .order_by("-rank", "-created_at")
+    )
+
+
+# result type -> (search, serializer)
+SEARCHES = {
+    "accounts": (search_accounts, AccountSerializer),
+    "pots": (search_pots, PotSerializer),
+    "lists": (search_lists, ListSerializer),
+}
+
+
+class SearchAPI(APIView):
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q",
+                str,
+                OpenApiParameter.QUERY,
+                required=True,
+                description=f"Search terms (at least {settings.SEARCH_MIN_QUERY_LENGTH} characters), matched approximately against account IDs, NEAR Social profile names and tags, pot names and descriptions, and list names",
+            ),
+            OpenApiParameter(
+                "type",
+                str,
+                OpenApiParameter.QUERY,
+                description="Comma-separated types of results to return, out of accounts, pots and lists (defaults to all)",
+            ),
+            OpenApiParameter(
+                "limit",
+                int,
+                OpenApiParameter.QUERY,
+                description=f"Max results per type (defaults to {settings.SEARCH_DEFAULT_LIMIT}, at most {settings.SEARCH_MAX_LIMIT})",
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=SearchResponseSerializer,
+                description="Returns the best matches of each type, best first",
+                examples=[
+                    OpenApiExample(
+                        "example-1",
+                        summary="Simple example",
+                        description="Example response for a search",
+                        value={
+                            "accounts": [SIMPLE_ACCOUNT_EXAMPLE],
+                            "pots": [SIMPLE_POT_EXAMPLE],
+                            "lists": [SIMPLE_LIST_EXAMPLE],
+                        },
+                        response_only=True,
+                    ),
+                ],
+            ),
+            400: OpenApiResponse(description="Invalid query parameters"),
+        },
+    )
+    @method_decorator(cache_page(60 * 5))
+    def get(self, request: Request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if len(query) < settings.SEARCH_MIN_QUERY_LENGTH:
+            return Response(
+                {
+                    "message": f"q must be at least {settings.SEARCH_MIN_QUERY_LENGTH} characters long."
+                },
+                status=400,
+            )
+        types = [
+            search_type.strip()
+            for search_type in request.query_params.get("type", "").split(",")
+            if search_type.strip()
+        ] or list(SEARCHES)
+        invalid_types = [
+            search_type for search_type in types if search_type not in SEARCHES
+        ]
+        if invalid_types:
+            return Response(
+                {"message": f"Invalid type value: {', '.join(invalid_types)}"},
+                status=400,
+            )
+        limit = request.query_params.get("limit", settings.SEARCH_DEFAULT_LIMIT)
+        try:
+            limit = int(limit)
+        except ValueError:
+            return Response({"message": f"Invalid limit value: {limit}"}, status=400)
+        if not 1 <= limit <= settings.SEARCH_MAX_LIMIT:
+            return Response(
+                {
+                    "message": f"limit must be between 1 and {settings.SEARCH_MAX_LIMIT}."
+                },
+                status=400,
+            )
+
+        results = {}
+        for search_type in types:
+            search, serializer_class = SEARCHES[search_type]
+            results[search_type] = serializer_class(
+                search(query)[:limit], many=True
+            ).data
+        return Response(results)
@@ -0,0 +1,338 @@
+import json
+import math
+import os
+import pickle
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache
+
+from base.logging import logger
+
+INVALIDATE_ALL = "*"
+SWR_LOCK_KEY = "swr_lock:{key}"
+MISSING = object()
+
+
+class SWREntry(NamedTuple):
+    """A stale-while-revalidate cache value: fresh until `fresh_until`, `delta` seconds to recompute."""
+
+    value: Any
+    fresh_until: float
+    delta: float
+
+
+class LocalLRU:
+    """Small thread-safe LRU of pickled values with per-entry expiry."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class L1Store:
+    """A process's L1 entries plus the thread that applies invalidations broadcast by other processes."""
+
+    def __init__(self, channel, max_entries, redis_client):
+        self.channel = channel
+        self.lru = LocalLRU(max_entries)
+        self.origin = uuid.uuid4().hex
+        threading.Thread(
+            target=self.listen,
+            args=(redis_client,),
+            name="l1-cache-invalidation",
+            daemon=True,
+        ).start()
+
+    def listen(self, redis_client):
+        while True:
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    payload = json.loads(message["data"])
+                    if payload["origin"] == self.origin:
+                        continue
+                    if payload["keys"] == INVALIDATE_ALL:
+                        self.lru.clear()
+                    else:
+                        self.lru.delete(payload["keys"])
+            except Exception as e:
+                # invalidations may have been missed while disconnected
+                self.lru.clear()
+                logger.warning(f"L1 cache invalidation listener error: {e}")
+                time.sleep(1)
+
+
+# Django creates a cache backend per thread, so L1 stores are shared per (process, channel)
+_l1_stores = {}
+_l1_stores_lock = threading.Lock()
+
+
+def get_l1_store(channel, max_entries, redis_client):
+    key = (os.getpid(), channel)  # forked workers start with their own (empty) store
+    store = _l1_stores.get(key)
+    if store is None:
+        with _l1_stores_lock:
+            store = _l1_stores.get(key)
+            if store is None:
+                store = _l1_stores[key] = L1Store(channel, max_entries, redis_client)
+    return store
+
+
+class LayeredRedisCache(RedisCache):
+    """
+    django_redis cache with a per-process in-memory L1 in front of Redis for hot keys (by default the
+    cache_page responses). L1 entries live for at most L1_TIMEOUT seconds; writes and deletes are
+    broadcast over Redis pub/sub so the other workers drop their copies straight away.
+
+    Keys matching SWR_KEY_PREFIXES are also served stale-while-revalidate: they are kept SWR_GRACE
+    seconds past their timeout, and once stale (or probabilistically a little before) a single caller
+    holding a Redis lock gets a miss and recomputes while the others are served the old value.
+
+    Extra OPTIONS: L1_MAX_ENTRIES, L1_TIMEOUT, L1_KEY_PREFIXES, L1_CHANNEL, SWR_KEY_PREFIXES,
+    SWR_GRACE, SWR_BETA, SWR_LOCK_TIMEOUT.
+    """
+
+    def __init__(self, server, params):
+        options = dict(params.get("OPTIONS", {}))
+        self.l1_max_entries = options.pop("L1_MAX_ENTRIES", 1000)
+        self.l1_timeout = options.pop("L1_TIMEOUT", 5)
+        self.l1_key_prefixes = tuple(
+            options.pop("L1_KEY_PREFIXES", ("views.decorators.cache.",))
+        )
+        self.l1_channel = options.pop("L1_CHANNEL", "django_cache:l1_invalidate")
+        self.swr_key_prefixes = tuple(
+            options.pop("SWR_KEY_PREFIXES", ("views.decorators.cache.",))
+        )
+        self.swr_grace = options.pop("SWR_GRACE", 5 * 60)
+        self.swr_beta = options.pop("SWR_BETA", 1.0)
+        self.swr_lock_timeout = options.pop("SWR_LOCK_TIMEOUT", 30)
+        super().__init__(server, {**params, "OPTIONS": options})
+        # when this backend (one per thread) started recomputing a value, by key
+        self.refresh_started = {}
+
+    @property
+    def l1(self):
+        return get_l1_store(
+            self.l1_channel, self.l1_max_entries, self.client.get_client(write=False)
+        )
+
+    def _is_hot(self, key):
+        return isinstance(key, str) and key.startswith(self.l1_key_prefixes)
+
+    def _timeout_seconds(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _l1_ttl(self, timeout):
+        timeout = self._timeout_seconds(timeout)
+        if timeout is None:
+            return self.l1_timeout
+        return max(min(self.l1_timeout, timeout), 0)
+
+    # Invalidation broadcast
+
+    def _broadcast(self, keys):
+        try:
+            self.client.get_client(write=True).publish(
+                self.l1_channel, json.dumps({"origin": self.l1.origin, "keys": keys})
+            )
+        except Exception as e:
+            logger.warning(f"Failed to broadcast L1 cache invalidation: {e}")
+
+    def _invalidate(self, keys, version=None):
+        hot_keys = [self.make_key(key, version) for key in keys if self._is_hot(key)]
+        if hot_keys:
+            self.l1.lru.delete(hot_keys)
+            self._broadcast(hot_keys)
+
+    def _invalidate_all(self):
+        self.l1.lru.clear()
+        self._broadcast(INVALIDATE_ALL)
+
+    # Stale-while-revalidate
+
+    def _is_swr(self, key):
+        return isinstance(key, str) and key.startswith(self.swr_key_prefixes)
+
+    def _wrap(self, key, value, timeout, version):
+        """Wraps a value with its freshness deadline; returns (stored value, Redis timeout)."""
+        seconds = self._timeout_seconds(timeout)
+        if not self._is_swr(key) or (seconds is not None and seconds <= 0):
+            return value, timeout
+        started = self.refresh_started.pop(self.make_key(key, version), None)
+        delta = time.monotonic() - started if started is not None else 0
+        if seconds is None:
+            return SWREntry(value, math.inf, delta), None
+        return SWREntry(value, time.time() + seconds, delta), seconds + self.swr_grace
+
+    def _unwrap(self, key, stored, default, version):
+        """
+        Returns a stored SWR entry's value, unless it is stale (or, with probability rising as its
+        deadline nears, about to be) and this caller wins the refresh lock: then it gets a miss and
+        recomputes the value while everyone else keeps being served the old one.
+        """
+        if not isinstance(stored, SWREntry):
+            return stored
+        # XFetch: refresh early by a random multiple of how long the value took to compute
+        early = stored.delta * self.swr_beta * -math.log(1 - random.random())
+        if time.time() + early < stored.fresh_until:
+            return stored.value
+        lock_key = SWR_LOCK_KEY.format(key=self.make_key(key, version))
+        if not super().add(lock_key, 1, self.swr_lock_timeout):
+            return stored.value
+        self._start_refresh(key, version)
+        return default
+
+    def _start_refresh(self, key, version):
+        if len(self.refresh_started) > 1000:
+            self.refresh_started.clear()  # misses that were never cached
+        self.refresh_started[self.make_key(key, version)] = time.monotonic()
+
+    # Cache API
+
+    def get(self, key, default=None, version=None, client=None):
+        if not self._is_hot(key):
+            value = super().get(key, default, version, client)
+            return self._unwrap(key, value, default, version)
+        l1_key = self.make_key(key, version)
+        cached = self.l1.lru.get(l1_key)
+        if cached is not None:
+            # values are kept pickled so callers can't mutate the shared copy
+            return self._unwrap(key, pickle.loads(cached), default, version)
+        value = super().get(key, MISSING, version, client)
+        if value is MISSING:
+            if self._is_swr(key):
+                self._start_refresh(key, version)
+            return default
+        self.l1.lru.set(l1_key, pickle.dumps(value), self.l1_timeout)
+        return self._unwrap(key, value, default, version)
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        if not any(self._is_hot(key) for key in keys):
+            found = super().get_many(keys, version=version, client=client)
+        else:
+            found, missing = {}, []
+            for key in keys:
+                cached = (
+                    self.l1.lru.get(self.make_key(key, version))
+                    if self._is_hot(key)
+                    else None
+                )
+                if cached is not None:
+                    found[key] = pickle.loads(cached)
+                else:
+                    missing.append(key)
+            if missing:
+                fetched = super().get_many(missing, version=version, client=client)
+                for key, value in fetched.items():
+                    if self._is_hot(key):
+                        self.l1.lru.set(
+                            self.make_key(key, version),
+                            pickle.dumps(value),
+                            self.l1_timeout,
+                        )
+                found.update(fetched)
+        # batch reads never trigger refreshes; stale values are served as they are
+        return {
+            key: value.value if isinstance(value, SWREntry) else value
+            for key, value in found.items()
+        }
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, *args, **kwargs):
+        stored, redis_timeout = self._wrap(key, value, timeout, version)
+        result = super().set(key, stored, redis_timeout, version, *args, **kwargs)
+        if self._is_swr(key):
+            super().delete(SWR_LOCK_KEY.format(key=self.make_key(key, version)))
+        if self._is_hot(key):
+            self._invalidate([key], version)
+            if result:
+                self.l1.lru.set(
+                    self.make_key(key, version),
+                    pickle.dumps(stored),
+                    self._l1_ttl(timeout),
+                )
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, *args, **kwargs):
+        if any(self._is_swr(key) for key in data):
+            return [
+                key
+                for key, value in data.items()
+                if not self.set(key, value, timeout, version, *args, **kwargs)
+            ]
+        result = super().set_many(data, timeout, version, *args, **kwargs)
+        self._invalidate(list(data), version)
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, *args, **kwargs):
+        added = super().add(key, value, timeout, version, *args, **kwargs)
+        if added:
+            self._invalidate([key], version)
+        return added
+
+    def delete(self, key, version=None, *args, **kwargs):
+        result = super().delete(key, version, *args, **kwargs)
+        self._invalidate([key], version)
+        return result
+
+    def delete_many(self, keys, version=None, *args, **kwargs):
+        keys = list(keys)
+        result = super().delete_many(keys, version, *args, **kwargs)
+        self._invalidate(keys, version)
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self._invalidate_all()
+        return result
+
+    def incr(self, key, delta=1, version=None, *args, **kwargs):
+        result = super().incr(key, delta, version, *args, **kwargs)
+        self._invalidate([key], version)
+        return result
+
+    def decr(self, key, delta=1, version=None, *args, **kwargs):
+        result = super().decr(key, delta, version, *args, **kwargs)
+        self._invalidate([key], version)
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self._invalidate_all()
+        return result
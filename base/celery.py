@@ -40,12 +40,32 @@ app.conf.beat_schedule = {
         "schedule": crontab(minute="*/5"),  # Executes every 5 minutes
         "options": {"queue": "beat_tasks"},
     },
+    "refresh_account_social_profiles_every_hour": {
+        "task": "indexer_app.tasks.refresh_account_social_profiles",
+        "schedule": crontab(minute="15"),  # Executes every hour
+        "options": {"queue": "beat_tasks"},
+    },
+    "retry_failed_events_every_minute": {
+        "task": "indexer_app.tasks.retry_failed_events",
+        "schedule": crontab(minute="*"),  # Executes every minute
+        "options": {"queue": "beat_tasks"},
+    },
+    "rebuild_rolling_leaderboards_every_hour": {
+        "task": "indexer_app.tasks.rebuild_rolling_leaderboards",
+        "schedule": crontab(minute="45"),  # Executes every hour
+        "options": {"queue": "beat_tasks"},
+    },
 }
 
 app.conf.task_routes = {
     "indexer_app.tasks.update_account_statistics": {"queue": "beat_tasks"},
     "indexer_app.tasks.fetch_usd_prices": {"queue": "beat_tasks"},
     "indexer_app.tasks.update_pot_statistics": {"queue": "beat_tasks"},
+    "indexer_app.tasks.retry_failed_events": {"queue": "beat_tasks"},
+    "indexer_app.tasks.refresh_account_social_profiles": {"queue": "beat_tasks"},
+    "indexer_app.tasks.fetch_token_usd_prices": {"queue": "beat_tasks"},
+    "indexer_app.tasks.fetch_token_coingecko_id": {"queue": "beat_tasks"},
+    "indexer_app.tasks.rebuild_rolling_leaderboards": {"queue": "beat_tasks"},
 }
 
 SPOT_INDEXER_QUEUE_NAME = "spot_indexing"
@@ -0,0 +1,123 @@
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.postgresql.base import DatabaseWrapper
+
+from base.logging import logger
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+RECENT_WRITE_KEY = "recent_write:{entity_id}"
+# URL kwargs naming the entity a view reads (checked against the indexer's recent writes)
+ENTITY_URL_KWARGS = ("account_id", "pot_id")
+
+# Database alias reads go to while handling the current request (None: primary)
+read_database: ContextVar[str] = ContextVar("read_database", default=None)
+
+_replica_lag_checks = {}  # alias -> (checked at, lag in seconds)
+
+
+def get_replica_lag(alias) -> float:
+    """Replication lag of `alias` in seconds (0 when it isn't a standby), checked at most every few seconds."""
+    checked_at, lag = _replica_lag_checks.get(alias, (0, None))
+    if time.monotonic() - checked_at < settings.READ_REPLICA_LAG_CHECK_SECONDS:
+        return lag
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT CASE WHEN pg_is_in_recovery() "
+                "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                "ELSE 0 END"
+            )
+            lag = float(cursor.fetchone()[0])
+    except Exception as e:
+        logger.warning(f"Failed to check replication lag of {alias}: {e}")
+        lag = float("inf")
+    _replica_lag_checks[alias] = (time.monotonic(), lag)
+    return lag
+
+
+def recently_written(entity_ids) -> bool:
+    keys = [RECENT_WRITE_KEY.format(entity_id=entity_id) for entity_id in entity_ids]
+    return bool(keys) and bool(cache.get_many(keys))
+
+
+async def amark_recent_writes(entity_ids):
+    """Called by the indexer so API reads of entities it just wrote go to the primary for a few seconds."""
+    await cache.aset_many(
+        {RECENT_WRITE_KEY.format(entity_id=entity_id): 1 for entity_id in entity_ids},
+        settings.READ_REPLICA_RECENT_WRITE_SECONDS,
+    )
+
+
+def get_read_database(request, view_func, view_kwargs):
+    """
+    Read policy for a request: safe requests to API views go to the read replica unless the view sets
+    `read_replica = False`, the replica is lagging, or the indexer just wrote the entity being read.
+    """
+    if not settings.READ_REPLICA_ENABLED or request.method not in SAFE_METHODS:
+        return None
+    view_class = getattr(view_func, "cls", None)  # only DRF views are routed
+    if view_class is None or not getattr(view_class, "read_replica", True):
+        return None
+    alias = settings.READ_REPLICA_DATABASE
+    if get_replica_lag(alias) > settings.READ_REPLICA_MAX_LAG_SECONDS:
+        return None
+    entity_ids = [
+        view_kwargs[kwarg] for kwarg in ENTITY_URL_KWARGS if kwarg in view_kwargs
+    ]
+    if recently_written(entity_ids):
+        return None
+    return alias
+
+
+def get_pool_stats():
+    """psycopg_pool stats (connections in use, waiting requests, ...) for this process's pools, by alias."""
+    return {
+        alias: pool.get_stats()
+        for alias, pool in DatabaseWrapper._connection_pools.items()
+    }
+
+
+def discard_inherited_pools():
+    """
+    Forgets connection pools inherited from a parent process, so a forked worker opens its own. They are not
+    closed, since their connections (and sockets) still belong to the parent.
+    """
+    DatabaseWrapper._connection_pools.clear()
+
+
+class ReadReplicaRouter:
+    """Sends reads to the alias chosen for the current request; everything else uses the primary."""
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReadReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            token = getattr(request, "_read_database_token", None)
+            if token is not None:
+                read_database.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        alias = get_read_database(request, view_func, view_kwargs)
+        if alias:
+            request._read_database_token = read_database.set(alias)
@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+from django.db import models
+
+MAX_AMOUNT_DIGITS = 40
+
+
+def to_numeric_amount(value):
+    """Converts a yocto amount (string or int) to a Decimal, or None if it isn't a valid integer amount."""
+    if value is None:
+        return None
+    value = str(value)
+    if not value.isdigit() or len(value) > MAX_AMOUNT_DIGITS:
+        return None
+    return Decimal(value)
+
+
+class NumericAmountField(models.DecimalField):
+    """
+    NUMERIC(40,0) shadow of a yocto amount that is stored as a string, so the amount can be
+    summed, sorted and filtered in SQL. The value is derived from `source` whenever the row is written.
+    """
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault("max_digits", MAX_AMOUNT_DIGITS)
+        kwargs.setdefault("decimal_places", 0)
+        kwargs.setdefault("null", True)
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = to_numeric_amount(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
@@ -1,4 +1,176 @@
+import atexit
+import copy
+import json
 import logging
+import logging.config
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
 logger = logging.getLogger("django")
 jobs_logger = logging.getLogger("jobs")
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue that a listener thread formats and ships, so slow handlers (e.g.
+    CloudWatch) never block the caller. As the queue fills up, records below WARNING are sampled
+    (the fuller the queue, the fewer are kept) and dropped once it is full; WARNING and above wait
+    briefly for space. Dropped records are counted and reported by the listener.
+    """
+
+    def __init__(self, maxsize=10000, sample_above=0.5, block_seconds=0.5):
+        super().__init__(queue.Queue(maxsize))
+        self.maxsize = maxsize
+        self.sample_above = sample_above
+        self.block_seconds = block_seconds
+        self.dropped = 0
+        self.dropped_lock = threading.Lock()
+
+    def should_enqueue(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        fill = self.queue.qsize() / self.maxsize
+        if fill <= self.sample_above:
+            return True
+        keep = (1 - fill) / (1 - self.sample_above)
+        return random.random() < keep
+
+    def prepare(self, record):
+        # only records that are kept get their message formatted (in the caller, while args are current)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=self.block_seconds)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.count_dropped()
+
+    def emit(self, record):
+        if not self.should_enqueue(record):
+            self.count_dropped()
+            return
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def count_dropped(self):
+        with self.dropped_lock:
+            self.dropped += 1
+
+    def take_dropped(self):
+        with self.dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class ReportingQueueListener(QueueListener):
+    """QueueListener that periodically logs how many records its queue handler dropped."""
+
+    def __init__(self, queue_handler, handlers, report_seconds=60):
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.report_seconds = report_seconds
+        self.last_report = time.time()
+
+    def handle(self, record):
+        super().handle(record)
+        now = record.created
+        if now - self.last_report >= self.report_seconds:
+            self.last_report = now
+            dropped = self.queue_handler.take_dropped()
+            if dropped:
+                super().handle(
+                    logging.makeLogRecord(
+                        {
+                            "name": "logging",
+                            "levelno": logging.WARNING,
+                            "levelname": "WARNING",
+                            "msg": f"Dropped {dropped} log records under backpressure",
+                        }
+                    )
+                )
+
+
+_listeners = []
+
+
+def _start_queues(config, logger_handlers):
+    """Puts each logger's handlers behind a bounded queue (one per distinct set of handlers)."""
+    queue_handlers = {}
+    for name, handlers in logger_handlers.items():
+        if handlers not in queue_handlers:
+            queue_handler = BoundedQueueHandler(**config)
+            listener = ReportingQueueListener(queue_handler, handlers)
+            listener.start()
+            _listeners.append(listener)
+            queue_handlers[handlers] = queue_handler
+        logging.getLogger(name).handlers = [queue_handlers[handlers]]
+
+
+def _stop_queues():
+    """Flushes queued records and stops the listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def configure_logging(logging_settings):
+    """
+    LOGGING_CONFIG callable: applies LOGGING with dictConfig, then moves the configured loggers'
+    handlers behind bounded queues. Options for the queues go in LOGGING["queue"] (None logs
+    synchronously).
+    """
+    logging_settings = dict(logging_settings)
+    queue_config = logging_settings.pop("queue", None)
+    logging.config.dictConfig(logging_settings)
+    if queue_config is None:
+        return
+    logger_handlers = {}
+    for name in logging_settings.get("loggers", {}):
+        handlers = tuple(logging.getLogger(name).handlers)
+        if handlers:
+            logger_handlers[name] = handlers
+    _start_queues(queue_config, logger_handlers)
+    atexit.register(_stop_queues)
+
+    def restart_in_child():
+        # listener threads don't survive a fork (e.g. celery prefork workers), so start new ones
+        _listeners.clear()
+        _start_queues(queue_config, logger_handlers)
+
+    os.register_at_fork(after_in_child=restart_in_child)
@@ -0,0 +1,154 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from base.logging import logger
+
+VIEW_VERSION_KEY = "contract_view_version:{contract_id}:{method}"
+VIEW_CACHE_KEY = "contract_view:{contract_id}:{method}:{version}:{args_hash}:{bucket}"
+VIEW_LOCK_KEY = "{cache_key}:lock"
+VIEW_LOCK_POLL_SECONDS = 0.05
+
+# calls currently being made by this process, by cache key
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+class ContractViewError(Exception):
+    """Raised when a contract view call doesn't return 200 (a timeout is reported as 504)."""
+
+    def __init__(self, contract_id, method, status_code, text):
+        self.status_code = status_code
+        self.text = text
+        super().__init__(
+            f"View {contract_id}.{method} failed ({status_code}) with message: {text}"
+        )
+
+
+def _args_hash(args):
+    if not args:
+        return "-"
+    encoded = json.dumps(args, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+def _bucket(block_height=None):
+    """
+    Indexer calls are keyed by block height, so repeated reads while indexing a block share one call,
+    everything else is bucketed by wall-clock time.
+    """
+    if block_height is not None:
+        return f"b{block_height}"
+    return f"t{int(time.time()) // settings.CONTRACT_VIEW_CACHE_TIMEOUT}"
+
+
+def _call_view(contract_id, method, args):
+    url = f"{settings.FASTNEAR_RPC_URL}/account/{contract_id}/view/{method}"
+    timeout = settings.CONTRACT_VIEW_REQUEST_TIMEOUT
+    try:
+        if args:
+            response = requests.post(url, json=args, timeout=timeout)
+        else:
+            response = requests.get(url, timeout=timeout)
+    except requests.Timeout as e:
+        raise ContractViewError(contract_id, method, 504, str(e)) from e
+    if response.status_code != 200:
+        raise ContractViewError(
+            contract_id, method, response.status_code, response.text
+        )
+    return response.json()
+
+
+def _fetch_shared(cache_key, contract_id, method, args):
+    """
+    Fetches a view result at most once across processes: the first caller takes a short Redis lock and
+    makes the call, the rest wait for its result to land in the cache (falling back to calling themselves).
+    """
+    result = cache.get(cache_key)
+    if result is not None:
+        return result
+    lock_key = VIEW_LOCK_KEY.format(cache_key=cache_key)
+    acquired = cache.add(lock_key, 1, settings.CONTRACT_VIEW_LOCK_TIMEOUT)
+    if not acquired:
+        deadline = time.monotonic() + settings.CONTRACT_VIEW_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(VIEW_LOCK_POLL_SECONDS)
+            result = cache.get(cache_key)
+            if result is not None:
+                return result
+            if cache.get(lock_key) is None:
+                break  # holder failed; call ourselves
+    try:
+        result = _call_view(contract_id, method, args)
+        if result is not None:
+            cache.set(cache_key, result, settings.CONTRACT_VIEW_CACHE_TIMEOUT)
+        return result
+    finally:
+        # a waiter falling back to calling itself must not release a lock another call has since taken
+        if acquired:
+            cache.delete(lock_key)
+
+
+def view_contract(contract_id, method, args=None, block_height=None):
+    """
+    Calls a contract view method through FastNEAR, cached per (contract, method, args) and block height
+    (indexer calls) or time bucket (everything else). FastNEAR always returns the latest state, not the
+    state at `block_height`, so indexer results are invalidated like any other. Concurrent identical calls
+    share a single in-flight request. Raises ContractViewError on failure.
+    """
+    version = cache.get(
+        VIEW_VERSION_KEY.format(contract_id=contract_id, method=method), 0
+    )
+    cache_key = VIEW_CACHE_KEY.format(
+        contract_id=contract_id,
+        method=method,
+        version=version,
+        args_hash=_args_hash(args),
+        bucket=_bucket(block_height),
+    )
+    with _in_flight_lock:
+        future = _in_flight.get(cache_key)
+        leader = future is None
+        if leader:
+            future = _in_flight[cache_key] = Future()
+    # callers may mutate what they get back, so each gets its own copy
+    if not leader:
+        return copy.deepcopy(future.result())
+
+    try:
+        future.set_result(_fetch_shared(cache_key, contract_id, method, args))
+    except Exception as e:
+        future.set_exception(e)
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(cache_key, None)
+    return copy.deepcopy(future.result())
+
+
+def invalidate_contract_view(contract_id, method="get_config"):
+    """Drops cached results of a contract view method (for all args) after its state changes."""
+    version_key = VIEW_VERSION_KEY.format(contract_id=contract_id, method=method)
+    # incr is atomic, so concurrent invalidations are never lost
+    cache.add(version_key, 0, None)
+    cache.incr(version_key)
+    logger.debug(f"Invalidated cached {contract_id}.{method} views")
+
+
+async def aview_contract(contract_id, method, args=None, block_height=None):
+    return await sync_to_async(view_contract, thread_sensitive=False)(
+        contract_id, method, args, block_height
+    )
+
+
+async def ainvalidate_contract_view(contract_id, method="get_config"):
+    version_key = VIEW_VERSION_KEY.format(contract_id=contract_id, method=method)
+    await cache.aadd(version_key, 0, None)
+    await cache.aincr(version_key)
@@ -0,0 +1,106 @@
+import random
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Imported by settings, so this module must not use Django settings or models.
+
+INDEXER_BLOCKS_OP = "indexer.blocks"
+CELERY_TASK_OP_PREFIX = "queue.task"
+
+# (path prefix, target sample rate); the first matching prefix wins
+ROUTE_SAMPLE_RATES = (
+    ("/static/", 0.0),
+    ("/api/schema", 0.0),
+    ("/favicon.ico", 0.0),
+    ("/admin/", 0.01),
+)
+TASK_SAMPLE_RATES = {
+    # the never-ending indexer tasks are traced per batch of blocks instead (see indexer_app/tracing.py)
+    "indexer_app.tasks.listen_to_near_events": 0.0,
+    "indexer_app.tasks.spot_index_near_events": 0.0,
+    # fired per donation bucket / new token, so there are lots of them
+    "indexer_app.tasks.fetch_token_usd_prices": 0.05,
+    "indexer_app.tasks.fetch_token_coingecko_id": 0.05,
+}
+
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    return value
+
+
+class TracesSamplingPolicy:
+    """
+    Sentry transaction sampling by route and task type. Transactions are sampled at `oversample` times
+    their target rate up front; once finished, slow or failed ones are always kept and the rest are
+    thinned back down to the target rate. Error events are unaffected (they are always sent).
+    """
+
+    def __init__(self, request_rate, task_rate, slow_seconds, oversample):
+        self.request_rate = request_rate
+        self.task_rate = task_rate
+        self.slow_seconds = slow_seconds
+        self.oversample = oversample
+
+    def target_rate(self, path=None, task=None, op=None):
+        if op == INDEXER_BLOCKS_OP:
+            return 1.0  # already one transaction per batch of blocks
+        if task is not None:
+            return TASK_SAMPLE_RATES.get(task, self.task_rate)
+        if path is not None:
+            for prefix, rate in ROUTE_SAMPLE_RATES:
+                if path.startswith(prefix):
+                    return rate
+        return self.request_rate
+
+    def head_rate(self, target_rate):
+        return min(1.0, target_rate * self.oversample)
+
+    def traces_sampler(self, sampling_context):
+        parent_sampled = sampling_context.get("parent_sampled")
+        if parent_sampled is not None:
+            return float(parent_sampled)
+        transaction_context = sampling_context.get("transaction_context") or {}
+        environ = sampling_context.get("wsgi_environ") or {}
+        asgi_scope = sampling_context.get("asgi_scope") or {}
+        celery_job = sampling_context.get("celery_job") or {}
+        target_rate = self.target_rate(
+            path=environ.get("PATH_INFO") or asgi_scope.get("path"),
+            task=celery_job.get("task"),
+            op=transaction_context.get("op"),
+        )
+        return self.head_rate(target_rate)
+
+    def is_outlier(self, event):
+        trace = (event.get("contexts") or {}).get("trace") or {}
+        if trace.get("status") not in (None, "ok"):
+            return True
+        try:
+            duration = _timestamp(event["timestamp"]) - _timestamp(
+                event["start_timestamp"]
+            )
+        except (KeyError, TypeError, ValueError):
+            return False
+        return duration >= self.slow_seconds
+
+    def before_send_transaction(self, event, hint):
+        if self.is_outlier(event):
+            return event
+        op = ((event.get("contexts") or {}).get("trace") or {}).get("op") or ""
+        url = (event.get("request") or {}).get("url")
+        target_rate = self.target_rate(
+            path=urlparse(url).path if url else None,
+            task=(
+                event.get("transaction")
+                if op.startswith(CELERY_TASK_OP_PREFIX)
+                else None
+            ),
+            op=op,
+        )
+        head_rate = self.head_rate(target_rate)
+        if head_rate <= 0 or random.random() >= target_rate / head_rate:
+            return None
+        return event
@@ -1,3 +1,5 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
 from rest_framework import serializers
 
 
@@ -6,3 +8,129 @@ class TwoDecimalPlacesField(serializers.DecimalField):
         if value is None:
             return value
         return format(value, ".2f")  # 2 decimal places
+
+
+sparse_fieldset_parameters = [
+    OpenApiParameter(
+        "fields",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description="Comma-separated fields to return; use dots for nested ones, e.g. id,donor,pot.name",
+    ),
+    OpenApiParameter(
+        "expand",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description="Comma-separated accounts to return in full instead of as {id, name, image_url}, e.g. donor,pot.owner",
+    ),
+]
+
+
+def _split_param(value):
+    return [path.strip() for path in (value or "").split(",") if path.strip()]
+
+
+def get_sparse_params(request):
+    """The request's `fields` and `expand` query params, as lists of dotted field paths."""
+    if request is None:
+        return [], []
+    return (
+        _split_param(request.query_params.get("fields")),
+        _split_param(request.query_params.get("expand")),
+    )
+
+
+def _names_at(paths, path):
+    """Names of the fields at `path` (a list of field names) that the dotted `paths` refer to."""
+    depth = len(path)
+    return {
+        parts[depth]
+        for parts in (dotted.split(".") for dotted in paths)
+        if len(parts) > depth and parts[:depth] == path
+    }
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer mixin applying `?fields=` and `?expand=` (read from the request in the context) at any
+    nesting level. `fields` limits the fields returned; `expand` swaps fields listed in
+    `Meta.expandable_fields` (field name -> full serializer class) for their full representation.
+    """
+
+    def _field_path(self):
+        names, field = [], self
+        while field.parent is not None:
+            if field.field_name:  # the child of a many=True field has none
+                names.append(field.field_name)
+            field = field.parent
+        return names[::-1]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = get_sparse_params(self.context.get("request"))
+        if not only and not expand:
+            return fields
+        path = self._field_path()
+        expandable_fields = getattr(self.Meta, "expandable_fields", {})
+        for name in _names_at(expand, path):
+            if name in fields and name in expandable_fields:
+                fields[name] = expandable_fields[name](
+                    many=isinstance(fields[name], serializers.ListSerializer),
+                    read_only=True,
+                    source=fields[name].source,
+                )
+        requested = _names_at(only, path)
+        if requested:
+            fields = {
+                name: field for name, field in fields.items() if name in requested
+            }
+        return fields
+
+
+def sparse_queryset(queryset, request):
+    """
+    Narrows a queryset to the top-level `?fields=` requested: only their columns are loaded and only the
+    relations among them are joined or prefetched. Left as is if a requested field isn't a model field.
+    """
+    requested = _names_at(get_sparse_params(request)[0], [])
+    if not requested:
+        return queryset
+    opts = queryset.model._meta
+    concrete_fields = {field.name for field in opts.concrete_fields}
+    many_to_many = {field.name for field in opts.many_to_many}
+    if not requested <= concrete_fields | many_to_many:
+        return queryset
+
+    def is_requested(lookup):
+        return lookup.split("__")[0] in requested
+
+    if isinstance(queryset.query.select_related, dict):
+        select_related = list(
+            filter(is_requested, _select_related_paths(queryset.query.select_related))
+        )
+        queryset = queryset.select_related(None)
+        if (
+            select_related
+        ):  # select_related() with no lookups would follow every relation
+            queryset = queryset.select_related(*select_related)
+    prefetch_related = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if is_requested(getattr(lookup, "prefetch_to", lookup))
+    ]
+    return (
+        queryset.prefetch_related(None)
+        .prefetch_related(*prefetch_related)
+        .only(opts.pk.name, *(requested & concrete_fields))
+    )
+
+
+def _select_related_paths(tree, prefix=""):
+    """Flattens a query's select_related tree into lookups, e.g. {"pot": {"owner": {}}} -> ["pot__owner"]."""
+    paths = []
+    for name, children in tree.items():
+        if children:
+            paths.extend(_select_related_paths(children, f"{prefix}{name}__"))
+        else:
+            paths.append(f"{prefix}{name}")
+    return paths
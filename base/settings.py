@@ -19,6 +19,8 @@ from pathlib import Path
 import boto3
 import sentry_sdk
 
+from base.sentry import TracesSamplingPolicy
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -53,6 +55,9 @@ POSTGRES_PASS = os.environ.get("PL_POSTGRES_PASS", None)
 POSTGRES_PORT = os.environ.get("PL_POSTGRES_PORT", None)
 POSTGRES_READONLY_PASS = os.environ.get("PL_POSTGRES_READONLY_PASS", None)
 POSTGRES_READONLY_USER = os.environ.get("PL_POSTGRES_READONLY_USER", None)
+POSTGRES_REPLICA_HOST = os.environ.get("PL_POSTGRES_REPLICA_HOST", None)
+# "api" (gunicorn), "indexer" or "worker" (celery beat tasks); sizes each process's DB connection pool
+PROCESS_ROLE = os.environ.get("PL_PROCESS_ROLE", "api")
 POSTGRES_USER = os.environ.get("PL_POSTGRES_USER", None)
 REDIS_HOST = os.environ.get("PL_REDIS_HOST", "localhost")
 REDIS_PORT = os.environ.get("PL_REDIS_PORT", 6379)
@@ -60,10 +65,14 @@ SENTRY_DSN = os.environ.get("PL_SENTRY_DSN")
 
 POTLOCK_TLA = "potlock.testnet" if ENVIRONMENT == "testnet" else "potlock.near"
 NADABOT_TLA = "nadabot.testnet" if ENVIRONMENT == "testnet" else "nadabot.near"
+NADABOT_REGISTRY_ID = (
+    "nadabot.testnet" if ENVIRONMENT == "testnet" else "v1.nadabot.near"
+)
 
 NEAR_SOCIAL_CONTRACT_ADDRESS = (
     "v1.social08.testnet" if ENVIRONMENT == "testnet" else "social.near"
 )
+IPFS_GATEWAY_URL = "https://ipfs.near.social/ipfs/"
 
 FASTNEAR_RPC_URL = (
     "https://rpc.web4.testnet.page"
@@ -72,6 +81,26 @@ FASTNEAR_RPC_URL = (
 )
 
 BLOCK_SAVE_HEIGHT = os.environ.get("BLOCK_SAVE_HEIGHT")
+# Cached FastNEAR contract view calls (e.g. get_config); handlers invalidate them when state changes
+# also the time bucket size for calls made outside the indexer
+CONTRACT_VIEW_CACHE_TIMEOUT = 60
+CONTRACT_VIEW_LOCK_TIMEOUT = 10  # how long identical calls wait on the one in flight
+# kept under the lock timeout, so a slow call fails before its waiters give up on it
+CONTRACT_VIEW_REQUEST_TIMEOUT = 5
+
+# JSON decoding backend for receipt args/results: "auto" (orjson > msgspec > json), "orjson", "msgspec" or "json"
+INDEXER_JSON_BACKEND = os.environ.get("PL_INDEXER_JSON_BACKEND", "auto")
+# Fraction of receipt payloads to log at DEBUG level (0 disables payload logging)
+INDEXER_PAYLOAD_LOG_SAMPLE_RATE = float(
+    os.environ.get("PL_INDEXER_PAYLOAD_LOG_SAMPLE_RATE", "0")
+)
+# Retry policy for dead-lettered (failed) indexer events
+DEAD_LETTER_MAX_ATTEMPTS = int(os.environ.get("PL_DEAD_LETTER_MAX_ATTEMPTS", 8))
+DEAD_LETTER_RETRY_BASE_SECONDS = 60
+DEAD_LETTER_RETRY_MAX_SECONDS = 60 * 60 * 6  # 6 hours
+INDEXER_SKIP_PROCESSED_RECEIPTS = strtobool(
+    os.environ.get("PL_INDEXER_SKIP_PROCESSED_RECEIPTS", "True")
+)
 
 COINGECKO_URL = (
     "https://pro-api.coingecko.com/api/v3"
@@ -80,6 +109,30 @@ COINGECKO_URL = (
 )
 # Number of hours around a given timestamp for querying historical prices
 HISTORICAL_PRICE_QUERY_HOURS = 24
+SOCIAL_PROFILE_REFRESH_BATCH_SIZE = 100  # accounts per social keys/get call
+SOCIAL_PROFILE_REFRESH_CONCURRENCY = 4
+SOCIAL_PROFILE_REFRESH_RPS = float(os.environ.get("PL_SOCIAL_PROFILE_REFRESH_RPS", 5))
+SOCIAL_PROFILE_REFRESH_TASK_LIMIT = 10000  # accounts checked per periodic task run
+# failed batches are retried this many times (after 1s, 2s, 4s...) before the run stops
+SOCIAL_PROFILE_REFRESH_RETRIES = 3
+NFT_METADATA_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+NFT_METADATA_REQUEST_TIMEOUT = 10  # seconds, then counted as a failed lookup
+# failed NFT lookups are retried after this
+NFT_METADATA_NEGATIVE_CACHE_TIMEOUT = 60 * 60
+# also bounds how long an expired stamp keeps counting
+HUMAN_SCORE_CACHE_TIMEOUT = 60 * 60 * 24
+IS_HUMAN_MAX_ACCOUNTS = 100  # max accounts per batch is_human request
+ACCOUNT_BATCH_MAX_ACCOUNTS = 100  # max accounts per batch account lookup
+ACCOUNT_BATCH_CACHE_TIMEOUT = 60 * 5  # same as the account detail endpoint's cache
+ACCOUNT_BATCH_NEGATIVE_CACHE_TIMEOUT = 60  # unknown IDs are looked up again after this
+DONATION_HISTOGRAM_MAX_BUCKETS = 24 * 31  # max buckets per donation histogram request
+SEARCH_MIN_QUERY_LENGTH = 3  # shorter queries share too few trigrams to match usefully
+SEARCH_DEFAULT_LIMIT = 10  # results per type
+SEARCH_MAX_LIMIT = 50
+POT_MATCHING_CACHE_TIMEOUT = 60 * 60 * 24  # keyed by latest donation id, so never stale
+# donations of the same token within one bucket are priced by a single deferred job
+USD_PRICE_BUCKET_SECONDS = 60 * 60
+USD_PRICE_COALESCE_SECONDS = 30  # how long a bucket's job waits for more donations
 
 # Application definition
 
@@ -90,6 +143,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "django_extensions",
@@ -141,6 +195,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "base.db.ReadReplicaMiddleware",
 ]
 
 ROOT_URLCONF = "base.urls"
@@ -205,13 +260,19 @@ CELERY_BROKER_TRANSPORT_OPTIONS = {
 
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        # django_redis with a short-lived in-process L1 and stale-while-revalidate for cache_page
+        # responses (see base/cache.py)
+        "BACKEND": "base.cache.LayeredRedisCache",
         "LOCATION": DJANGO_CACHE_URL,
         "TIMEOUT": 300,  # 5 minutes
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
             "SSL": True,
             "KEY_PREFIX": "django_cache",
+            "L1_MAX_ENTRIES": 1000,
+            "L1_TIMEOUT": int(os.environ.get("PL_CACHE_L1_TIMEOUT", 5)),
+            # cache_page responses are served stale for up to this long while one worker refreshes them
+            "SWR_GRACE": 60 * 5,
             # "ssl_cert_reqs": "CERT_NONE",
         },
     }
@@ -229,6 +290,26 @@ CACHES = {
 # DATABASE CONFIGS
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 ###############################################################################
+# Pooled connections (psycopg_pool), one pool per alias per process, sized by role: (min, max)
+DB_POOL_SIZES = {
+    "api": (2, 8),
+    "indexer": (2, 6),
+    # social profile refreshes run SOCIAL_PROFILE_REFRESH_CONCURRENCY threads
+    "worker": (1, 6),
+}
+DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE = DB_POOL_SIZES.get(
+    PROCESS_ROLE, DB_POOL_SIZES["api"]
+)
+DB_POOL_MIN_SIZE = int(os.environ.get("PL_DB_POOL_MIN_SIZE", DB_POOL_MIN_SIZE))
+DB_POOL_MAX_SIZE = int(os.environ.get("PL_DB_POOL_MAX_SIZE", DB_POOL_MAX_SIZE))
+DB_POOL_OPTIONS = {
+    "min_size": DB_POOL_MIN_SIZE,
+    "max_size": DB_POOL_MAX_SIZE,
+    "timeout": 10,  # seconds to wait for a free connection
+    "max_idle": 60 * 5,  # idle connections above min_size are closed after this
+    "max_lifetime": 60 * 30,
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -237,6 +318,8 @@ DATABASES = {
         "PASSWORD": POSTGRES_PASS,
         "HOST": POSTGRES_HOST,
         "PORT": POSTGRES_PORT,
+        "CONN_HEALTH_CHECKS": True,  # pooled connections are checked before being handed out
+        "OPTIONS": {"pool": DB_POOL_OPTIONS},
     },
     "default_readonly": {
         "ENGINE": "django.db.backends.postgresql",
@@ -245,8 +328,29 @@ DATABASES = {
         "PASSWORD": POSTGRES_READONLY_PASS,
         "HOST": POSTGRES_HOST,
         "PORT": POSTGRES_PORT,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": DB_POOL_OPTIONS},
+        "TEST": {"MIRROR": "default"},
     },
 }
+if POSTGRES_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **DATABASES["default_readonly"],
+        "HOST": POSTGRES_REPLICA_HOST,
+    }
+
+# API reads (safe requests to DRF views) go to the replica if there is one, else the read-only user
+DATABASE_ROUTERS = ["base.db.ReadReplicaRouter"]
+READ_REPLICA_ENABLED = strtobool(
+    os.environ.get(
+        "PL_READ_REPLICA_ENABLED", "True" if POSTGRES_READONLY_USER else "False"
+    )
+)
+READ_REPLICA_DATABASE = "replica" if POSTGRES_REPLICA_HOST else "default_readonly"
+READ_REPLICA_MAX_LAG_SECONDS = 5  # reads fall back to the primary above this lag
+READ_REPLICA_LAG_CHECK_SECONDS = 5
+# entities the indexer just wrote are read from the primary
+READ_REPLICA_RECENT_WRITE_SECONDS = 5
 
 CACHALOT_DATABASES = {"default"}
 
@@ -261,18 +365,26 @@ log_level = getattr(logging, LOG_LEVEL, logging.INFO)
 # Set log group name based on environment
 log_group_name = f"django-indexer-{ENVIRONMENT}"
 
+# "text" or "json" (one JSON object per line)
+LOG_FORMAT = os.environ.get(
+    "PL_LOG_FORMAT", "text" if ENVIRONMENT == "local" else "json"
+)
+
 # Setting up the logging configuration
+# Handlers run on a listener thread behind a bounded queue (see base.logging.configure_logging)
+LOGGING_CONFIG = "base.logging.configure_logging"
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
         "standard": {"format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"},
+        "json": {"()": "base.logging.JsonFormatter"},
     },
     "handlers": {
         "console": {
             "level": log_level,
             "class": "logging.StreamHandler",
-            "formatter": "standard",
+            "formatter": "standard" if LOG_FORMAT == "text" else "json",
         },
     },
     "loggers": {
@@ -293,6 +405,8 @@ LOGGING = {
         },
         "": {"handlers": ["console"], "level": log_level},  # root logger
     },
+    # records below WARNING are sampled once the queue is half full and dropped when it is full
+    "queue": {"maxsize": 10000, "sample_above": 0.5},
 }
 
 # Adding Watchtower logging handler for non-local environments
@@ -303,7 +417,7 @@ if ENVIRONMENT != "local":
         "class": "watchtower.CloudWatchLogHandler",
         "boto3_client": boto3_logs_client,
         "log_group_name": log_group_name,
-        "formatter": "standard",
+        "formatter": "json",
         "level": log_level,
     }
     LOGGING["loggers"][""]["handlers"].append("watchtower")
@@ -314,16 +428,30 @@ if ENVIRONMENT != "local":
 
 ## SENTRY CONFIG
 
+# Target share of API requests / celery tasks traced (slow or failed ones are always kept)
+SENTRY_TRACES_SAMPLE_RATE = float(os.environ.get("PL_SENTRY_TRACES_SAMPLE_RATE", 0.05))
+SENTRY_TASK_TRACES_SAMPLE_RATE = 0.25
+SENTRY_TRACES_OVERSAMPLE = 4  # head-sampling factor that lets slow outliers be kept
+SENTRY_SLOW_TRANSACTION_SECONDS = 1.0
+# Share of sampled transactions that are also profiled
+SENTRY_PROFILES_SAMPLE_RATE = float(
+    os.environ.get("PL_SENTRY_PROFILES_SAMPLE_RATE", 0.1)
+)
+# The indexer loop is traced as one transaction per this many blocks
+SENTRY_INDEXER_BLOCKS_PER_TRANSACTION = 100
+
+sentry_traces_policy = TracesSamplingPolicy(
+    request_rate=SENTRY_TRACES_SAMPLE_RATE,
+    task_rate=SENTRY_TASK_TRACES_SAMPLE_RATE,
+    slow_seconds=SENTRY_SLOW_TRANSACTION_SECONDS,
+    oversample=SENTRY_TRACES_OVERSAMPLE,
+)
 sentry_sdk.init(
     environment=ENVIRONMENT,
     dsn=SENTRY_DSN,
-    # Set traces_sample_rate to 1.0 to capture 100%
-    # of transactions for performance monitoring.
-    traces_sample_rate=1.0,
-    # Set profiles_sample_rate to 1.0 to profile 100%
-    # of sampled transactions.
-    # We recommend adjusting this value in production.
-    profiles_sample_rate=1.0,
+    traces_sampler=sentry_traces_policy.traces_sampler,
+    before_send_transaction=sentry_traces_policy.before_send_transaction,
+    profiles_sample_rate=SENTRY_PROFILES_SAMPLE_RATE,
 )
 
 
@@ -2,36 +2,39 @@ from django.contrib import admin
 from django.utils.dateformat import format
 from django.utils.timezone import localtime
 
+from base.admin import LargeTableAdmin
+
 from .models import Donation
 
 
 @admin.register(Donation)
-class DonationAdmin(admin.ModelAdmin):
-    list_display = [field.name for field in Donation._meta.get_fields()]
-    list_display.extend(
-        [
-            "donor_address",
-            "recipient_address",
-            "token_address",
-            "referrer_address",
-            "chef_address",
-        ]
-    )  # Add custom methods for addresses
+class DonationAdmin(LargeTableAdmin):
+    list_display = (
+        "id",
+        "donated_at",
+        "donor_address",
+        "recipient_address",
+        "pot",
+        "token_address",
+        "total_amount",
+        "total_amount_usd",
+        "matching_pool",
+    )
     search_fields = (
         "message",
         "donor__id",
     )  # Correct field name from 'donor__address' to 'donor__id' if 'id' is used in the model
-    list_filter = ("donated_at", "donor", "pot", "pot__account")
+    list_filter = ("donated_at", "matching_pool")
     date_hierarchy = "donated_at"
     ordering = ("-donated_at",)
-
-    def get_queryset(self, request):
-        # Prefetch related donor, recipient, token, referrer, and chef to prevent N+1 queries
-        return (
-            super()
-            .get_queryset(request)
-            .prefetch_related("donor", "recipient", "token", "referrer", "chef")
-        )
+    # Join related donor, recipient, token and pot to prevent N+1 queries
+    list_select_related = (
+        "donor",
+        "recipient",
+        "token__account",
+        "pot",
+    )
+    raw_id_fields = ("donor", "recipient", "token", "referrer", "chef", "pot")
 
     def donor_address(self, obj):
         return obj.donor.id
@@ -45,12 +48,6 @@ class DonationAdmin(admin.ModelAdmin):
     def token_address(self, obj):
         return obj.token.account
 
-    def referrer_address(self, obj):
-        return obj.referrer.id if obj.referrer else None
-
-    def chef_address(self, obj):
-        return obj.chef.id if obj.chef else None
-
     def formfield_for_dbfield(self, db_field, request, **kwargs):
         field = super(DonationAdmin, self).formfield_for_dbfield(
             db_field, request, **kwargs
@@ -1,5 +1,9 @@
-import requests
+from datetime import datetime, time
+from datetime import timezone as dt_timezone
+
 from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from drf_spectacular.utils import (
@@ -16,12 +20,44 @@ from rest_framework.views import APIView
 from api.pagination import pagination_parameters
 from api.pagination import CustomSizePageNumberPagination
 from base.logging import logger
+from base.rpc import ContractViewError, view_contract
+from base.serializers import sparse_fieldset_parameters, sparse_queryset
 
-from .serializers import DonationContractConfigSerializer
+from .models import (
+    GLOBAL_SCOPE,
+    DonationRollup,
+    DonationRollupGranularity,
+    LeaderboardEntry,
+    LeaderboardType,
+    LeaderboardWindow,
+    make_scope,
+)
+from .rollups import BUCKET_SIZES, bucket_start
+from .serializers import (
+    DONATION_HISTOGRAM_EXAMPLE,
+    PAGINATED_LEADERBOARD_EXAMPLE,
+    DonationContractConfigSerializer,
+    DonationHistogramResponseSerializer,
+    LeaderboardEntrySerializer,
+    PaginatedLeaderboardResponseSerializer,
+)
 
 DONATE_CONTRACT = "donate." + settings.POTLOCK_TLA
 
 
+def _parse_time(value):
+    """Parses an ISO 8601 datetime or date (as its midnight) into an aware datetime, or returns None."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        date = parse_date(value)
+        if date is None:
+            return None
+        parsed = datetime.combine(date, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
 class DonationContractConfigAPI(APIView, CustomSizePageNumberPagination):
 
     @extend_schema(
@@ -52,19 +88,212 @@ class DonationContractConfigAPI(APIView, CustomSizePageNumberPagination):
     )
     @method_decorator(cache_page(60 * 5))
     def get(self, request: Request, *args, **kwargs):
-        url = f"{settings.FASTNEAR_RPC_URL}/account/{DONATE_CONTRACT}/view/get_config"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            data.pop("total_donations_amount")
-            data.pop("net_donations_amount")
-            data.pop("total_donations_count")
-            data.pop("total_protocol_fees")
-            data.pop("total_referrer_fees")
-
-            return Response(data)
-        else:
-            logger.error(
-                f"Request for {DONATE_CONTRACT} config failed ({response.status_code}) with message: {response.text}"
+        try:
+            data = view_contract(DONATE_CONTRACT, "get_config")
+        except ContractViewError as e:
+            logger.error(f"Request for {DONATE_CONTRACT} config failed: {e}")
+            return Response({"message": e.text}, status=e.status_code)
+        data.pop("total_donations_amount")
+        data.pop("net_donations_amount")
+        data.pop("total_donations_count")
+        data.pop("total_protocol_fees")
+        data.pop("total_referrer_fees")
+
+        return Response(data)
+
+
+class LeaderboardAPI(APIView, CustomSizePageNumberPagination):
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "board",
+                str,
+                OpenApiParameter.PATH,
+                enum=LeaderboardType.values,
+                description="Rank donors by amount donated, recipients by amount received, or referrers by referral fees earned",
+            ),
+            OpenApiParameter(
+                "pot_id",
+                str,
+                OpenApiParameter.QUERY,
+                description="Only count donations to this pot (defaults to all donations)",
+            ),
+            OpenApiParameter(
+                "window",
+                str,
+                OpenApiParameter.QUERY,
+                enum=LeaderboardWindow.values,
+                description="Only count donations made in the last 7 or 30 days (defaults to all time)",
+            ),
+            *pagination_parameters,
+            *sparse_fieldset_parameters,
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=PaginatedLeaderboardResponseSerializer,
+                description="Returns a page of the leaderboard, ranked by total USD",
+                examples=[
+                    OpenApiExample(
+                        "example-1",
+                        summary="Simple example",
+                        description="Example response for a leaderboard",
+                        value=PAGINATED_LEADERBOARD_EXAMPLE,
+                        response_only=True,
+                    ),
+                ],
+            ),
+            400: OpenApiResponse(description="Invalid window value"),
+            404: OpenApiResponse(description="Leaderboard not found"),
+        },
+    )
+    @method_decorator(cache_page(60 * 5))
+    def get(self, request: Request, *args, **kwargs):
+        board = kwargs.get("board")
+        if board not in LeaderboardType.values:
+            return Response({"message": f"Leaderboard {board} not found."}, status=404)
+        window = request.query_params.get("window", LeaderboardWindow.ALL_TIME)
+        if window not in LeaderboardWindow.values:
+            return Response({"message": f"Invalid window value: {window}"}, status=400)
+
+        pot_id = request.query_params.get("pot_id")
+        scope = make_scope("pot", pot_id) if pot_id else GLOBAL_SCOPE
+        entries = (
+            LeaderboardEntry.objects.filter(
+                board=board,
+                scope=scope,
+                window=window,
             )
-            return Response({"message": response.text}, status=response.status_code)
+            .select_related("account")
+            .order_by("-total_usd", "account")
+        )
+        entries = sparse_queryset(entries, request)
+        results = self.paginate_queryset(entries, request, view=self)
+        for rank, entry in enumerate(results, start=self.page.start_index()):
+            entry.rank = rank
+        serializer = LeaderboardEntrySerializer(
+            results, many=True, context={"request": request}
+        )
+        return self.get_paginated_response(serializer.data)
+
+
+class DonationHistogramAPI(APIView):
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "granularity",
+                str,
+                OpenApiParameter.QUERY,
+                enum=DonationRollupGranularity.values,
+                description="Bucket size (defaults to day)",
+            ),
+            OpenApiParameter(
+                "pot_id",
+                str,
+                OpenApiParameter.QUERY,
+                description="Only count donations to this pot",
+            ),
+            OpenApiParameter(
+                "recipient_id",
+                str,
+                OpenApiParameter.QUERY,
+                description="Only count donations to this account (can't be combined with pot_id)",
+            ),
+            OpenApiParameter(
+                "token_id",
+                str,
+                OpenApiParameter.QUERY,
+                description="Only count donations in this token (defaults to one row per token per bucket)",
+            ),
+            OpenApiParameter(
+                "start",
+                str,
+                OpenApiParameter.QUERY,
+                description="ISO 8601 datetime or date to start from (defaults to 30 buckets before end)",
+            ),
+            OpenApiParameter(
+                "end",
+                str,
+                OpenApiParameter.QUERY,
+                description="ISO 8601 datetime or date to end at, exclusive (defaults to now)",
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=DonationHistogramResponseSerializer,
+                description="Returns donation totals per time bucket and token, oldest first; buckets without donations are omitted",
+                examples=[
+                    OpenApiExample(
+                        "example-1",
+                        summary="Simple example",
+                        description="Example response for a donation histogram",
+                        value=DONATION_HISTOGRAM_EXAMPLE,
+                        response_only=True,
+                    ),
+                ],
+            ),
+            400: OpenApiResponse(description="Invalid query parameters"),
+        },
+    )
+    @method_decorator(cache_page(60 * 5))
+    def get(self, request: Request, *args, **kwargs):
+        granularity = request.query_params.get(
+            "granularity", DonationRollupGranularity.DAY
+        )
+        if granularity not in DonationRollupGranularity.values:
+            return Response(
+                {"message": f"Invalid granularity value: {granularity}"}, status=400
+            )
+        granularity = DonationRollupGranularity(granularity)
+        pot_id = request.query_params.get("pot_id")
+        recipient_id = request.query_params.get("recipient_id")
+        if pot_id and recipient_id:
+            return Response(
+                {"message": "pot_id and recipient_id can't be combined."}, status=400
+            )
+
+        bounds = {}
+        for param in ("start", "end"):
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            bounds[param] = _parse_time(value)
+            if bounds[param] is None:
+                return Response(
+                    {"message": f"Invalid {param} value: {value}"}, status=400
+                )
+        bucket_size = BUCKET_SIZES[granularity]
+        end = bounds.get("end") or timezone.now()
+        start = bucket_start(bounds.get("start") or end - 30 * bucket_size, granularity)
+        if start >= end:
+            return Response({"message": "start must be before end."}, status=400)
+        if (end - start) / bucket_size > settings.DONATION_HISTOGRAM_MAX_BUCKETS:
+            return Response(
+                {
+                    "message": f"Too many {granularity.value} buckets requested (max {settings.DONATION_HISTOGRAM_MAX_BUCKETS})."
+                },
+                status=400,
+            )
+
+        if pot_id:
+            scope = make_scope("pot", pot_id)
+        elif recipient_id:
+            scope = make_scope("recipient", recipient_id)
+        else:
+            scope = GLOBAL_SCOPE
+        rollups = DonationRollup.objects.filter(
+            granularity=granularity, scope=scope, bucket__gte=start, bucket__lt=end
+        ).order_by("bucket", "token")
+        token_id = request.query_params.get("token_id")
+        if token_id:
+            rollups = rollups.filter(token_id=token_id)
+        serializer = DonationHistogramResponseSerializer(
+            {
+                "granularity": granularity.value,
+                "start": start,
+                "end": end,
+                "results": rollups,
+            }
+        )
+        return Response(serializer.data)
@@ -0,0 +1,144 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import (
+    GLOBAL_SCOPE,
+    Donation,
+    LeaderboardEntry,
+    LeaderboardType,
+    LeaderboardWindow,
+    make_scope,
+)
+from .utils import save_recomputed_totals
+
+# donation field holding the ranked account, and the USD amount it is ranked by
+BOARD_FIELDS = {
+    LeaderboardType.DONORS: ("donor_id", "total_amount_usd"),
+    LeaderboardType.RECIPIENTS: ("recipient_id", "total_amount_usd"),
+    LeaderboardType.REFERRERS: ("referrer_id", "referrer_fee_usd"),
+}
+WINDOW_DAYS = {
+    LeaderboardWindow.LAST_7_DAYS: 7,
+    LeaderboardWindow.LAST_30_DAYS: 30,
+}
+UNIQUE_FIELDS = ["board", "scope", "window", "account"]
+UPDATE_FIELDS = ["total_usd", "donations_count", "updated_at"]
+
+
+def _window_filter(window, now):
+    if window == LeaderboardWindow.ALL_TIME:
+        return None
+    return Q(donated_at__gte=now - timedelta(days=WINDOW_DAYS[window]))
+
+
+def _ranked_donations(board):
+    """Donations that count towards a leaderboard: priced ones with an account to rank."""
+    account_field, usd_field = BOARD_FIELDS[board]
+    return Donation.objects.filter(
+        **{f"{account_field}__isnull": False, f"{usd_field}__isnull": False}
+    )
+
+
+def update_leaderboards(donations):
+    """
+    Recomputes the leaderboard entries (all windows, platform-wide and per pot) of the accounts involved
+    in `donations`, e.g. once their USD amounts are set.
+    """
+    # (board, pot id or None for the platform-wide board, account id)
+    keys = set()
+    for donation in donations:
+        for board, (account_field, _) in BOARD_FIELDS.items():
+            account_id = getattr(donation, account_field)
+            if account_id is None:
+                continue
+            keys.add((board, None, account_id))
+            if donation.pot_id:
+                keys.add((board, donation.pot_id, account_id))
+    if not keys:
+        return
+
+    now = timezone.now()
+    entries, empty = [], Q()
+    for board, pot_id, account_id in keys:
+        account_field, usd_field = BOARD_FIELDS[board]
+        ranked = _ranked_donations(board).filter(**{account_field: account_id})
+        scope = GLOBAL_SCOPE
+        if pot_id:
+            ranked = ranked.filter(pot_id=pot_id)
+            scope = make_scope("pot", pot_id)
+        aggregates = {}
+        for window in LeaderboardWindow:
+            window_filter = _window_filter(window, now)
+            aggregates[f"usd_{window.value}"] = Sum(usd_field, filter=window_filter)
+            aggregates[f"count_{window.value}"] = Count("id", filter=window_filter)
+        totals = ranked.aggregate(**aggregates)
+        for window in LeaderboardWindow:
+            if totals[f"count_{window.value}"]:
+                entries.append(
+                    LeaderboardEntry(
+                        board=board,
+                        scope=scope,
+                        window=window,
+                        account_id=account_id,
+                        total_usd=totals[f"usd_{window.value}"],
+                        donations_count=totals[f"count_{window.value}"],
+                        updated_at=now,
+                    )
+                )
+            else:
+                empty |= Q(
+                    board=board, scope=scope, window=window, account_id=account_id
+                )
+
+    save_recomputed_totals(LeaderboardEntry, entries, UNIQUE_FIELDS, UPDATE_FIELDS)
+    if empty:
+        LeaderboardEntry.objects.filter(empty).delete()
+
+
+def rebuild_leaderboards(windows=None):
+    """
+    Recomputes whole leaderboards from the donations table: run periodically for the rolling windows
+    (whose totals change as donations age out) and once to backfill the all-time ones.
+    """
+    now = timezone.now()
+    for window in windows or LeaderboardWindow:
+        window_filter = _window_filter(window, now)
+        for board, (account_field, usd_field) in BOARD_FIELDS.items():
+            ranked = _ranked_donations(board)
+            if window_filter is not None:
+                ranked = ranked.filter(window_filter)
+            totals = {"total_usd": Sum(usd_field), "donations_count": Count("id")}
+            rows = [
+                *ranked.values(account_field).annotate(**totals).order_by(),
+                *ranked.filter(pot__isnull=False)
+                .values("pot_id", account_field)
+                .annotate(**totals)
+                .order_by(),
+            ]
+            entries = [
+                LeaderboardEntry(
+                    board=board,
+                    scope=(
+                        make_scope("pot", row["pot_id"])
+                        if "pot_id" in row
+                        else GLOBAL_SCOPE
+                    ),
+                    window=window,
+                    account_id=row[account_field],
+                    total_usd=row["total_usd"],
+                    donations_count=row["donations_count"],
+                    updated_at=now,
+                )
+                for row in rows
+            ]
+            with transaction.atomic():
+                save_recomputed_totals(
+                    LeaderboardEntry, entries, UNIQUE_FIELDS, UPDATE_FIELDS
+                )
+                # accounts that no longer have donations in the window
+                LeaderboardEntry.objects.filter(
+                    board=board, window=window, updated_at__lt=now
+                ).delete()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from donations.rollups import rebuild_donation_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the hourly and daily donation rollups from all donations."
+
+    def handle(self, *args, **options):
+        rebuild_donation_rollups()
+        self.stdout.write(self.style.SUCCESS("Rebuilt donation rollups"))
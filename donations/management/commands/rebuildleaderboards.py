@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from donations.leaderboards import rebuild_leaderboards
+from donations.models import LeaderboardWindow
+
+
+class Command(BaseCommand):
+    help = "Recompute donor, recipient and referrer leaderboards from all priced donations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window",
+            action="append",
+            choices=LeaderboardWindow.values,
+            help="Only rebuild this window (can be repeated; defaults to all windows)",
+        )
+
+    def handle(self, *args, **options):
+        windows = [LeaderboardWindow(window) for window in options["window"] or []]
+        windows = windows or list(LeaderboardWindow)
+        rebuild_leaderboards(windows)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt leaderboards for windows: {', '.join(windows)}"
+            )
+        )
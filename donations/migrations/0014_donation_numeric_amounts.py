@@ -0,0 +1,96 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:05
+
+import base.fields
+from django.db import migrations
+
+BACKFILL_DONATION_SQL = """
+UPDATE donations_donation SET
+    total_amount_numeric = CASE WHEN total_amount ~ '^[0-9]{1,40}$' THEN total_amount::numeric END,
+    net_amount_numeric = CASE WHEN net_amount ~ '^[0-9]{1,40}$' THEN net_amount::numeric END,
+    protocol_fee_numeric = CASE WHEN protocol_fee ~ '^[0-9]{1,40}$' THEN protocol_fee::numeric END,
+    referrer_fee_numeric = CASE WHEN referrer_fee ~ '^[0-9]{1,40}$' THEN referrer_fee::numeric END,
+    chef_fee_numeric = CASE WHEN chef_fee ~ '^[0-9]{1,40}$' THEN chef_fee::numeric END;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("donations", "0013_alter_donation_chef_alter_donation_chef_fee_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="donation",
+            name="total_amount_numeric",
+            field=base.fields.NumericAmountField(
+                blank=True,
+                db_index=True,
+                decimal_places=0,
+                editable=False,
+                help_text="Total amount as a number, for SQL aggregation and sorting.",
+                max_digits=40,
+                null=True,
+                source="total_amount",
+                verbose_name="total amount (numeric)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="donation",
+            name="net_amount_numeric",
+            field=base.fields.NumericAmountField(
+                blank=True,
+                db_index=True,
+                decimal_places=0,
+                editable=False,
+                help_text="Net amount as a number, for SQL aggregation and sorting.",
+                max_digits=40,
+                null=True,
+                source="net_amount",
+                verbose_name="net amount (numeric)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="donation",
+            name="protocol_fee_numeric",
+            field=base.fields.NumericAmountField(
+                blank=True,
+                decimal_places=0,
+                editable=False,
+                help_text="Protocol fee as a number, for SQL aggregation and sorting.",
+                max_digits=40,
+                null=True,
+                source="protocol_fee",
+                verbose_name="protocol fee (numeric)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="donation",
+            name="referrer_fee_numeric",
+            field=base.fields.NumericAmountField(
+                blank=True,
+                decimal_places=0,
+                editable=False,
+                help_text="Referrer fee as a number, for SQL aggregation and sorting.",
+                max_digits=40,
+                null=True,
+                source="referrer_fee",
+                verbose_name="referrer fee (numeric)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="donation",
+            name="chef_fee_numeric",
+            field=base.fields.NumericAmountField(
+                blank=True,
+                decimal_places=0,
+                editable=False,
+                help_text="Chef fee as a number, for SQL aggregation and sorting.",
+                max_digits=40,
+                null=True,
+                source="chef_fee",
+                verbose_name="chef fee (numeric)",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_DONATION_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.0.6 on 2026-10-19 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_account_near_social_profile_block_height"),
+        ("donations", "0014_donation_numeric_amounts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "board",
+                    models.CharField(
+                        choices=[
+                            ("donors", "Donors"),
+                            ("recipients", "Recipients"),
+                            ("referrers", "Referrers"),
+                        ],
+                        help_text="Leaderboard (donors, recipients or referrers).",
+                        max_length=16,
+                        verbose_name="board",
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        help_text="'global', or the ID of the pot the leaderboard is for.",
+                        max_length=64,
+                        verbose_name="scope",
+                    ),
+                ),
+                (
+                    "window",
+                    models.CharField(
+                        choices=[
+                            ("all", "All time"),
+                            ("7d", "Last 7 days"),
+                            ("30d", "Last 30 days"),
+                        ],
+                        help_text="Time window the totals cover.",
+                        max_length=8,
+                        verbose_name="window",
+                    ),
+                ),
+                (
+                    "total_usd",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Donated, received, or earned in referral fees (for referrers) in USD.",
+                        max_digits=20,
+                        verbose_name="total USD",
+                    ),
+                ),
+                (
+                    "donations_count",
+                    models.PositiveIntegerField(
+                        help_text="Number of donations counted in the total.",
+                        verbose_name="donations count",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        help_text="When the entry was last recomputed.",
+                        verbose_name="updated at",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        help_text="Account ranked.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_entries",
+                        to="accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Leaderboard entries",
+                "indexes": [
+                    models.Index(
+                        fields=["board", "scope", "window", "-total_usd", "account"],
+                        name="leaderboard_ranking_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("board", "scope", "window", "account"),
+                        name="unique_leaderboard_entry",
+                    )
+                ],
+            },
+        ),
+    ]
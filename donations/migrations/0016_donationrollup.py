@@ -0,0 +1,115 @@
+# Generated by Django 5.0.6 on 2026-10-19 17:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("donations", "0015_leaderboardentry"),
+        ("tokens", "0007_token_icon_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DonationRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("hour", "Hour"), ("day", "Day")],
+                        help_text="Bucket size.",
+                        max_length=8,
+                        verbose_name="granularity",
+                    ),
+                ),
+                (
+                    "bucket",
+                    models.DateTimeField(
+                        help_text="Start of the bucket (UTC).",
+                        verbose_name="bucket",
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        help_text="'global', 'pot:<pot ID>' or 'recipient:<account ID>'.",
+                        max_length=128,
+                        verbose_name="scope",
+                    ),
+                ),
+                (
+                    "donations_count",
+                    models.PositiveIntegerField(
+                        help_text="Number of donations.",
+                        verbose_name="donations count",
+                    ),
+                ),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=0,
+                        help_text="Sum of the donations' total amounts (in the token's smallest unit).",
+                        max_digits=50,
+                        verbose_name="total amount",
+                    ),
+                ),
+                (
+                    "total_amount_usd",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Sum of the donations' total amounts in USD (priced donations only).",
+                        max_digits=20,
+                        verbose_name="total amount in USD",
+                    ),
+                ),
+                (
+                    "unique_donors",
+                    models.PositiveIntegerField(
+                        help_text="Number of distinct donors.",
+                        verbose_name="unique donors",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        help_text="When the rollup was last recomputed.",
+                        verbose_name="updated at",
+                    ),
+                ),
+                (
+                    "token",
+                    models.ForeignKey(
+                        help_text="Donation token.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="donation_rollups",
+                        to="tokens.token",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["granularity", "scope", "bucket"],
+                        name="donation_rollup_range_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("granularity", "scope", "token", "bucket"),
+                        name="unique_donation_rollup",
+                    )
+                ],
+            },
+        ),
+    ]
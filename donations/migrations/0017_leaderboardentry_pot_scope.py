@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:40
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+
+def prefix_pot_scopes(apps, schema_editor):
+    LeaderboardEntry = apps.get_model("donations", "LeaderboardEntry")
+    LeaderboardEntry.objects.exclude(scope="global").update(
+        scope=Concat(Value("pot:"), "scope")
+    )
+
+
+def unprefix_pot_scopes(apps, schema_editor):
+    LeaderboardEntry = apps.get_model("donations", "LeaderboardEntry")
+    for entry in LeaderboardEntry.objects.filter(scope__startswith="pot:"):
+        entry.scope = entry.scope.removeprefix("pot:")
+        entry.save(update_fields=["scope"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("donations", "0016_donationrollup"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="leaderboardentry",
+            name="scope",
+            field=models.CharField(
+                help_text="'global' or 'pot:<pot ID>'.",
+                max_length=128,
+                verbose_name="scope",
+            ),
+        ),
+        migrations.RunPython(prefix_pot_scopes, unprefix_pot_scopes),
+    ]
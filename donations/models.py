@@ -3,13 +3,13 @@ from datetime import timedelta
 from decimal import Decimal
 
 import requests
-from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.db import models
 from django.forms.models import model_to_dict
 from django.utils.translation import gettext_lazy as _
 
 from accounts.models import Account
+from base.fields import NumericAmountField
 from base.logging import logger
 from base.utils import format_date
 from pots.models import Pot
@@ -41,6 +41,12 @@ class Donation(models.Model):
         null=False,
         help_text=_("Total amount."),
     )
+    total_amount_numeric = NumericAmountField(
+        _("total amount (numeric)"),
+        source="total_amount",
+        help_text=_("Total amount as a number, for SQL aggregation and sorting."),
+        db_index=True,
+    )
     # TODO: consider adding formatted total_amount (would need to fetch decimals for FTs)
     total_amount_usd = models.DecimalField(
         _("total amount in USD"),
@@ -57,6 +63,12 @@ class Donation(models.Model):
         null=False,
         help_text=_("Net amount."),
     )
+    net_amount_numeric = NumericAmountField(
+        _("net amount (numeric)"),
+        source="net_amount",
+        help_text=_("Net amount as a number, for SQL aggregation and sorting."),
+        db_index=True,
+    )
     net_amount_usd = models.DecimalField(
         _("net amount in USD"),
         max_digits=20,
@@ -123,6 +135,11 @@ class Donation(models.Model):
         null=False,
         help_text=_("Protocol fee."),
     )
+    protocol_fee_numeric = NumericAmountField(
+        _("protocol fee (numeric)"),
+        source="protocol_fee",
+        help_text=_("Protocol fee as a number, for SQL aggregation and sorting."),
+    )
     protocol_fee_usd = models.DecimalField(
         _("protocol fee in USD"),
         max_digits=20,
@@ -146,6 +163,11 @@ class Donation(models.Model):
         blank=True,
         help_text=_("Referrer fee."),
     )
+    referrer_fee_numeric = NumericAmountField(
+        _("referrer fee (numeric)"),
+        source="referrer_fee",
+        help_text=_("Referrer fee as a number, for SQL aggregation and sorting."),
+    )
     referrer_fee_usd = models.DecimalField(
         _("referrer fee in USD"),
         max_digits=20,
@@ -169,6 +191,11 @@ class Donation(models.Model):
         blank=True,
         help_text=_("Chef fee."),
     )
+    chef_fee_numeric = NumericAmountField(
+        _("chef fee (numeric)"),
+        source="chef_fee",
+        help_text=_("Chef fee as a number, for SQL aggregation and sorting."),
+    )
     chef_fee_usd = models.DecimalField(
         _("chef fee in USD"),
         max_digits=20,
@@ -202,10 +229,6 @@ class Donation(models.Model):
     def to_dict(self):
         return model_to_dict(self)
 
-    async def fetch_usd_prices_async(self):
-        fetch_prices = sync_to_async(self.fetch_usd_prices)
-        await fetch_prices()
-
     ### Fetches USD prices for the Donation record and saves USD totals
     def fetch_usd_prices(self):
         # TODO: remove duplicate logic with PotPayout.fetch_usd_prices
@@ -241,9 +264,176 @@ class Donation(models.Model):
                 None if not referrer_amount else referrer_amount * price_usd
             )
             self.chef_fee_usd = None if not chef_amount else chef_amount * price_usd
-            self.save()
+            self.save(
+                update_fields=[
+                    "total_amount_usd",
+                    "net_amount_usd",
+                    "protocol_fee_usd",
+                    "referrer_fee_usd",
+                    "chef_fee_usd",
+                ]
+            )
             logger.info(f"Saved USD prices for donation: {self.on_chain_id}")
         except Exception as e:
             logger.error(f"Failed to calculate and save USD prices: {e}")
         # chef_amount = token.format_price(self.chef_fee or "0")
         # TODO: update totals for relevant accounts
+
+
+# scope of the leaderboards and rollups that cover all donations
+GLOBAL_SCOPE = "global"
+
+
+def make_scope(kind, entity_id):
+    """Scope of the leaderboards and rollups covering one pot's ("pot") or recipient's ("recipient") donations."""
+    return f"{kind}:{entity_id}"
+
+
+class LeaderboardType(models.TextChoices):
+    DONORS = "donors", "Donors"
+    RECIPIENTS = "recipients", "Recipients"
+    REFERRERS = "referrers", "Referrers"
+
+
+class LeaderboardWindow(models.TextChoices):
+    ALL_TIME = "all", "All time"
+    LAST_7_DAYS = "7d", "Last 7 days"
+    LAST_30_DAYS = "30d", "Last 30 days"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    An account's rolled-up USD total on a leaderboard, per scope (platform-wide or a pot) and window.
+    Maintained by donations/leaderboards.py.
+    """
+
+    board = models.CharField(
+        _("board"),
+        max_length=16,
+        choices=LeaderboardType.choices,
+        help_text=_("Leaderboard (donors, recipients or referrers)."),
+    )
+    scope = models.CharField(
+        _("scope"),
+        max_length=128,
+        help_text=_("'global' or 'pot:<pot ID>'."),
+    )
+    window = models.CharField(
+        _("window"),
+        max_length=8,
+        choices=LeaderboardWindow.choices,
+        help_text=_("Time window the totals cover."),
+    )
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries",
+        help_text=_("Account ranked."),
+    )
+    total_usd = models.DecimalField(
+        _("total USD"),
+        max_digits=20,
+        decimal_places=2,
+        help_text=_(
+            "Donated, received, or earned in referral fees (for referrers) in USD."
+        ),
+    )
+    donations_count = models.PositiveIntegerField(
+        _("donations count"),
+        help_text=_("Number of donations counted in the total."),
+    )
+    updated_at = models.DateTimeField(
+        _("updated at"),
+        help_text=_("When the entry was last recomputed."),
+    )
+
+    class Meta:
+        verbose_name_plural = "Leaderboard entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["board", "scope", "window", "account"],
+                name="unique_leaderboard_entry",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["board", "scope", "window", "-total_usd", "account"],
+                name="leaderboard_ranking_idx",
+            ),
+        ]
+
+
+class DonationRollupGranularity(models.TextChoices):
+    HOUR = "hour", "Hour"
+    DAY = "day", "Day"
+
+
+class DonationRollup(models.Model):
+    """
+    Donation totals per time bucket, scope (all donations, a pot's or a recipient's) and token.
+    Maintained by donations/rollups.py.
+    """
+
+    granularity = models.CharField(
+        _("granularity"),
+        max_length=8,
+        choices=DonationRollupGranularity.choices,
+        help_text=_("Bucket size."),
+    )
+    bucket = models.DateTimeField(
+        _("bucket"),
+        help_text=_("Start of the bucket (UTC)."),
+    )
+    scope = models.CharField(
+        _("scope"),
+        max_length=128,
+        help_text=_("'global', 'pot:<pot ID>' or 'recipient:<account ID>'."),
+    )
+    token = models.ForeignKey(
+        Token,
+        on_delete=models.CASCADE,
+        related_name="donation_rollups",
+        help_text=_("Donation token."),
+    )
+    donations_count = models.PositiveIntegerField(
+        _("donations count"),
+        help_text=_("Number of donations."),
+    )
+    total_amount = models.DecimalField(
+        _("total amount"),
+        max_digits=50,
+        decimal_places=0,
+        help_text=_(
+            "Sum of the donations' total amounts (in the token's smallest unit)."
+        ),
+    )
+    total_amount_usd = models.DecimalField(
+        _("total amount in USD"),
+        max_digits=20,
+        decimal_places=2,
+        help_text=_(
+            "Sum of the donations' total amounts in USD (priced donations only)."
+        ),
+    )
+    unique_donors = models.PositiveIntegerField(
+        _("unique donors"),
+        help_text=_("Number of distinct donors."),
+    )
+    updated_at = models.DateTimeField(
+        _("updated at"),
+        help_text=_("When the rollup was last recomputed."),
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["granularity", "scope", "token", "bucket"],
+                name="unique_donation_rollup",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["granularity", "scope", "bucket"],
+                name="donation_rollup_range_idx",
+            ),
+        ]
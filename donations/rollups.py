@@ -0,0 +1,162 @@
+from collections import defaultdict
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import (
+    GLOBAL_SCOPE,
+    Donation,
+    DonationRollup,
+    DonationRollupGranularity,
+    make_scope,
+)
+from .utils import save_recomputed_totals
+
+BUCKET_SIZES = {
+    DonationRollupGranularity.HOUR: timedelta(hours=1),
+    DonationRollupGranularity.DAY: timedelta(days=1),
+}
+BUCKET_TRUNCS = {
+    DonationRollupGranularity.HOUR: TruncHour,
+    DonationRollupGranularity.DAY: TruncDay,
+}
+# scope prefix -> donation field the scope is keyed by
+SCOPE_FIELDS = {"pot": "pot_id", "recipient": "recipient_id"}
+UNIQUE_FIELDS = ["granularity", "scope", "token", "bucket"]
+UPDATE_FIELDS = [
+    "donations_count",
+    "total_amount",
+    "total_amount_usd",
+    "unique_donors",
+    "updated_at",
+]
+
+
+def bucket_start(value, granularity):
+    value = value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if granularity == DonationRollupGranularity.DAY:
+        value = value.replace(hour=0)
+    return value
+
+
+def _totals():
+    return {
+        "donations_count": Count("id"),
+        "total_amount": Sum("total_amount_numeric"),
+        "total_amount_usd": Sum("total_amount_usd"),
+        "unique_donors": Count("donor", distinct=True),
+    }
+
+
+def _rollup(granularity, bucket, scope, row, now):
+    return DonationRollup(
+        granularity=granularity,
+        bucket=bucket,
+        scope=scope,
+        token_id=row["token_id"],
+        donations_count=row["donations_count"],
+        total_amount=row["total_amount"] or 0,
+        total_amount_usd=row["total_amount_usd"] or 0,
+        unique_donors=row["unique_donors"],
+        updated_at=now,
+    )
+
+
+def _save_rollups(rollups):
+    save_recomputed_totals(DonationRollup, rollups, UNIQUE_FIELDS, UPDATE_FIELDS)
+
+
+def update_donation_rollups(donations):
+    """
+    Recomputes the hourly and daily rollups (platform-wide and for the donations' pots and recipients) of
+    the buckets `donations` fall in, e.g. once they are indexed or priced.
+    """
+    # (granularity, bucket) -> scope kind -> ids of the affected pots / recipients
+    affected = defaultdict(lambda: defaultdict(set))
+    for donation in donations:
+        for granularity in DonationRollupGranularity:
+            scopes = affected[
+                (granularity, bucket_start(donation.donated_at, granularity))
+            ]
+            for kind, field in SCOPE_FIELDS.items():
+                if getattr(donation, field) is not None:
+                    scopes[kind].add(getattr(donation, field))
+
+    now = timezone.now()
+    for (granularity, bucket), scopes in affected.items():
+        bucket_donations = Donation.objects.filter(
+            donated_at__gte=bucket, donated_at__lt=bucket + BUCKET_SIZES[granularity]
+        )
+        rollups = [
+            _rollup(granularity, bucket, GLOBAL_SCOPE, row, now)
+            for row in bucket_donations.values("token_id")
+            .annotate(**_totals())
+            .order_by()
+        ]
+        for kind, ids in scopes.items():
+            field = SCOPE_FIELDS[kind]
+            rows = (
+                bucket_donations.filter(**{f"{field}__in": ids})
+                .values(field, "token_id")
+                .annotate(**_totals())
+                .order_by()
+            )
+            rollups.extend(
+                _rollup(granularity, bucket, make_scope(kind, row[field]), row, now)
+                for row in rows
+            )
+        scope_keys = [GLOBAL_SCOPE] + [
+            make_scope(kind, entity_id)
+            for kind, ids in scopes.items()
+            for entity_id in ids
+        ]
+        with transaction.atomic():
+            _save_rollups(rollups)
+            # tokens that no longer have donations in the bucket (e.g. a re-indexed donation)
+            DonationRollup.objects.filter(
+                granularity=granularity,
+                bucket=bucket,
+                scope__in=scope_keys,
+                updated_at__lt=now,
+            ).delete()
+
+
+def rebuild_donation_rollups():
+    """Recomputes every rollup from the donations table (to backfill them)."""
+    now = timezone.now()
+    for granularity, trunc in BUCKET_TRUNCS.items():
+        donations = Donation.objects.annotate(
+            rollup_bucket=trunc("donated_at", tzinfo=dt_timezone.utc)
+        )
+        rollups = [
+            _rollup(granularity, row["rollup_bucket"], GLOBAL_SCOPE, row, now)
+            for row in donations.values("rollup_bucket", "token_id")
+            .annotate(**_totals())
+            .order_by()
+        ]
+        for kind, field in SCOPE_FIELDS.items():
+            rows = (
+                donations.filter(**{f"{field}__isnull": False})
+                .values("rollup_bucket", field, "token_id")
+                .annotate(**_totals())
+                .order_by()
+            )
+            rollups.extend(
+                _rollup(
+                    granularity,
+                    row["rollup_bucket"],
+                    make_scope(kind, row[field]),
+                    row,
+                    now,
+                )
+                for row in rows
+            )
+        with transaction.atomic():
+            _save_rollups(rollups)
+            DonationRollup.objects.filter(
+                granularity=granularity, updated_at__lt=now
+            ).delete()
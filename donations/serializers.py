@@ -5,14 +5,19 @@ from rest_framework.serializers import (
     SerializerMethodField,
 )
 
-from accounts.serializers import SIMPLE_ACCOUNT_EXAMPLE, AccountSerializer
+from accounts.serializers import (
+    ACCOUNT_REFERENCE_EXAMPLE,
+    AccountReferenceSerializer,
+    AccountSerializer,
+)
+from base.serializers import SparseFieldsetsMixin
 from pots.serializers import EXAMPLE_POT_ID, SIMPLE_POT_EXAMPLE, PotSerializer
 from tokens.serializers import SIMPLE_TOKEN_EXAMPLE, TokenSerializer
 
-from .models import Donation
+from .models import Donation, DonationRollup, LeaderboardEntry
 
 
-class DonationSerializer(ModelSerializer):
+class DonationSerializer(SparseFieldsetsMixin, ModelSerializer):
 
     class Meta:
         model = Donation
@@ -40,13 +45,19 @@ class DonationSerializer(ModelSerializer):
             "referrer",
             "chef",
         ]
+        expandable_fields = {
+            "donor": AccountSerializer,
+            "recipient": AccountSerializer,
+            "referrer": AccountSerializer,
+            "chef": AccountSerializer,
+        }
 
-    donor = AccountSerializer()
+    donor = AccountReferenceSerializer()
     token = TokenSerializer()
     pot = PotSerializer()
-    recipient = AccountSerializer()
-    referrer = AccountSerializer()
-    chef = AccountSerializer()
+    recipient = AccountReferenceSerializer()
+    referrer = AccountReferenceSerializer()
+    chef = AccountReferenceSerializer()
 
 
 SIMPLE_DONATION_EXAMPLE = {
@@ -66,12 +77,12 @@ SIMPLE_DONATION_EXAMPLE = {
     "chef_fee": "10000000000000000000000",
     "chef_fee_usd": "0.27",
     "tx_hash": "EVMQsXorrrxPLHfK9UnbzFUy1SVYWvc8hwSGQZs4RbTk",
-    "donor": SIMPLE_ACCOUNT_EXAMPLE,
+    "donor": ACCOUNT_REFERENCE_EXAMPLE,
     "token": SIMPLE_TOKEN_EXAMPLE,
     "pot": SIMPLE_POT_EXAMPLE,
-    "recipient": SIMPLE_ACCOUNT_EXAMPLE,
-    "referrer": SIMPLE_ACCOUNT_EXAMPLE,
-    "chef": SIMPLE_ACCOUNT_EXAMPLE,
+    "recipient": ACCOUNT_REFERENCE_EXAMPLE,
+    "referrer": ACCOUNT_REFERENCE_EXAMPLE,
+    "chef": ACCOUNT_REFERENCE_EXAMPLE,
 }
 
 PAGINATED_DONATION_EXAMPLE = {
@@ -94,3 +105,84 @@ class DonationContractConfigSerializer(Serializer):
     protocol_fee_basis_points = serializers.IntegerField()
     referral_fee_basis_points = serializers.IntegerField()
     protocol_fee_recipient_account = serializers.CharField()
+
+
+class LeaderboardEntrySerializer(SparseFieldsetsMixin, ModelSerializer):
+    class Meta:
+        model = LeaderboardEntry
+        fields = [
+            "rank",
+            "account",
+            "total_usd",
+            "donations_count",
+        ]
+        expandable_fields = {
+            "account": AccountSerializer,
+        }
+
+    rank = serializers.IntegerField(read_only=True)
+    account = AccountReferenceSerializer()
+    total_usd = serializers.DecimalField(
+        max_digits=20, decimal_places=2, coerce_to_string=False
+    )
+
+
+SIMPLE_LEADERBOARD_ENTRY_EXAMPLE = {
+    "rank": 1,
+    "account": ACCOUNT_REFERENCE_EXAMPLE,
+    "total_usd": 1234.56,
+    "donations_count": 12,
+}
+
+PAGINATED_LEADERBOARD_EXAMPLE = {
+    "count": 1,
+    "next": None,
+    "previous": None,
+    "results": [SIMPLE_LEADERBOARD_ENTRY_EXAMPLE],
+}
+
+
+class PaginatedLeaderboardResponseSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    next = serializers.CharField(allow_null=True)
+    previous = serializers.CharField(allow_null=True)
+    results = LeaderboardEntrySerializer(many=True)
+
+
+class DonationRollupSerializer(ModelSerializer):
+    class Meta:
+        model = DonationRollup
+        fields = [
+            "bucket",
+            "token",
+            "donations_count",
+            "total_amount",
+            "total_amount_usd",
+            "unique_donors",
+        ]
+
+    token = serializers.CharField(source="token_id")
+
+
+DONATION_HISTOGRAM_EXAMPLE = {
+    "granularity": "day",
+    "start": "2024-05-01T00:00:00Z",
+    "end": "2024-05-31T00:00:00Z",
+    "results": [
+        {
+            "bucket": "2024-05-02T00:00:00Z",
+            "token": "near",
+            "donations_count": 14,
+            "total_amount": "23500000000000000000000000",
+            "total_amount_usd": "162.15",
+            "unique_donors": 9,
+        },
+    ],
+}
+
+
+class DonationHistogramResponseSerializer(Serializer):
+    granularity = serializers.CharField()
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    results = DonationRollupSerializer(many=True)
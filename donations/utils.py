@@ -0,0 +1,75 @@
+from django.db.models import F
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+
+from base.fields import to_numeric_amount
+
+# donations not yet given a numeric amount sort last either way
+DONATION_ORDERING_FIELDS = {
+    "amount": F("total_amount_numeric").asc(nulls_last=True),
+    "-amount": F("total_amount_numeric").desc(nulls_last=True),
+    "donated_at": "donated_at",
+    "-donated_at": "-donated_at",
+}
+
+donation_filter_parameters = [
+    OpenApiParameter(
+        "ordering",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        enum=list(DONATION_ORDERING_FIELDS),
+        description="Order donations by total amount or donation date (prefix with '-' for descending)",
+    ),
+    OpenApiParameter(
+        "min_amount",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description="Only include donations with a total amount (in the token's smallest unit) of at least this value",
+    ),
+    OpenApiParameter(
+        "max_amount",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description="Only include donations with a total amount (in the token's smallest unit) of at most this value",
+    ),
+]
+
+
+def save_recomputed_totals(model, objs, unique_fields, update_fields):
+    """
+    Upserts leaderboard or rollup rows whose totals were recomputed from the donations table. Their totals
+    are always recomputed rather than added to, so re-indexed or re-priced donations are never counted
+    twice (and distinct counts stay exact).
+    """
+    model.objects.bulk_create(
+        objs,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+
+
+def filter_donations(donations, query_params):
+    """
+    Applies the `ordering`, `min_amount` and `max_amount` query params to a Donation queryset.
+    Raises ValueError if any of them is invalid.
+    """
+    for param, lookup in (
+        ("min_amount", "total_amount_numeric__gte"),
+        ("max_amount", "total_amount_numeric__lte"),
+    ):
+        value = query_params.get(param)
+        if value is None:
+            continue
+        amount = to_numeric_amount(value)
+        if amount is None:
+            raise ValueError(f"Invalid {param} value: {value}")
+        donations = donations.filter(**{lookup: amount})
+
+    ordering = query_params.get("ordering")
+    if ordering:
+        if ordering not in DONATION_ORDERING_FIELDS:
+            raise ValueError(f"Invalid ordering value: {ordering}")
+        donations = donations.order_by(DONATION_ORDERING_FIELDS[ordering], "-id")
+    return donations
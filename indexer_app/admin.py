@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import BlockHeight
+from .models import BlockHeight, FailedEvent
 
 
 @admin.register(BlockHeight)
@@ -16,3 +16,28 @@ class BlockHeightAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(FailedEvent)
+class FailedEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "kind",
+        "name",
+        "receiver_id",
+        "receipt_id",
+        "block_height",
+        "status",
+        "attempts",
+        "next_retry_at",
+        "created_at",
+    )
+    list_filter = ("status", "kind", "name")
+    search_fields = ("receipt_id", "receiver_id", "signer_id")
+    ordering = ("-created_at",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
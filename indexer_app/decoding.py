@@ -0,0 +1,47 @@
+import base64
+import json
+
+from django.conf import settings
+
+from .logging import logger
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+
+def _resolve_backend(name: str):
+    """Returns (loads, decode_errors) for the configured JSON backend, falling back to stdlib json."""
+    if name in ("auto", "orjson") and orjson is not None:
+        return orjson.loads, (orjson.JSONDecodeError,)
+    if name in ("auto", "msgspec") and msgspec is not None:
+        return msgspec.json.decode, (msgspec.DecodeError,)
+    if name not in ("auto", "json"):
+        logger.warning(f"JSON backend '{name}' is not installed; using stdlib json")
+    return json.loads, (json.JSONDecodeError, UnicodeDecodeError)
+
+
+json_loads, JSON_DECODE_ERRORS = _resolve_backend(settings.INDEXER_JSON_BACKEND)
+
+
+def decode_base64_json(value, default=None):
+    """
+    Decodes a base64-encoded JSON value (FunctionCall args or SuccessValue) with the configured backend.
+    Returns `default` if the value is empty or cannot be decoded.
+    """
+    if not value:
+        return default
+    decoded_bytes = base64.b64decode(value)
+    try:
+        return json_loads(decoded_bytes)
+    except JSON_DECODE_ERRORS:
+        logger.warning(
+            f"Cannot decode base64 value to JSON ({len(decoded_bytes)} bytes)"
+        )
+        return default
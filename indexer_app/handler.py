@@ -1,19 +1,28 @@
 import asyncio
-import base64
-import json
 import time
 from datetime import datetime
+from types import SimpleNamespace
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
 from near_lake_framework import near_primitives
 
+from base.db import amark_recent_writes
+from base.rpc import ainvalidate_contract_view
 from base.utils import convert_ns_to_utc
 from nadabot.utils import match_nadabot_registry_pattern
 from pots.utils import match_pot_factory_pattern, match_pot_subaccount_pattern
 
-from .logging import log_memory_usage, logger
+from .decoding import JSON_DECODE_ERRORS, decode_base64_json, json_loads
+from .logging import log_memory_usage, log_payload, logger
+from .models import FailedEvent, FailedEventKind, ProcessedReceipt
 from .utils import (
+    BlockUpdates,
+    IndexerEvent,
+    aupdate_donation_rollups,
+    current_block_updates,
+    current_event,
     handle_add_nadabot_admin,  # handle_batch_donations,
     handle_add_stamp,
     handle_default_list_status_change,
@@ -40,10 +49,97 @@ from .utils import (
     handle_social_profile_update,
     handle_transfer_payout,
     handle_update_default_human_threshold,
+    record_failed_event,
 )
 
+LISTS_CONTRACT = "lists." + settings.POTLOCK_TLA
+DONATE_CONTRACT = "donate." + settings.POTLOCK_TLA
 
-async def handle_streamer_message(streamer_message: near_primitives.StreamerMessage):
+# Method calls that are dispatched below; args for any other method are never decoded
+HANDLED_METHODS = frozenset(
+    {
+        "set",
+        "new",
+        "assert_can_apply_callback",
+        "apply",
+        "donate",
+        "handle_protocol_fee_callback",
+        "sybil_callback",
+        "transfer_funds_callback",
+        "register_batch",
+        "chef_set_application_status",
+        "admin_set_default_project_status",
+        "update_registration",
+        "chef_set_payouts",
+        "challenge_payouts",
+        "admin_update_payouts_challenge",
+        "transfer_payout_callback",
+        "owner_remove_admins",
+        "create_list",
+        "upvote",
+        "owner_add_admins",
+        "admin_set_require_whitelist",
+        "admin_add_whitelisted_deployers",
+        "admin_set_protocol_config",
+        "admin_set_protocol_fee_recipient_account",
+        "admin_set_protocol_fee_basis_points",
+        "owner_set_admins",
+        "owner_clear_admins",
+    }
+)
+
+# EVENT_JSON logs that are dispatched below; other events are never parsed
+HANDLED_EVENTS = (
+    "update_pot_config",
+    "add_or_update_provider",
+    "add_stamp",
+    "update_default_human_threshold",
+    "add_or_update_group",
+    "blacklist_account",
+    "unblacklist_account",
+)
+
+
+def is_handled_event_log(log: str) -> bool:
+    """Cheap pre-check so that only logs carrying a handled event name are JSON-decoded."""
+    return log.startswith("EVENT_JSON:") and any(
+        event_name in log for event_name in HANDLED_EVENTS
+    )
+
+
+def is_indexed_receiver(receiver_id: str) -> bool:
+    """Whether receipts executed on `receiver_id` can contain anything we index."""
+    return receiver_id == settings.NEAR_SOCIAL_CONTRACT_ADDRESS or receiver_id.endswith(
+        (settings.POTLOCK_TLA, settings.NADABOT_TLA)
+    )
+
+
+async def get_processed_receipt_ids(
+    streamer_message: near_primitives.StreamerMessage,
+) -> set:
+    """
+    Returns the IDs of receipts in this block whose handlers have already been applied,
+    using a single ledger lookup for all candidate receipts in the block.
+    """
+    receipt_ids = [
+        outcome.receipt.receipt_id
+        for shard in streamer_message.shards
+        for outcome in shard.receipt_execution_outcomes
+        if is_indexed_receiver(outcome.receipt.receiver_id)
+    ]
+    if not receipt_ids:
+        return set()
+    return {
+        receipt_id
+        async for receipt_id in ProcessedReceipt.objects.filter(
+            receipt_id__in=receipt_ids
+        ).values_list("receipt_id", flat=True)
+    }
+
+
+async def handle_streamer_message(
+    streamer_message: near_primitives.StreamerMessage, skip_processed: bool = True
+):
     start_time = time.time()
     log_memory_usage("Start of handle_streamer_message")
 
@@ -67,6 +163,18 @@ async def handle_streamer_message(streamer_message: near_primitives.StreamerMess
     #     with open("indexer_outcome2.json", "w") as file:
     #         file.write(f"{streamer_message}")
 
+    # receipts already applied (e.g. when re-indexing a range) are skipped unless reprocessing is forced
+    processed_receipt_ids = (
+        await get_processed_receipt_ids(streamer_message)
+        if skip_processed and settings.INDEXER_SKIP_PROCESSED_RECEIPTS
+        else set()
+    )
+    newly_processed_receipts = []
+    touched_entity_ids = set()
+    # handlers queue follow-up work here, which is done once the whole block is dispatched
+    block_updates = BlockUpdates()
+    block_updates_token = current_block_updates.set(block_updates)
+
     for shard_index, shard in enumerate(streamer_message.shards):
         shard_start_time = time.time()
         for outcome_index, receipt_execution_outcome in enumerate(
@@ -81,62 +189,63 @@ async def handle_streamer_message(streamer_message: near_primitives.StreamerMess
             ):
                 continue
             receiver_id = receipt_execution_outcome.receipt.receiver_id
-            if (
-                receiver_id != settings.NEAR_SOCIAL_CONTRACT_ADDRESS
-                and not receiver_id.endswith(
-                    (settings.POTLOCK_TLA, settings.NADABOT_TLA)
-                )
-            ):
+            if not is_indexed_receiver(receiver_id):
                 continue
-            # 1. HANDLE LOGS
-            log_data = []
             receipt = receipt_execution_outcome.receipt
+            if receipt.receipt_id in processed_receipt_ids:
+                logger.info(f"Skipping already processed receipt {receipt.receipt_id}")
+                continue
+            # 1. HANDLE LOGS
             signer_id = receipt.receipt["Action"]["signer_id"]
+            dispatched = False
 
             log_processing_start = time.time()
             for log_index, log in enumerate(
                 receipt_execution_outcome.execution_outcome.outcome.logs, start=1
             ):
-                if not log.startswith("EVENT_JSON:"):
+                if not is_handled_event_log(log):
                     continue
                 try:
-                    parsed_log = json.loads(log[len("EVENT_JSON:") :])
-                    event_name = parsed_log.get("event")
-                    print("parsa parsa...", parsed_log)
-                    if event_name == "update_pot_config":
-                        await handle_pot_config_update(
-                            parsed_log.get("data")[0], receiver_id
-                        )
-
-                    if event_name == "add_or_update_provider":
-                        await handle_new_provider(
-                            parsed_log.get("data")[0], receiver_id, signer_id
-                        )
-                    elif event_name == "add_stamp":
-                        await handle_add_stamp(
-                            parsed_log.get("data")[0], receiver_id, signer_id
-                        )
-                    elif event_name == "update_default_human_threshold":
-                        await handle_update_default_human_threshold(
-                            parsed_log.get("data")[0], receiver_id
-                        )
-                    if event_name == "add_or_update_group":
-                        await handle_new_group(parsed_log.get("data")[0], now_datetime)
-                    if event_name == "blacklist_account":
-                        await handle_registry_blacklist_action(
-                            parsed_log.get("data")[0], receiver_id, now_datetime
-                        )
-                    if event_name == "unblacklist_account":
-                        await handle_registry_unblacklist_action(
-                            parsed_log.get("data")[0], receiver_id, now_datetime
-                        )
-                except json.JSONDecodeError:
+                    parsed_log = json_loads(log[len("EVENT_JSON:") :])
+                except JSON_DECODE_ERRORS:
                     logger.warning(
                         f"Receipt ID: `{receipt_execution_outcome.receipt.receipt_id}`\nError during parsing logs from JSON string to dict"
                     )
                     continue
-
-                log_data.append(parsed_log.get("data")[0])
+                if not isinstance(parsed_log, dict):
+                    continue
+                event_name = parsed_log.get("event")
+                if event_name not in HANDLED_EVENTS:
+                    continue
+                log_payload("event log: %s", parsed_log)
+                log_data = parsed_log.get("data")
+                if not isinstance(log_data, list) or not log_data:
+                    logger.warning(
+                        f"Receipt ID: `{receipt.receipt_id}`\nSkipping {event_name} log without data"
+                    )
+                    continue
+                event_data = log_data[0]
+                event = IndexerEvent(
+                    kind=FailedEventKind.EVENT,
+                    name=event_name,
+                    args=event_data,
+                    receiver_id=receiver_id,
+                    signer_id=signer_id,
+                    predecessor_id=receipt.predecessor_id,
+                    receipt_id=receipt.receipt_id,
+                    block_height=block_height,
+                    block_timestamp=now_datetime,
+                )
+                dispatched = True
+                await dispatch(
+                    event,
+                    dispatch_event_log,
+                    event_name,
+                    event_data,
+                    receiver_id,
+                    signer_id,
+                    now_datetime,
+                )
 
                 # TODO: handle set_source_metadata logs for various contracts
 
@@ -157,8 +266,6 @@ async def handle_streamer_message(streamer_message: near_primitives.StreamerMess
             #     print("here we are...")
             #     continue
             method_call_processing_start = time.time()
-            LISTS_CONTRACT = "lists." + settings.POTLOCK_TLA
-            DONATE_CONTRACT = "donate." + settings.POTLOCK_TLA
 
             for index, action in enumerate(
                 receipt_execution_outcome.receipt.receipt["Action"]["actions"]
@@ -168,285 +275,56 @@ async def handle_streamer_message(streamer_message: near_primitives.StreamerMess
                 # receipt = receipt_execution_outcome.receipt
                 status_obj = receipt_execution_outcome.execution_outcome.outcome
 
-                try:
-                    function_call = action["FunctionCall"]
-                    method_name = function_call["method_name"]
-                    args = function_call["args"]
-                    decoded_bytes = base64.b64decode(args) if args else b"{}"
-                    # signer_id = receipt.receipt["Action"]["signer_id"]
-                    # receiver_id = receiver_id
-                    predecessor_id = receipt.predecessor_id
-                    result = status_obj.status.get("SuccessValue")
-                    # Assuming the decoded data is UTF-8 text
-                    try:
-                        decoded_text = decoded_bytes.decode("utf-8")
-                        args_dict = json.loads(decoded_text)
-                    except UnicodeDecodeError:
-                        # Handle case where the byte sequence cannot be decoded to UTF-8
-                        logger.warning(
-                            f"Cannot decode args to UTF-8 text: {decoded_bytes}"
-                        )
-                        args_dict = {}
-                    except json.JSONDecodeError:
-                        # Handle case where the text cannot be parsed as JSON
-                        logger.warning(
-                            f"Decoded text is not valid JSON: {decoded_text}"
-                        )
-                        args_dict = {}
-
-                    match method_name:
-                        case "set":  # handle near social profile data updates
-                            if receiver_id == settings.NEAR_SOCIAL_CONTRACT_ADDRESS:
-                                logger.info(f"setting profile data: {args_dict}")
-                                await handle_social_profile_update(
-                                    args_dict, receiver_id, signer_id
-                                )
-                        case "new":
-                            if match_pot_factory_pattern(receiver_id):
-                                logger.info(f"matched for factory pattern: {args_dict}")
-                                await handle_new_pot_factory(
-                                    args_dict, receiver_id, now_datetime
-                                )
-                            elif match_nadabot_registry_pattern(
-                                receiver_id
-                            ):  # matches registries in the pattern, version(v1).env(staging).nadabot.near
-                                await handle_new_nadabot_registry(
-                                    args_dict, receiver_id, now_datetime
-                                )
-                            elif match_pot_subaccount_pattern(receiver_id):
-                                logger.info(
-                                    f"new pot deployment: {args_dict}, {action}"
-                                )
-                                await handle_new_pot(
-                                    args_dict,
-                                    receiver_id,
-                                    signer_id,
-                                    predecessor_id,
-                                    receipt.receipt_id,
-                                    now_datetime,
-                                )
-                            break
-                        # TODO: update to use handle_apply method??
-                        case "assert_can_apply_callback":
-                            logger.info(
-                                f"application case: {args_dict}, {action}, {receipt}"
-                            )
-                            await handle_pot_application(
-                                args_dict,
-                                receiver_id,
-                                signer_id,
-                                receipt,
-                                status_obj,
-                                now_datetime,
-                            )
-                            break
-
-                        case "apply":
-                            logger.info(
-                                f"application case 2: {args_dict}, {action}, {receipt}"
-                            )
-                            await handle_pot_application(
-                                args_dict,
-                                receiver_id,
-                                signer_id,
-                                receipt,
-                                status_obj,
-                                now_datetime,
-                            )
-                            break
-
-                        ### Donation cases
-                        ## SCENARIOS:
-                        # 1. Pot donations
-                        # tl;dr: only handle method calls that have a result, aka the final call in the chain. This could be "donate", "handle_protocol_fee_callback", or "sybil_callback".
-                        # - handle_protocol_fee_callback (NOT called if protocol fee is bypassed)
-                        #    - check result (will ALWAYS return DonationExternal)
-                        # - sybil_callback (NOT called if there are no sybil requirements for the Pot)
-                        #    - check result (MAY return DonationExternal)
-                        #    - if result is not None, handle donation.
-                        # - donate
-                        #    - check result (will either return `DonationExternal`, if no CC calls, or `None` if CC calls were involved)
-                        #    - if result is not None, handle donation. Otherwise ignore & listen for either handle_protocol_fee_callback or sybil_callback
-                        #    - Example with result: https://nearblocks.io/txns/9beSPiZzR9Yu1951gC6AfQVCXiGPnBRxRFQsyfxUQr3H?tab=execution
-                        #    - Example with no result: https://nearblocks.io/txns/7p9m3D2Ao3TX9BXXCKTFbBk51F2iEuSCi8r5gSesdkZ2?tab=execution
-                        # 2. Direct donations
-                        # - donate
-                        #    - if result is not None, handle donation.
-                        # - transfer_funds_callback
-                        #    - check result (will always return DonationExternal IF it is a DonationTransfer)
-                        #    - if result is not None, handle donation
-                        #    - NB: this method was not implemented until early 2024; for older donations, use donate method
-                        case (
-                            "donate"
-                            | "handle_protocol_fee_callback"
-                            | "sybil_callback"
-                            | "transfer_funds_callback"
-                        ):
-                            donation_type = (
-                                "direct" if receiver_id == DONATE_CONTRACT else "pot"
-                            )
-                            logger.info(
-                                f"New {donation_type} donation ({method_name}) --- ARGS: {args_dict}, RECEIPT: {receipt}, STATUS: {status_obj}, OUTCOME: {receipt_execution_outcome}, LOGS: {log_data}"
-                            )
-                            if not result:
-                                logger.info("No result found. Skipping...")
-                                break
-                            decoded_success_val = base64.b64decode(result).decode(
-                                "utf-8"
-                            )
-                            logger.info(f"Decoded success value: {decoded_success_val}")
-                            if (
-                                decoded_success_val == "null"
-                            ):  # edge case that sometimes occurs where the response is a literal string "null", appears to be due to transfer_funds_callback returning None e.g. in the case of a ProtocolFeeCallback (see https://pikespeak.ai/transaction-viewer/78M3HCiBCeCu7jEk6KiVSJGr4utnV2aze8S5ZdEu16t8/detailed for example)
-                                logger.info("Result is null. Skipping...")
-                                break
-                            try:
-                                donation_data = json.loads(decoded_success_val)
-                            except json.JSONDecodeError:
-                                logger.error(
-                                    f"Error decoding result to JSON: {decoded_success_val}"
-                                )
-                                donation_data = {}
-                            await handle_new_donation(
-                                args_dict,
-                                receiver_id,
-                                signer_id,
-                                donation_type,
-                                receipt,
-                                donation_data,
-                            )
-                            break
-
-                        case (
-                            "register_batch"
-                        ):  # TODO: listen for create_registration event instead of method call
-                            logger.info(
-                                f"registrations incoming: {args_dict}, {action}"
-                            )
-                            if receiver_id != LISTS_CONTRACT:
-                                break
-                            await handle_new_list_registration(
-                                args_dict, receiver_id, signer_id, receipt, status_obj
-                            )
-                            break
-
-                        case "chef_set_application_status":
-                            logger.info(
-                                f"application status change incoming: {args_dict}"
-                            )
-                            await handle_pot_application_status_change(
-                                args_dict, receiver_id, signer_id, receipt, status_obj
-                            )
-                            break
-
-                        case "admin_set_default_project_status":
-                            logger.info(
-                                f"registry default status setting incoming: {args_dict}"
-                            )
-                            await handle_default_list_status_change(
-                                args_dict, receiver_id, status_obj
-                            )
-                            break
-
-                        case (
-                            "update_registration"
-                        ):  # TODO: listen for update_registration event instead of method call
-                            logger.info(
-                                f"project registration status update incoming: {args_dict}",
-                            )
-                            await handle_list_registration_update(
-                                args_dict, receiver_id, status_obj
-                            )
-                            break
-                        # TODO: handle delete_registration event
-                        case "chef_set_payouts":
-                            logger.info(f"setting payout....: {args_dict}")
-                            await handle_set_payouts(args_dict, receiver_id, receipt)
-                            break
-
-                        case "challenge_payouts":
-                            logger.info(f"challenge payout: {args_dict}")
-                            await handle_payout_challenge(
-                                args_dict,
-                                receiver_id,
-                                signer_id,
-                                receipt.receipt_id,
-                                now_datetime,
-                            )
-                            break
-
-                        case "admin_update_payouts_challenge":
-                            logger.info(f"challenge payout: {args_dict}")
-                            await handle_payout_challenge_response(
-                                args_dict,
-                                receiver_id,
-                                signer_id,
-                                receipt.receipt_id,
-                                now_datetime,
-                            )
-                            break
-
-                        case "transfer_payout_callback":
-                            logger.info(f"fulfilling payouts..... {args_dict}")
-                            await handle_transfer_payout(
-                                args_dict, receiver_id, receipt.receipt_id, now_datetime
-                            )
-                            break
-
-                        case (
-                            "owner_remove_admins"
-                        ):  # TODO: use update_admins event instead of method call to handle all cases
-                            logger.info(f"attempting to remove admins....: {args_dict}")
-                            if receiver_id != LISTS_CONTRACT:
-                                break
-                            await handle_list_admin_removal(
-                                args_dict, receiver_id, signer_id, receipt.receipt_id
-                            )
-                            break
-
-                        case "create_list":
-                            logger.info(f"creating list... {args_dict}, {action}")
-                            if receiver_id != LISTS_CONTRACT:
-                                break
-                            await handle_new_list(signer_id, receiver_id, status_obj)
-                            break
-
-                        case "upvote":
-                            logger.info(f"up voting... {args_dict}")
-                            if receiver_id != LISTS_CONTRACT:
-                                break
-                            await handle_list_upvote(
-                                args_dict, receiver_id, signer_id, receipt.receipt_id
-                            )
-                            break
-                        case "owner_add_admins":
-                            logger.info(f"adding admins.. {args_dict}")
-                            if not match_nadabot_registry_pattern(receiver_id):
-                                break
-                            await handle_add_nadabot_admin(args_dict, receiver_id)
-                            break
-                        case (
-                            "admin_set_require_whitelist"
-                            | "admin_add_whitelisted_deployers"
-                            | "admin_set_protocol_config"
-                            | "admin_set_protocol_fee_recipient_account"
-                            | "admin_set_protocol_fee_basis_points"
-                            | "owner_set_admins"
-                            | "owner_clear_admins"
-                            | "owner_add_admins"
-                            | "owner_remove_admins"
-                        ):
-                            if not match_pot_factory_pattern(receiver_id):
-                                break
-                            logger.info(f"updating configs.. {args_dict}")
-                            await handle_set_factory_configs(args_dict, receiver_id)
-                            break
-                        # TODO: handle remove upvote
-
-                except Exception as e:
-                    logger.error(f"Error in indexer handler:\n{e}")
-                    # with open("indexer_error.txt", "a") as file:
-                    #     file.write(f"{e}\n")
+                function_call = action["FunctionCall"]
+                method_name = function_call["method_name"]
+                # skip before decoding anything if the method isn't one we handle
+                if method_name not in HANDLED_METHODS:
+                    continue
+                if (
+                    method_name == "set"
+                    and receiver_id != settings.NEAR_SOCIAL_CONTRACT_ADDRESS
+                ):
+                    continue
+
+                args_dict = decode_base64_json(function_call["args"], default={})
+                event = IndexerEvent(
+                    kind=FailedEventKind.METHOD,
+                    name=method_name,
+                    args=args_dict,
+                    receiver_id=receiver_id,
+                    signer_id=signer_id,
+                    predecessor_id=receipt.predecessor_id,
+                    receipt_id=receipt.receipt_id,
+                    block_height=block_height,
+                    block_timestamp=now_datetime,
+                    result=status_obj.status.get("SuccessValue"),
+                )
+                dispatched = True
+                completed = await dispatch(
+                    event,
+                    dispatch_method_call,
+                    method_name,
+                    args_dict,
+                    receiver_id,
+                    signer_id,
+                    receipt.predecessor_id,
+                    receipt,
+                    status_obj,
+                    now_datetime,
+                )
+                if not completed:
+                    continue
+                # only social `set` calls are handled for every action in the receipt
+                if method_name != "set":
+                    break
+            # handler failures are dead-lettered and retried from there, so the receipt itself is done
+            if dispatched:
+                touched_entity_ids.update((receiver_id, signer_id))
+                newly_processed_receipts.append(
+                    ProcessedReceipt(
+                        receipt_id=receipt.receipt_id, block_height=block_height
+                    )
+                )
             # logger.info(
             #     f"Time to process method calls for receipt {receipt_execution_outcome.receipt.receipt_id}: {time.time() - method_call_processing_start:.4f} seconds"
             # )
@@ -456,7 +334,364 @@ async def handle_streamer_message(streamer_message: near_primitives.StreamerMess
         # )
         # log_memory_usage(f"After processing shard {shard_index}")
 
+    current_block_updates.reset(block_updates_token)
+    await apply_block_updates(block_updates)
+
+    if newly_processed_receipts:
+        await ProcessedReceipt.objects.abulk_create(
+            newly_processed_receipts, ignore_conflicts=True
+        )
+    if touched_entity_ids:
+        # API reads of these go to the primary until the replica has caught up
+        await amark_recent_writes(touched_entity_ids)
+
     # logger.info(
     #     f"Total time to process streamer message: {time.time() - start_time:.4f} seconds"
     # )
     # log_memory_usage("End of handle_streamer_message")
+
+
+async def dispatch_event_log(
+    event_name: str,
+    data: dict,
+    receiver_id: str,
+    signer_id: str,
+    now_datetime: datetime,
+):
+    if event_name == "update_pot_config":
+        await handle_pot_config_update(data, receiver_id)
+
+    if event_name == "add_or_update_provider":
+        await handle_new_provider(data, receiver_id, signer_id)
+    elif event_name == "add_stamp":
+        await handle_add_stamp(data, receiver_id, signer_id)
+    elif event_name == "update_default_human_threshold":
+        await handle_update_default_human_threshold(data, receiver_id)
+    if event_name == "add_or_update_group":
+        await handle_new_group(data, now_datetime)
+    if event_name == "blacklist_account":
+        await handle_registry_blacklist_action(data, receiver_id, now_datetime)
+    if event_name == "unblacklist_account":
+        await handle_registry_unblacklist_action(data, receiver_id, now_datetime)
+
+
+async def dispatch_method_call(
+    method_name: str,
+    args_dict: dict,
+    receiver_id: str,
+    signer_id: str,
+    predecessor_id: str,
+    receipt,
+    status_obj,
+    now_datetime: datetime,
+):
+    result = status_obj.status.get("SuccessValue")
+    match method_name:
+        case "set":  # handle near social profile data updates
+            if receiver_id == settings.NEAR_SOCIAL_CONTRACT_ADDRESS:
+                log_payload("setting profile data: %s", args_dict)
+                await handle_social_profile_update(args_dict, receiver_id, signer_id)
+        case "new":
+            if match_pot_factory_pattern(receiver_id):
+                log_payload("matched for factory pattern: %s", args_dict)
+                await handle_new_pot_factory(args_dict, receiver_id, now_datetime)
+            elif match_nadabot_registry_pattern(
+                receiver_id
+            ):  # matches registries in the pattern, version(v1).env(staging).nadabot.near
+                await handle_new_nadabot_registry(args_dict, receiver_id, now_datetime)
+            elif match_pot_subaccount_pattern(receiver_id):
+                log_payload("new pot deployment: %s", args_dict)
+                await handle_new_pot(
+                    args_dict,
+                    receiver_id,
+                    signer_id,
+                    predecessor_id,
+                    receipt.receipt_id,
+                    now_datetime,
+                )
+            return
+        # TODO: update to use handle_apply method??
+        case "assert_can_apply_callback":
+            log_payload(
+                "application case: %s, %s",
+                args_dict,
+                receipt,
+            )
+            await handle_pot_application(
+                args_dict,
+                receiver_id,
+                signer_id,
+                receipt,
+                status_obj,
+                now_datetime,
+            )
+            return
+
+        case "apply":
+            log_payload(
+                "application case 2: %s, %s",
+                args_dict,
+                receipt,
+            )
+            await handle_pot_application(
+                args_dict,
+                receiver_id,
+                signer_id,
+                receipt,
+                status_obj,
+                now_datetime,
+            )
+            return
+
+        ### Donation cases
+        ## SCENARIOS:
+        # 1. Pot donations
+        # tl;dr: only handle method calls that have a result, aka the final call in the chain. This could be "donate", "handle_protocol_fee_callback", or "sybil_callback".
+        # - handle_protocol_fee_callback (NOT called if protocol fee is bypassed)
+        #    - check result (will ALWAYS return DonationExternal)
+        # - sybil_callback (NOT called if there are no sybil requirements for the Pot)
+        #    - check result (MAY return DonationExternal)
+        #    - if result is not None, handle donation.
+        # - donate
+        #    - check result (will either return `DonationExternal`, if no CC calls, or `None` if CC calls were involved)
+        #    - if result is not None, handle donation. Otherwise ignore & listen for either handle_protocol_fee_callback or sybil_callback
+        #    - Example with result: https://nearblocks.io/txns/9beSPiZzR9Yu1951gC6AfQVCXiGPnBRxRFQsyfxUQr3H?tab=execution
+        #    - Example with no result: https://nearblocks.io/txns/7p9m3D2Ao3TX9BXXCKTFbBk51F2iEuSCi8r5gSesdkZ2?tab=execution
+        # 2. Direct donations
+        # - donate
+        #    - if result is not None, handle donation.
+        # - transfer_funds_callback
+        #    - check result (will always return DonationExternal IF it is a DonationTransfer)
+        #    - if result is not None, handle donation
+        #    - NB: this method was not implemented until early 2024; for older donations, use donate method
+        case (
+            "donate"
+            | "handle_protocol_fee_callback"
+            | "sybil_callback"
+            | "transfer_funds_callback"
+        ):
+            donation_type = "direct" if receiver_id == DONATE_CONTRACT else "pot"
+            logger.info(f"New {donation_type} donation ({method_name})")
+            log_payload(
+                "ARGS: %s, RECEIPT: %s, STATUS: %s",
+                args_dict,
+                receipt,
+                status_obj,
+            )
+            if not result:
+                logger.info("No result found. Skipping...")
+                return
+            donation_data = decode_base64_json(result)
+            log_payload("Decoded success value: %s", donation_data)
+            if (
+                donation_data is None
+            ):  # edge case that sometimes occurs where the response is a literal string "null", appears to be due to transfer_funds_callback returning None e.g. in the case of a ProtocolFeeCallback (see https://pikespeak.ai/transaction-viewer/78M3HCiBCeCu7jEk6KiVSJGr4utnV2aze8S5ZdEu16t8/detailed for example)
+                logger.info("Result is null or undecodable. Skipping...")
+                return
+            await handle_new_donation(
+                args_dict,
+                receiver_id,
+                signer_id,
+                donation_type,
+                receipt,
+                donation_data,
+            )
+            return
+
+        case (
+            "register_batch"
+        ):  # TODO: listen for create_registration event instead of method call
+            log_payload("registrations incoming: %s", args_dict)
+            if receiver_id != LISTS_CONTRACT:
+                return
+            await handle_new_list_registration(
+                args_dict, receiver_id, signer_id, receipt, status_obj
+            )
+            return
+
+        case "chef_set_application_status":
+            log_payload("application status change incoming: %s", args_dict)
+            await handle_pot_application_status_change(
+                args_dict, receiver_id, signer_id, receipt, status_obj
+            )
+            return
+
+        case "admin_set_default_project_status":
+            log_payload(
+                "registry default status setting incoming: %s",
+                args_dict,
+            )
+            await handle_default_list_status_change(args_dict, receiver_id, status_obj)
+            return
+
+        case (
+            "update_registration"
+        ):  # TODO: listen for update_registration event instead of method call
+            log_payload(
+                "project registration status update incoming: %s",
+                args_dict,
+            )
+            await handle_list_registration_update(args_dict, receiver_id, status_obj)
+            return
+        # TODO: handle delete_registration event
+        case "chef_set_payouts":
+            log_payload("setting payout....: %s", args_dict)
+            await handle_set_payouts(args_dict, receiver_id, receipt)
+            return
+
+        case "challenge_payouts":
+            log_payload("challenge payout: %s", args_dict)
+            await handle_payout_challenge(
+                args_dict,
+                receiver_id,
+                signer_id,
+                receipt.receipt_id,
+                now_datetime,
+            )
+            return
+
+        case "admin_update_payouts_challenge":
+            log_payload("challenge payout: %s", args_dict)
+            await handle_payout_challenge_response(
+                args_dict,
+                receiver_id,
+                signer_id,
+                receipt.receipt_id,
+                now_datetime,
+            )
+            return
+
+        case "transfer_payout_callback":
+            log_payload("fulfilling payouts..... %s", args_dict)
+            await handle_transfer_payout(
+                args_dict, receiver_id, receipt.receipt_id, now_datetime
+            )
+            return
+
+        case (
+            "owner_remove_admins"
+        ):  # TODO: use update_admins event instead of method call to handle all cases
+            log_payload("attempting to remove admins....: %s", args_dict)
+            if receiver_id != LISTS_CONTRACT:
+                return
+            await handle_list_admin_removal(
+                args_dict, receiver_id, signer_id, receipt.receipt_id
+            )
+            return
+
+        case "create_list":
+            log_payload("creating list... %s", args_dict)
+            if receiver_id != LISTS_CONTRACT:
+                return
+            await handle_new_list(signer_id, receiver_id, status_obj)
+            return
+
+        case "upvote":
+            log_payload("up voting... %s", args_dict)
+            if receiver_id != LISTS_CONTRACT:
+                return
+            await handle_list_upvote(
+                args_dict, receiver_id, signer_id, receipt.receipt_id
+            )
+            return
+        case "owner_add_admins":
+            log_payload("adding admins.. %s", args_dict)
+            if not match_nadabot_registry_pattern(receiver_id):
+                return
+            await handle_add_nadabot_admin(args_dict, receiver_id)
+            return
+        case (
+            "admin_set_require_whitelist"
+            | "admin_add_whitelisted_deployers"
+            | "admin_set_protocol_config"
+            | "admin_set_protocol_fee_recipient_account"
+            | "admin_set_protocol_fee_basis_points"
+            | "owner_set_admins"
+            | "owner_clear_admins"
+            | "owner_add_admins"
+            | "owner_remove_admins"
+        ):
+            if not match_pot_factory_pattern(receiver_id):
+                return
+            log_payload("updating configs.. %s", args_dict)
+            await handle_set_factory_configs(args_dict, receiver_id)
+            return
+        # TODO: handle remove upvote
+
+
+async def apply_block_updates(block_updates: BlockUpdates):
+    """Does the follow-up work handlers queued while a block was dispatched."""
+    for contract_id in block_updates.stale_contract_views:
+        await ainvalidate_contract_view(contract_id)
+    if block_updates.donations:
+        await aupdate_donation_rollups(block_updates.donations)
+
+
+async def dispatch(event: IndexerEvent, dispatcher, *args) -> bool:
+    """
+    Runs a dispatcher with `event` as the current event, dead-lettering any uncaught error.
+    Returns False if the dispatcher raised.
+    """
+    token = current_event.set(event)
+    try:
+        await dispatcher(*args)
+        return True
+    except Exception as e:
+        logger.error(f"Error in indexer handler ({event.kind} {event.name}):\n{e}")
+        await record_failed_event(e)
+        return False
+    finally:
+        current_event.reset(token)
+
+
+async def replay_failed_event(failed_event: FailedEvent) -> bool:
+    """
+    Re-applies a dead-lettered event through the same dispatch path as live indexing.
+    Returns True (and marks the event resolved) if no handler failed this time.
+    """
+    event = IndexerEvent(
+        kind=failed_event.kind,
+        name=failed_event.name,
+        args=failed_event.args or {},
+        receiver_id=failed_event.receiver_id,
+        signer_id=failed_event.signer_id,
+        predecessor_id=failed_event.predecessor_id,
+        receipt_id=failed_event.receipt_id,
+        block_height=failed_event.block_height,
+        block_timestamp=failed_event.block_timestamp,
+        result=failed_event.result,
+        failed_event=failed_event,
+    )
+    if event.kind == FailedEventKind.EVENT:
+        await dispatch(
+            event,
+            dispatch_event_log,
+            event.name,
+            event.args,
+            event.receiver_id,
+            event.signer_id,
+            event.block_timestamp,
+        )
+    else:
+        # handlers only read these attributes from the receipt & execution outcome
+        receipt = SimpleNamespace(
+            receipt_id=event.receipt_id, predecessor_id=event.predecessor_id
+        )
+        status_obj = SimpleNamespace(
+            status={"SuccessValue": event.result} if event.result else {}
+        )
+        await dispatch(
+            event,
+            dispatch_method_call,
+            event.name,
+            event.args,
+            event.receiver_id,
+            event.signer_id,
+            event.predecessor_id,
+            receipt,
+            status_obj,
+            event.block_timestamp,
+        )
+    if not event.failed:
+        await sync_to_async(failed_event.mark_resolved)()
+    return not event.failed
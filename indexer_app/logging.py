@@ -1,6 +1,8 @@
 import logging
+import random
 
 import psutil
+from django.conf import settings
 
 logger = logging.getLogger("indexer")
 
@@ -11,3 +13,16 @@ def log_memory_usage(stage):
     logger.info(
         f"{stage} - RSS: {memory_info.rss / 1024 / 1024:.2f} MB, VMS: {memory_info.vms / 1024 / 1024:.2f} MB"
     )
+
+
+def log_payload(msg, *args):
+    """
+    Logs a full receipt payload at DEBUG level for a sampled fraction of calls.
+    Arguments are only formatted if the record is actually emitted.
+    """
+    sample_rate = settings.INDEXER_PAYLOAD_LOG_SAMPLE_RATE
+    if sample_rate <= 0 or not logger.isEnabledFor(logging.DEBUG):
+        return
+    if sample_rate < 1 and random.random() >= sample_rate:
+        return
+    logger.debug(msg, *args)
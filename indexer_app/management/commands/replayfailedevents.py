@@ -0,0 +1,76 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from indexer_app.handler import replay_failed_event
+from indexer_app.models import FailedEvent, FailedEventStatus
+
+
+class Command(BaseCommand):
+    help = "Replay dead-lettered indexer events (by default, all pending events)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "ids",
+            nargs="*",
+            type=int,
+            help="IDs of the failed events to replay",
+        )
+        parser.add_argument(
+            "--name",
+            type=str,
+            help="Only replay events with this method or event name",
+        )
+        parser.add_argument(
+            "--from-block",
+            type=int,
+            help="Only replay events at or after this block height",
+        )
+        parser.add_argument(
+            "--to-block",
+            type=int,
+            help="Only replay events at or before this block height",
+        )
+        parser.add_argument(
+            "--include-exhausted",
+            action="store_true",
+            help="Also replay events that have used up their automatic retries",
+        )
+
+    def handle(self, *args, **options):
+        statuses = [FailedEventStatus.PENDING]
+        if options["include_exhausted"]:
+            statuses.append(FailedEventStatus.EXHAUSTED)
+        failed_events = FailedEvent.objects.filter(status__in=statuses)
+        if options["ids"]:
+            failed_events = failed_events.filter(id__in=options["ids"])
+        if options["name"]:
+            failed_events = failed_events.filter(name=options["name"])
+        if options["from_block"] is not None:
+            failed_events = failed_events.filter(
+                block_height__gte=options["from_block"]
+            )
+        if options["to_block"] is not None:
+            failed_events = failed_events.filter(block_height__lte=options["to_block"])
+        failed_events = list(failed_events.order_by("block_height", "id"))
+
+        if not failed_events:
+            self.stdout.write(self.style.WARNING("No failed events to replay."))
+            return
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            for failed_event in failed_events:
+                if loop.run_until_complete(replay_failed_event(failed_event)):
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Replayed failed event {failed_event}")
+                    )
+                else:
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f"Failed event {failed_event} failed again: {failed_event.error}"
+                        )
+                    )
+        finally:
+            loop.close()
@@ -12,12 +12,19 @@ class Command(BaseCommand):
             type=int,
             help="The starting block number for the Near Data Lake indexer task",
         )
+        parser.add_argument(
+            "--reprocess",
+            action="store_true",
+            help="Re-apply receipts that are already recorded as processed",
+        )
 
     def handle(self, *args, **options):
         start_block = options["start_block"]
         # Invoke Celery task
         try:
-            spot_index_near_events.delay(start_block=start_block)
+            spot_index_near_events.delay(
+                start_block=start_block, reprocess=options["reprocess"]
+            )
             self.stdout.write(
                 self.style.SUCCESS(
                     "Successfully invoked the Near Data Lake indexer task"
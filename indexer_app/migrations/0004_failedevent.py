@@ -0,0 +1,177 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("indexer_app", "0003_alter_blockheight_block_timestamp"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FailedEvent",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        help_text="Failed event id.",
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="failed event id",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("method", "Method call"), ("event", "Event log")],
+                        help_text="Whether the failed event is a method call or an event log.",
+                        max_length=16,
+                        verbose_name="kind",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Method or event name that failed to be handled.",
+                        max_length=64,
+                        verbose_name="name",
+                    ),
+                ),
+                (
+                    "receiver_id",
+                    models.CharField(
+                        help_text="Receipt receiver account ID.",
+                        max_length=64,
+                        verbose_name="receiver id",
+                    ),
+                ),
+                (
+                    "signer_id",
+                    models.CharField(
+                        help_text="Receipt signer account ID.",
+                        max_length=64,
+                        verbose_name="signer id",
+                    ),
+                ),
+                (
+                    "predecessor_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="Receipt predecessor account ID.",
+                        max_length=64,
+                        null=True,
+                        verbose_name="predecessor id",
+                    ),
+                ),
+                (
+                    "receipt_id",
+                    models.CharField(
+                        blank=True,
+                        db_index=True,
+                        help_text="Receipt ID.",
+                        max_length=64,
+                        null=True,
+                        verbose_name="receipt id",
+                    ),
+                ),
+                (
+                    "block_height",
+                    models.IntegerField(
+                        db_index=True,
+                        help_text="Height of the block the receipt was executed in.",
+                        verbose_name="block height",
+                    ),
+                ),
+                (
+                    "block_timestamp",
+                    models.DateTimeField(
+                        help_text="Timestamp of the block the receipt was executed in.",
+                        verbose_name="block timestamp",
+                    ),
+                ),
+                (
+                    "args",
+                    models.JSONField(
+                        blank=True,
+                        help_text="Decoded method args or event data.",
+                        null=True,
+                        verbose_name="args",
+                    ),
+                ),
+                (
+                    "result",
+                    models.TextField(
+                        blank=True,
+                        help_text="Raw (base64) receipt SuccessValue.",
+                        null=True,
+                        verbose_name="result",
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(
+                        help_text="Most recent error raised while handling the event.",
+                        verbose_name="error",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of retries attempted.",
+                        verbose_name="attempts",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("resolved", "Resolved"),
+                            ("exhausted", "Exhausted"),
+                        ],
+                        default="pending",
+                        help_text="Retry status.",
+                        max_length=16,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "next_retry_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Earliest time the event will be retried.",
+                        null=True,
+                        verbose_name="next retry at",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Date the event was dead-lettered.",
+                        verbose_name="created at",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Date the event was last retried.",
+                        verbose_name="updated at",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_retry_at"],
+                        name="idx_failed_event_retry",
+                    )
+                ],
+            },
+        ),
+    ]
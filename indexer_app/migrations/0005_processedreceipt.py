@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("indexer_app", "0004_failedevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProcessedReceipt",
+            fields=[
+                (
+                    "receipt_id",
+                    models.CharField(
+                        help_text="ID of a receipt whose handlers have been applied.",
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="receipt id",
+                    ),
+                ),
+                (
+                    "block_height",
+                    models.IntegerField(
+                        db_index=True,
+                        help_text="Height of the block the receipt was executed in.",
+                        verbose_name="block height",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -1,4 +1,8 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -22,3 +26,157 @@ class BlockHeight(models.Model):
         _("updated at"),
         help_text=_("block height last update at."),
     )
+
+
+class ProcessedReceipt(models.Model):
+    receipt_id = models.CharField(
+        _("receipt id"),
+        primary_key=True,
+        max_length=64,
+        help_text=_("ID of a receipt whose handlers have been applied."),
+    )
+    block_height = models.IntegerField(
+        _("block height"),
+        help_text=_("Height of the block the receipt was executed in."),
+        db_index=True,
+    )
+
+
+class FailedEventKind(models.TextChoices):
+    METHOD = "method", "Method call"
+    EVENT = "event", "Event log"
+
+
+class FailedEventStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    RESOLVED = "resolved", "Resolved"
+    EXHAUSTED = "exhausted", "Exhausted"
+
+
+class FailedEvent(models.Model):
+    id = models.AutoField(
+        _("failed event id"),
+        primary_key=True,
+        help_text=_("Failed event id."),
+    )
+    kind = models.CharField(
+        _("kind"),
+        max_length=16,
+        choices=FailedEventKind.choices,
+        help_text=_("Whether the failed event is a method call or an event log."),
+    )
+    name = models.CharField(
+        _("name"),
+        max_length=64,
+        help_text=_("Method or event name that failed to be handled."),
+        db_index=True,
+    )
+    receiver_id = models.CharField(
+        _("receiver id"),
+        max_length=64,
+        help_text=_("Receipt receiver account ID."),
+    )
+    signer_id = models.CharField(
+        _("signer id"),
+        max_length=64,
+        help_text=_("Receipt signer account ID."),
+    )
+    predecessor_id = models.CharField(
+        _("predecessor id"),
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text=_("Receipt predecessor account ID."),
+    )
+    receipt_id = models.CharField(
+        _("receipt id"),
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text=_("Receipt ID."),
+        db_index=True,
+    )
+    block_height = models.IntegerField(
+        _("block height"),
+        help_text=_("Height of the block the receipt was executed in."),
+        db_index=True,
+    )
+    block_timestamp = models.DateTimeField(
+        _("block timestamp"),
+        help_text=_("Timestamp of the block the receipt was executed in."),
+    )
+    args = models.JSONField(
+        _("args"),
+        null=True,
+        blank=True,
+        help_text=_("Decoded method args or event data."),
+    )
+    result = models.TextField(
+        _("result"),
+        null=True,
+        blank=True,
+        help_text=_("Raw (base64) receipt SuccessValue."),
+    )
+    error = models.TextField(
+        _("error"),
+        help_text=_("Most recent error raised while handling the event."),
+    )
+    attempts = models.PositiveIntegerField(
+        _("attempts"),
+        default=0,
+        help_text=_("Number of retries attempted."),
+    )
+    status = models.CharField(
+        _("status"),
+        max_length=16,
+        choices=FailedEventStatus.choices,
+        default=FailedEventStatus.PENDING,
+        help_text=_("Retry status."),
+    )
+    next_retry_at = models.DateTimeField(
+        _("next retry at"),
+        null=True,
+        blank=True,
+        help_text=_("Earliest time the event will be retried."),
+    )
+    created_at = models.DateTimeField(
+        _("created at"),
+        auto_now_add=True,
+        help_text=_("Date the event was dead-lettered."),
+    )
+    updated_at = models.DateTimeField(
+        _("updated at"),
+        auto_now=True,
+        help_text=_("Date the event was last retried."),
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_retry_at"],
+                name="idx_failed_event_retry",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.name} ({self.receipt_id})"
+
+    def record_failed_attempt(self, error):
+        """Bumps the retry count and schedules the next retry with exponential backoff."""
+        self.attempts += 1
+        self.error = str(error)
+        if self.attempts >= settings.DEAD_LETTER_MAX_ATTEMPTS:
+            self.status = FailedEventStatus.EXHAUSTED
+            self.next_retry_at = None
+        else:
+            delay = min(
+                settings.DEAD_LETTER_RETRY_BASE_SECONDS * 2**self.attempts,
+                settings.DEAD_LETTER_RETRY_MAX_SECONDS,
+            )
+            self.next_retry_at = timezone.now() + timedelta(seconds=delay)
+        self.save()
+
+    def mark_resolved(self):
+        self.status = FailedEventStatus.RESOLVED
+        self.next_retry_at = None
+        self.save()
@@ -1,31 +1,41 @@
 import asyncio
 import logging
 import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 from pathlib import Path
 
-import requests
 from billiard.exceptions import WorkerLostError
 from celery import shared_task
-from celery.signals import task_revoked, worker_shutdown
+from celery.signals import task_revoked, worker_process_init, worker_shutdown
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Count, DecimalField, Q, Sum, Value
 from django.db.models.functions import Cast, NullIf
+from django.utils import timezone
 from near_lake_framework import LakeConfig, streamer
 
 from accounts.models import Account
+from accounts.profiles import refresh_social_profiles
 from base.celery import SPOT_INDEXER_QUEUE_NAME
-from donations.models import Donation
-from indexer_app.handler import handle_streamer_message
+from base.db import discard_inherited_pools, get_pool_stats
+from base.rpc import ContractViewError, view_contract
+from donations.leaderboards import rebuild_leaderboards, update_leaderboards
+from donations.models import Donation, LeaderboardWindow
+from donations.rollups import update_donation_rollups
+from indexer_app.handler import handle_streamer_message, replay_failed_event
+from indexer_app.models import FailedEvent, FailedEventStatus
 from pots.models import Pot, PotPayout
+from tokens.models import Token
 
 from .logging import logger
+from .tracing import BlockBatchTrace
 from .utils import get_block_height, save_block_height
 
 CURRENT_BLOCK_HEIGHT_KEY = "current_block_height"
 
 
-async def indexer(from_block: int, to_block: int):
+async def indexer(from_block: int, to_block: int, skip_processed: bool = True):
     """
     Runs the lake indexer framework
     """
@@ -47,6 +57,8 @@ async def indexer(from_block: int, to_block: int):
     lake_config.aws_secret_key = settings.AWS_SECRET_ACCESS_KEY
     _, streamer_messages_queue = streamer(lake_config)
     block_count = 0
+    # the loop itself isn't traced; timings are sent to Sentry aggregated per batch of blocks
+    block_trace = BlockBatchTrace(settings.SENTRY_INDEXER_BLOCKS_PER_TRANSACTION)
 
     while True:
         try:
@@ -59,6 +71,8 @@ async def indexer(from_block: int, to_block: int):
                 f"Time to fetch new block: {fetch_end_time - fetch_start_time:.4f} seconds"
             )
             block_count += 1
+            if block_count % 100 == 0:
+                logger.info(f"DB pool stats: {get_pool_stats()}")
 
             # Log time before caching block height
             save_start_time = time.time()
@@ -77,11 +91,16 @@ async def indexer(from_block: int, to_block: int):
 
             # Log time before handling the streamer message
             handle_start_time = time.time()
-            await handle_streamer_message(streamer_message)
+            await handle_streamer_message(streamer_message, skip_processed)
             handle_end_time = time.time()
             logger.info(
                 f"Time to handle streamer message: {handle_end_time - handle_start_time:.4f} seconds"
             )
+            block_trace.record(
+                streamer_message.block.header.height,
+                fetch_end_time - fetch_start_time,
+                handle_end_time - handle_start_time,
+            )
 
             # Log total time for one iteration
             iteration_end_time = time.time()
@@ -112,14 +131,16 @@ def listen_to_near_events():
 
 
 @shared_task(queue=SPOT_INDEXER_QUEUE_NAME)
-def spot_index_near_events(start_block):
+def spot_index_near_events(start_block, reprocess=False):
     logger.info("Spot indexing NEAR events...")
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
     try:
         logger.info(f"Spot index start block: {start_block-1}")
-        loop.run_until_complete(indexer(start_block - 1, None))
+        loop.run_until_complete(
+            indexer(start_block - 1, None, skip_processed=not reprocess)
+        )
     except WorkerLostError:
         pass  # don't log to Sentry
     finally:
@@ -168,6 +189,11 @@ def fetch_usd_prices():
             jobs_logger.error(
                 f"Failed to fetch USD prices for donation {donation.id}: {e}"
             )
+    priced = [
+        donation for donation in donations if donation.total_amount_usd is not None
+    ]
+    update_leaderboards(priced)
+    update_donation_rollups(priced)
     jobs_logger.info(f"USD prices fetched for {donations_count} donations.")
 
     # payouts
@@ -185,6 +211,53 @@ def fetch_usd_prices():
     jobs_logger.info(f"USD prices fetched for {payouts_count} payouts.")
 
 
+@shared_task
+def fetch_token_usd_prices(token_id, bucket):
+    """
+    Resolves USD prices for the unpriced donations of one token within one time bucket.
+    Scheduled by the indexer; the first donation stores the historical price and the rest reuse it.
+    """
+    bucket_start = datetime.fromtimestamp(
+        bucket * settings.USD_PRICE_BUCKET_SECONDS, tz=dt_timezone.utc
+    )
+    bucket_end = bucket_start + timedelta(seconds=settings.USD_PRICE_BUCKET_SECONDS)
+    donations = Donation.objects.select_related("token").filter(
+        Q(total_amount_usd__isnull=True) | Q(net_amount_usd__isnull=True),
+        token_id=token_id,
+        donated_at__gte=bucket_start,
+        donated_at__lt=bucket_end,
+    )
+    for donation in donations:
+        try:
+            donation.fetch_usd_prices()
+        except Exception as e:
+            jobs_logger.error(
+                f"Failed to fetch USD prices for donation {donation.id}: {e}"
+            )
+    priced = [
+        donation for donation in donations if donation.total_amount_usd is not None
+    ]
+    update_leaderboards(priced)
+    # the donations themselves were rolled up when indexed; this adds their USD amounts
+    update_donation_rollups(priced)
+
+
+@shared_task
+def rebuild_rolling_leaderboards():
+    """Recomputes the 7 and 30 day leaderboards, dropping donations that have aged out of them."""
+    rebuild_leaderboards(
+        [LeaderboardWindow.LAST_7_DAYS, LeaderboardWindow.LAST_30_DAYS]
+    )
+    jobs_logger.info("Rolling leaderboards rebuilt.")
+
+
+@shared_task
+def fetch_token_coingecko_id(token_id):
+    token = Token.objects.filter(account_id=token_id).first()
+    if token and not token.coingecko_id:
+        token.fetch_coingecko_id()
+
+
 @shared_task
 def update_pot_statistics():
     pots = Pot.objects.all()
@@ -196,74 +269,69 @@ def update_pot_statistics():
         try:
             print(f"Processing pot: {pot.account}")
 
-            # total matching pool
-            pot.total_matching_pool = sum(
-                int(donation.total_amount)
-                for donation in matching_pool_donations
-                if donation.total_amount.isdigit()
+            matching_pool_totals = matching_pool_donations.aggregate(
+                total=Sum("total_amount_numeric"),
+                total_usd=Sum("total_amount_usd"),
+                count=Count("id"),
             )
+
+            # total matching pool
+            pot.total_matching_pool = str(int(matching_pool_totals["total"] or 0))
             jobs_logger.info(f"Total matching pool: {pot.total_matching_pool}")
 
             # total matching pool usd
-            pot.total_matching_pool_usd = sum(
-                donation.total_amount_usd
-                for donation in matching_pool_donations
-                if donation.total_amount_usd
-            )
+            pot.total_matching_pool_usd = matching_pool_totals["total_usd"] or 0
             jobs_logger.info(f"Total matching pool USD: {pot.total_matching_pool_usd}")
 
             # matching pool balance (get from contract)
-            url = (
-                f"{settings.FASTNEAR_RPC_URL}/account/{pot.account.id}/view/get_config"
-            )
-            response = requests.get(url)
-            if response.status_code != 200:
+            try:
+                data = view_contract(pot.account.id, "get_config")
+            except ContractViewError as e:
                 jobs_logger.error(
-                    f"Failed to get matching pool balance for pot {pot.account}: {response.text}"
+                    f"Failed to get matching pool balance for pot {pot.account}: {e}"
                 )
             else:
-                data = response.json()
                 pot.matching_pool_balance = data["matching_pool_balance"]
                 jobs_logger.info(
                     f"Matching pool balance for pot {pot.account}: {pot.matching_pool_balance}"
                 )
 
             # matching pool donations count
-            pot.matching_pool_donations_count = matching_pool_donations.count()
+            pot.matching_pool_donations_count = matching_pool_totals["count"]
             jobs_logger.info(
                 f"Matching pool donations count: {pot.matching_pool_donations_count}"
             )
 
-            # total public donations
-            pot.total_public_donations = sum(
-                int(donation.total_amount)
-                for donation in public_donations
-                if donation.total_amount.isdigit()
+            public_totals = public_donations.aggregate(
+                total=Sum("total_amount_numeric"),
+                total_usd=Sum("total_amount_usd"),
+                count=Count("id"),
             )
+
+            # total public donations
+            pot.total_public_donations = str(int(public_totals["total"] or 0))
             jobs_logger.info(f"Total public donations: {pot.total_public_donations}")
 
             # total public donations usd
-            pot.total_public_donations_usd = sum(
-                donation.total_amount_usd
-                for donation in public_donations
-                if donation.total_amount_usd
-            )
+            pot.total_public_donations_usd = public_totals["total_usd"] or 0
             jobs_logger.info(
                 f"Total public donations USD: {pot.total_public_donations_usd}"
             )
 
             # public donations count
-            pot.public_donations_count = public_donations.count()
+            pot.public_donations_count = public_totals["count"]
             jobs_logger.info(f"Public donations count: {pot.public_donations_count}")
 
             # Save changes
             pot.save(
                 update_fields=[
                     "total_matching_pool",
+                    "total_matching_pool_numeric",
                     "total_matching_pool_usd",
                     "matching_pool_balance",
                     "matching_pool_donations_count",
                     "total_public_donations",
+                    "total_public_donations_numeric",
                     "total_public_donations_usd",
                     "public_donations_count",
                 ]
@@ -327,8 +395,46 @@ def update_account_statistics():
     jobs_logger.info(f"Account stats for {accounts.count()} accounts updated.")
 
 
+@shared_task
+def refresh_account_social_profiles():
+    checked, updated = refresh_social_profiles(
+        limit=settings.SOCIAL_PROFILE_REFRESH_TASK_LIMIT
+    )
+    jobs_logger.info(f"Checked {checked} accounts, updated {updated} social profiles.")
+
+
+@shared_task
+def retry_failed_events(limit=100):
+    """Re-applies dead-lettered indexer events whose backoff has elapsed."""
+    failed_events = list(
+        FailedEvent.objects.filter(
+            status=FailedEventStatus.PENDING, next_retry_at__lte=timezone.now()
+        ).order_by("next_retry_at")[:limit]
+    )
+    if not failed_events:
+        return
+    jobs_logger.info(f"Retrying {len(failed_events)} failed indexer events...")
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    resolved_count = 0
+    try:
+        for failed_event in failed_events:
+            if loop.run_until_complete(replay_failed_event(failed_event)):
+                resolved_count += 1
+    finally:
+        loop.close()
+    jobs_logger.info(
+        f"Resolved {resolved_count} of {len(failed_events)} failed indexer events."
+    )
+
+
 @task_revoked.connect
 def on_task_revoked(request, terminated, signum, expired, **kwargs):
     logger.info(
         f"Task {request.id} revoked; terminated={terminated}, signum={signum}, expired={expired}"
     )
+
+
+@worker_process_init.connect
+def on_worker_process_init(**kwargs):
+    discard_inherited_pools()
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+import sentry_sdk
+
+from base.sentry import INDEXER_BLOCKS_OP
+
+
+class BlockBatchTrace:
+    """
+    Aggregates indexer loop timings and sends them to Sentry as one transaction per `blocks_per_trace`
+    blocks (with a fetch and a handle span covering the batch) instead of tracing every block.
+    """
+
+    def __init__(self, blocks_per_trace: int):
+        self.blocks_per_trace = blocks_per_trace
+        self.reset()
+
+    def reset(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.blocks = 0
+        self.first_block_height = None
+        self.fetch_seconds = 0.0
+        self.handle_seconds = 0.0
+        self.max_handle_seconds = 0.0
+
+    def record(self, block_height: int, fetch_seconds: float, handle_seconds: float):
+        if self.first_block_height is None:
+            self.first_block_height = block_height
+        self.blocks += 1
+        self.fetch_seconds += fetch_seconds
+        self.handle_seconds += handle_seconds
+        self.max_handle_seconds = max(self.max_handle_seconds, handle_seconds)
+        if self.blocks >= self.blocks_per_trace:
+            self.send(block_height)
+            self.reset()
+
+    def send(self, last_block_height: int):
+        transaction = sentry_sdk.start_transaction(
+            op=INDEXER_BLOCKS_OP,
+            name="index blocks",
+            start_timestamp=self.started_at,
+        )
+        transaction.set_tag("first_block_height", self.first_block_height)
+        transaction.set_tag("last_block_height", last_block_height)
+        transaction.set_measurement("blocks", self.blocks)
+        transaction.set_measurement(
+            "avg_handle_time", self.handle_seconds / self.blocks * 1000, "millisecond"
+        )
+        transaction.set_measurement(
+            "max_handle_time", self.max_handle_seconds * 1000, "millisecond"
+        )
+        # aggregated spans laid end to end from the start of the batch
+        fetch_end = self.started_at + timedelta(seconds=self.fetch_seconds)
+        for op, start, end in (
+            ("indexer.fetch", self.started_at, fetch_end),
+            (
+                "indexer.handle",
+                fetch_end,
+                fetch_end + timedelta(seconds=self.handle_seconds),
+            ),
+        ):
+            span = transaction.start_child(
+                op=op, description=f"{self.blocks} blocks", start_timestamp=start
+            )
+            span.finish(end_timestamp=end)
+        transaction.finish()
@@ -1,10 +1,13 @@
 import base64
 import json
-from datetime import datetime
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from math import log
 
 import requests
 from asgiref.sync import sync_to_async
+from celery import current_app
 from django.conf import settings
 from django.core.cache import cache
 from django.forms.models import model_to_dict
@@ -13,10 +16,13 @@ from near_lake_framework.near_primitives import ExecutionOutcome, Receipt
 
 from accounts.models import Account
 from activities.models import Activity
+from base.rpc import ContractViewError, ainvalidate_contract_view, aview_contract
 from donations.models import Donation
-from indexer_app.models import BlockHeight
+from donations.rollups import update_donation_rollups
+from indexer_app.models import BlockHeight, FailedEvent
 from lists.models import List, ListRegistration, ListUpvote
 from nadabot.models import BlackList, Group, NadabotRegistry, Provider, Stamp
+from nadabot.scoring import ainvalidate_all_human_scores, ainvalidate_human_scores
 from pots.models import (
     Pot,
     PotApplication,
@@ -28,11 +34,117 @@ from pots.models import (
 )
 from tokens.models import Token
 
-from .logging import logger
+from .logging import log_payload, logger
 
 # GECKO_URL = "https://api.coingecko.com/api/v3"  # TODO: move to settings
 
 
+@dataclass
+class IndexerEvent:
+    """A single method call or event log being dispatched to a handler."""
+
+    kind: str  # FailedEventKind value
+    name: str
+    args: dict
+    receiver_id: str
+    signer_id: str
+    block_height: int
+    block_timestamp: datetime
+    predecessor_id: str = None
+    receipt_id: str = None
+    result: str = None  # raw base64 SuccessValue
+    failed_event: FailedEvent = None  # set when replaying a dead-lettered event
+    failed: bool = False
+
+
+# Set by the dispatcher for the duration of each handler call so failures can be dead-lettered
+current_event: ContextVar[IndexerEvent] = ContextVar("current_event", default=None)
+
+
+def current_block_height():
+    """Height of the block being dispatched, used to key cached contract view calls."""
+    event = current_event.get()
+    return event.block_height if event else None
+
+
+@dataclass
+class BlockUpdates:
+    """Follow-up work collected while a block's receipts are dispatched, and done once after them."""
+
+    stale_contract_views: set = field(default_factory=set)
+    donations: list = field(default_factory=list)  # newly indexed, to roll up
+
+
+# Set by handle_streamer_message for the duration of each block
+current_block_updates: ContextVar[BlockUpdates] = ContextVar(
+    "current_block_updates", default=None
+)
+
+
+async def amark_contract_view_stale(contract_id):
+    """
+    Drops the cached views of a contract whose state changed, for API reads (indexer reads are keyed by
+    block height and never go stale). While a block is dispatched, each contract is invalidated once after it.
+    """
+    updates = current_block_updates.get()
+    if updates is None:
+        await ainvalidate_contract_view(contract_id)
+    else:
+        updates.stale_contract_views.add(contract_id)
+
+
+async def aupdate_donation_rollups(donations):
+    try:
+        await sync_to_async(update_donation_rollups)(donations)
+    except Exception as e:
+        logger.error(f"Failed to update donation rollups: {e}")
+
+
+async def aqueue_donation_rollups(donation):
+    """
+    Counts a newly indexed donation in the time-series rollups (its USD amounts are added once priced).
+    While a block is dispatched, its donations are rolled up together after it.
+    """
+    updates = current_block_updates.get()
+    if updates is None:
+        await aupdate_donation_rollups([donation])
+    else:
+        updates.donations.append(donation)
+
+
+async def record_failed_event(error: Exception):
+    """
+    Persists the event currently being dispatched to the dead-letter table, or schedules
+    its next retry if it is already a dead-lettered event being replayed.
+    Only the first failure per dispatch is recorded.
+    """
+    event = current_event.get()
+    if event is None or event.failed:
+        return
+    event.failed = True
+    try:
+        if event.failed_event:
+            await sync_to_async(event.failed_event.record_failed_attempt)(error)
+            return
+        event.failed_event = await FailedEvent.objects.acreate(
+            kind=event.kind,
+            name=event.name,
+            receiver_id=event.receiver_id,
+            signer_id=event.signer_id,
+            predecessor_id=event.predecessor_id,
+            receipt_id=event.receipt_id,
+            block_height=event.block_height,
+            block_timestamp=event.block_timestamp,
+            args=event.args,
+            result=event.result,
+            error=str(error),
+            next_retry_at=timezone.now()
+            + timedelta(seconds=settings.DEAD_LETTER_RETRY_BASE_SECONDS),
+        )
+    except Exception as e:
+        logger.error(f"Failed to dead-letter {event.kind} {event.name}: {e}")
+
+
 async def handle_social_profile_update(args_dict, receiver_id, signer_id):
     logger.info(f"handling social profile update for {signer_id}")
     if (
@@ -46,16 +158,26 @@ async def handle_social_profile_update(args_dict, receiver_id, signer_id):
             logger.info(f"account: {account}")
             if account:
                 logger.info(f"updating social profile for {signer_id}")
-                await account.fetch_near_social_profile_data_async()
-                # account.fetch_near_social_profile_data()
+                profile_update = args_dict["data"][signer_id]["profile"]
+                if account.near_social_profile_data is not None and isinstance(
+                    profile_update, dict
+                ):
+                    # the set args carry the changed profile fields; no need to refetch the profile
+                    event = current_event.get()
+                    await account.apply_near_social_profile_update_async(
+                        profile_update, event.block_height if event else None
+                    )
+                else:
+                    await account.fetch_near_social_profile_data_async()
         except Exception as e:
             logger.error(f"Error in handle_social_profile_update: {e}")
+            await record_failed_event(e)
 
 
 async def handle_new_nadabot_registry(
     data: dict, receiverId: str, created_at: datetime
 ):
-    logger.info(f"nadabot registry init... {data}")
+    logger.info("nadabot registry init... %s", data)
 
     try:
         registry, _ = await Account.objects.aget_or_create(id=receiverId)
@@ -74,12 +196,13 @@ async def handle_new_nadabot_registry(
                 await nadabot_registry.admins.aadd(admin)
     except Exception as e:
         logger.error(f"Error in registry initiialization: {e}")
+        await record_failed_event(e)
 
 
 async def handle_registry_blacklist_action(
     data: dict, receiverId: str, created_at: datetime
 ):
-    logger.info(f"Registry blacklist action....... {data}")
+    logger.info("Registry blacklist action....... %s", data)
 
     try:
         registry, _ = await Account.objects.aget_or_create(id=receiverId)
@@ -97,21 +220,25 @@ async def handle_registry_blacklist_action(
             await BlackList.objects.abulk_create(
                 objs=[BlackList(**data) for data in bulk_obj], ignore_conflicts=True
             )
+        await ainvalidate_human_scores(data["accounts"], receiverId)
     except Exception as e:
         logger.error(f"Error in adding acct to blacklist: {e}")
+        await record_failed_event(e)
 
 
 async def handle_registry_unblacklist_action(
     data: dict, receiverId: str, created_at: datetime
 ):
-    logger.info(f"Registry remove blacklisted accts....... {data}")
+    logger.info("Registry remove blacklisted accts....... %s", data)
 
     try:
         registry, _ = await Account.objects.aget_or_create(id=receiverId)
         entries = BlackList.objects.filter(account__in=data["accounts"])
         await entries.adelete()
+        await ainvalidate_human_scores(data["accounts"], receiverId)
     except Exception as e:
         logger.error(f"Error in removing acct from blacklist: {e}")
+        await record_failed_event(e)
 
 
 async def handle_new_pot(
@@ -139,7 +266,8 @@ async def handle_new_pot(
         if pot:
             logger.info("Pot already exists, update using api call")
             pot_config_update = sync_to_async(pot.update_configs)
-            await pot_config_update()
+            await pot_config_update(current_block_height())
+            await amark_contract_view_stale(receiver_id)
             return
 
         logger.info("upsert chef")
@@ -206,14 +334,18 @@ async def handle_new_pot(
             "signer_id": signer_id,
             "receiver_id": receiver_id,
             "timestamp": created_at,
+            "action_result": data,
             "tx_hash": receiptId,
         }
 
         activity, activity_created = await Activity.objects.aupdate_or_create(
-            action_result=data, type="Deploy_Pot", defaults=defaults
+            action_result_hash=Activity.hash_action_result(data),
+            type="Deploy_Pot",
+            defaults=defaults,
         )
     except Exception as e:
         logger.error(f"Failed to handle new pot, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_pot_config_update(
@@ -225,7 +357,8 @@ async def handle_pot_config_update(
         if pot:
             logger.info("Pot already exists, updating using api call")
             pot_config_update = sync_to_async(pot.update_configs)
-            await pot_config_update()
+            await pot_config_update(current_block_height())
+            await amark_contract_view_stale(receiver_id)
         # pot_config = {
         #     "deployer": data["deployed_by"],
         #     "source_metadata": data["source_metadata"],
@@ -280,6 +413,7 @@ async def handle_pot_config_update(
         # await Pot.objects.filter(id=receiver_id).aupdate(**pot_config)
     except Exception as e:
         logger.error(f"Failed to update Pot config, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_new_pot_factory(data: dict, receiver_id: str, created_at: datetime):
@@ -328,6 +462,7 @@ async def handle_new_pot_factory(data: dict, receiver_id: str, created_at: datet
                 await factory.whitelisted_deployers.aadd(deployer)
     except Exception as e:
         logger.error(f"Failed to handle new pot Factory, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_new_list(
@@ -342,7 +477,7 @@ async def handle_new_list(
             )  # TODO: RECEIVE AS A FUNCTION ARGUMENT
         )
 
-        logger.info(f"creating list..... {data}")
+        logger.info("creating list..... %s", data)
 
         listObject = await List.objects.acreate(
             id=data["id"],
@@ -372,6 +507,7 @@ async def handle_new_list(
                 await listObject.admins.aadd(admin_object)
     except Exception as e:
         logger.error(f"Failed to handle new list, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_new_list_registration(
@@ -381,7 +517,7 @@ async def handle_new_list_registration(
     receipt: Receipt,
     status_obj: ExecutionOutcome,
 ):
-    logger.info(f"new Project data: {data}, {receiver_id}")
+    log_payload("new Project data: %s, %s", data, receiver_id)
 
     # Retrieve receipt data
     if receipt is None:
@@ -396,7 +532,6 @@ async def handle_new_list_registration(
     project_list = []
     insert_data = []
     for dt in reg_data:
-        logger.info(f"dt: {dt}")
         project_list.append({"id": dt["registrant_id"]})
         insert_data.append(
             {
@@ -412,7 +547,7 @@ async def handle_new_list_registration(
                 "tx_hash": receipt.receipt_id,
             }
         )
-    logger.info(f"insert_data: {insert_data}")
+    log_payload("insert_data: %s", insert_data)
 
     try:
         await Account.objects.abulk_create(
@@ -422,6 +557,7 @@ async def handle_new_list_registration(
         logger.info("Upserted accounts/registrants(signer)")
     except Exception as e:
         logger.error(f"Encountered error trying to get create acct: {e}")
+        await record_failed_event(e)
 
     try:
         await ListRegistration.objects.abulk_create(
@@ -429,6 +565,7 @@ async def handle_new_list_registration(
         )
     except Exception as e:
         logger.error(f"Encountered error trying to create list: {e}")
+        await record_failed_event(e)
 
     # Insert activity
     try:
@@ -436,20 +573,24 @@ async def handle_new_list_registration(
             "signer_id": signer_id,
             "receiver_id": receiver_id,
             "timestamp": datetime.fromtimestamp(insert_data[0]["submitted_at"] / 1000),
+            "action_result": reg_data,
             "tx_hash": receipt.receipt_id,
         }
 
         activity, activity_created = await Activity.objects.aupdate_or_create(
-            action_result=reg_data, type="Register_Batch", defaults=defaults
+            action_result_hash=Activity.hash_action_result(reg_data),
+            type="Register_Batch",
+            defaults=defaults,
         )
     except Exception as e:
         logger.error(f"Encountered error trying to insert activity: {e}")
+        await record_failed_event(e)
 
 
 async def handle_list_registration_update(
     data: dict, receiver_id: str, status_obj: ExecutionOutcome
 ):
-    logger.info(f"new Project data: {data}, {receiver_id}")
+    logger.info("new Project data: %s, %s", data, receiver_id)
 
     data = json.loads(
         base64.b64decode(status_obj.status.get("SuccessValue")).decode(
@@ -469,6 +610,7 @@ async def handle_list_registration_update(
         await ListRegistration.objects.filter(id=data["id"]).aupdate(**regUpdate)
     except Exception as e:
         logger.error(f"Encountered error trying to update ListRegistration: {e}")
+        await record_failed_event(e)
 
 
 async def handle_pot_application(
@@ -489,7 +631,7 @@ async def handle_pot_application(
         appl_data = json.loads(
             base64.b64decode(result).decode("utf-8")
         )  # TODO: RECEIVE AS A FUNCTION ARGUMENT
-        logger.info(f"new pot application data: {data}, {appl_data}")
+        logger.info("new pot application data: %s, %s", data, appl_data)
 
         # Update or create the account
         project, _ = await Account.objects.aget_or_create(
@@ -525,11 +667,14 @@ async def handle_pot_application(
             "signer_id": signer_id,
             "receiver_id": receiver_id,
             "timestamp": created_at,
+            "action_result": appl_data,
             "tx_hash": receipt.receipt_id,
         }
 
         activity, activity_created = await Activity.objects.aupdate_or_create(
-            action_result=appl_data, type="Submit_Application", defaults=defaults
+            action_result_hash=Activity.hash_action_result(appl_data),
+            type="Submit_Application",
+            defaults=defaults,
         )
 
         logger.info(
@@ -537,6 +682,7 @@ async def handle_pot_application(
         )
     except Exception as e:
         logger.error(f"Failed to handle pot application, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_pot_application_status_change(
@@ -548,7 +694,7 @@ async def handle_pot_application_status_change(
 ):
     try:
 
-        logger.info(f"pot application update data: {data}, {receiver_id}")
+        logger.info("pot application update data: %s, %s", data, receiver_id)
 
         # receipt = next(receipt for receipt in block.receipts() if receipt.receiptId == receiptId)
         update_data = json.loads(
@@ -593,6 +739,7 @@ async def handle_pot_application_status_change(
         logger.info("PotApplicationReview and PotApplication updated successfully.")
     except Exception as e:
         logger.error(f"Failed to change pot application status, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_default_list_status_change(
@@ -600,7 +747,7 @@ async def handle_default_list_status_change(
 ):
     try:
 
-        logger.info(f"update project data: {data}, {receiver_id}")
+        logger.info("update project data: %s, %s", data, receiver_id)
 
         result_data = json.loads(
             base64.b64decode(status_obj.status.get("SuccessValue")).decode(
@@ -626,6 +773,7 @@ async def handle_default_list_status_change(
         logger.info("List updated successfully.")
     except Exception as e:
         logger.error(f"Failed to change list status, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_list_upvote(
@@ -633,7 +781,7 @@ async def handle_list_upvote(
 ):
     try:
 
-        logger.info(f"upvote list: {data}, {receiver_id}")
+        logger.info("upvote list: %s, %s", data, receiver_id)
 
         acct, _ = await Account.objects.aget_or_create(
             id=signer_id,
@@ -650,11 +798,14 @@ async def handle_list_upvote(
             "signer_id": signer_id,
             "receiver_id": receiver_id,
             "timestamp": created_at,
+            "action_result": data,
             "tx_hash": receiptId,
         }
 
         activity, activity_created = await Activity.objects.aupdate_or_create(
-            action_result=data, type="Upvote", defaults=defaults
+            action_result_hash=Activity.hash_action_result(data),
+            type="Upvote",
+            defaults=defaults,
         )
 
         logger.info(
@@ -662,12 +813,13 @@ async def handle_list_upvote(
         )
     except Exception as e:
         logger.error(f"Failed to upvote list, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_set_payouts(data: dict, receiver_id: str, receipt: Receipt):
     try:
 
-        logger.info(f"set payout data: {data}, {receiver_id}")
+        logger.info("set payout data: %s, %s", data, receiver_id)
         payouts = data.get("payouts", [])
         pot = await Pot.objects.aget(account=receiver_id)
         near_acct, _ = await Account.objects.aget_or_create(id="near")
@@ -689,17 +841,20 @@ async def handle_set_payouts(data: dict, receiver_id: str, receipt: Receipt):
             insertion_data.append(pot_payout)
 
         await PotPayout.objects.abulk_create(insertion_data, ignore_conflicts=True)
-        url = f"{settings.FASTNEAR_RPC_URL}/account/{receiver_id}/view/get_config"
-        response = requests.get(url)
-        if response.status_code != 200:
-            logger.error(f"Failed to get config for pot {receiver_id}: {response.text}")
+        await amark_contract_view_stale(receiver_id)
+        try:
+            data = await aview_contract(
+                receiver_id, "get_config", block_height=current_block_height()
+            )
+        except ContractViewError as e:
+            logger.error(f"Failed to get config for pot {receiver_id}: {e}")
         else:
-            data = response.json()
             pot = await Pot.objects.aget(account=receiver_id)
             pot.cooldown_end = datetime.fromtimestamp(data["cooldown_end_ms"] / 1000)
             await pot.asave()
     except Exception as e:
         logger.error(f"Failed to set payouts, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_transfer_payout(
@@ -708,7 +863,7 @@ async def handle_transfer_payout(
     try:
 
         data = data["payout"]
-        logger.info(f"fulfill payout data: {data}, {receiver_id}, {created_at}")
+        logger.info("fulfill payout data: %s, %s, %s", data, receiver_id, created_at)
         payout = {
             "recipient_id": data["project_id"],
             "amount": data["amount"],
@@ -718,18 +873,21 @@ async def handle_transfer_payout(
         await PotPayout.objects.filter(recipient_id=data["project_id"]).aupdate(
             **payout
         )
+        await amark_contract_view_stale(receiver_id)
         # check if all_paid_out is now true
-        url = f"{settings.FASTNEAR_RPC_URL}/account/{receiver_id}/view/get_config"
-        response = requests.get(url)
-        if response.status_code != 200:
-            logger.error(f"Failed to get config for pot {receiver_id}: {response.text}")
+        try:
+            data = await aview_contract(
+                receiver_id, "get_config", block_height=current_block_height()
+            )
+        except ContractViewError as e:
+            logger.error(f"Failed to get config for pot {receiver_id}: {e}")
         else:
-            data = response.json()
             pot = await Pot.objects.aget(account=receiver_id)
             pot.all_paid_out = data["all_paid_out"]
             await pot.asave()
     except Exception as e:
         logger.error(f"Failed to create payout data, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_payout_challenge(
@@ -737,7 +895,7 @@ async def handle_payout_challenge(
 ):
     try:
         acct, _ = await Account.objects.aget_or_create(id=signer_id)
-        logger.info(f"challenging payout..: {data}, {receiver_id}")
+        logger.info("challenging payout..: %s, %s", data, receiver_id)
         payoutChallenge = {
             "created_at": created_at,
             "message": data["reason"],
@@ -751,21 +909,25 @@ async def handle_payout_challenge(
             "signer_id": signer_id,
             "receiver_id": receiver_id,
             "timestamp": created_at,
+            "action_result": data,
             "tx_hash": receiptId,
         }
 
         activity, activity_created = await Activity.objects.aupdate_or_create(
-            action_result=data, type="Challenge_Payout", defaults=defaults
+            action_result_hash=Activity.hash_action_result(data),
+            type="Challenge_Payout",
+            defaults=defaults,
         )
     except Exception as e:
         logger.error(f"Failed to create payoutchallenge, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_payout_challenge_response(
     data: dict, receiver_id: str, signer_id: str, receiptId: str, created_at: datetime
 ):
     try:
-        logger.info(f"responding to payout challenge..: {data}, {receiver_id}")
+        logger.info("responding to payout challenge..: %s, %s", data, receiver_id)
         response_defaults = {
             "admin_id": signer_id,
             "message": data.get("notes"),
@@ -780,12 +942,13 @@ async def handle_payout_challenge_response(
         )
     except Exception as e:
         logger.error(f"Failed to handle admin challeneg response, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_list_admin_removal(data, receiver_id, signer_id, receiptId):
     try:
 
-        logger.info(f"removing admin...: {data}, {receiver_id}")
+        logger.info("removing admin...: %s, %s", data, receiver_id)
         list_obj = await List.objects.aget(id=data["list_id"])
 
         for acct in data["admins"]:
@@ -803,10 +966,11 @@ async def handle_list_admin_removal(data, receiver_id, signer_id, receiptId):
         )
     except Exception as e:
         logger.error(f"Failed to remove list admin, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_add_nadabot_admin(data, receiverId):
-    logger.info(f"adding admin...: {data}, {receiverId}")
+    logger.info("adding admin...: %s, %s", data, receiverId)
     try:
         obj = await NadabotRegistry.objects.aget(account=receiverId)
 
@@ -815,27 +979,32 @@ async def handle_add_nadabot_admin(data, receiverId):
             await obj.admins.aadd(user)
     except Exception as e:
         logger.error(f"Failed to add nadabot admin, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_add_factory_deployers(data, receiverId):
-    logger.info(f"adding factory deployer...: {data}, {receiverId}")
+    logger.info("adding factory deployer...: %s, %s", data, receiverId)
     try:
         factory = await PotFactory.objects.aget(account=receiverId)
         for acct in data["whitelisted_deployers"]:
             user, _ = await Account.objects.aget_or_create(id=acct)
             await factory.whitelisted_deployers.aadd(user)
+        await amark_contract_view_stale(receiverId)
     except Exception as e:
         logger.error(f"Failed to add factory whitelisted deployers, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_set_factory_configs(data, receiverId):
-    logger.info(f"setting factory configs...: {data}, {receiverId}")
+    logger.info("setting factory configs...: %s, %s", data, receiverId)
     try:
         factory = await PotFactory.objects.aget(account=receiverId)
         config_update = sync_to_async(factory.update_configs)
-        await config_update()
+        await config_update(current_block_height())
+        await amark_contract_view_stale(receiverId)
     except Exception as e:
         logger.error(f"Failed to update factory configs, Error: {e}")
+        await record_failed_event(e)
 
 
 # # TODO: Need to abstract some actions.
@@ -861,6 +1030,31 @@ async def handle_set_factory_configs(data, receiverId):
 # TODO: create handle_new_pot_donation & handle_new_direct_donation functions & share common logic with _handle_new_donation function
 
 
+async def asend_task(name, **options):
+    """Publishes a celery task from a worker thread, so the event loop never waits on the broker."""
+    await sync_to_async(current_app.send_task, thread_sensitive=False)(name, **options)
+
+
+async def schedule_usd_price_resolution(donation: Donation):
+    """
+    Enqueues USD price resolution for the donation's token and time bucket, so the indexer never waits on CoinGecko.
+    Donations of the same token within a bucket are coalesced into a single job.
+    """
+    bucket = int(donation.donated_at.timestamp()) // settings.USD_PRICE_BUCKET_SECONDS
+    coalesce_key = f"usd_prices:{donation.token_id}:{bucket}"
+    if await cache.aadd(coalesce_key, True, settings.USD_PRICE_COALESCE_SECONDS):
+        try:
+            await asend_task(
+                "indexer_app.tasks.fetch_token_usd_prices",
+                args=[donation.token_id, bucket],
+                countdown=settings.USD_PRICE_COALESCE_SECONDS,
+            )
+        except Exception:
+            # let the next donation in the bucket (or the retried event) schedule it
+            await cache.adelete(coalesce_key)
+            raise
+
+
 async def handle_new_donation(
     data: dict,
     receiver_id: str,
@@ -869,8 +1063,8 @@ async def handle_new_donation(
     receipt_obj: Receipt,
     donation_data: dict,  # Donation object (note that these vary between direct and pot donations - see examples of each in ./examples.txt)
 ):
-    logger.info(f"handle_new_donation args data: {data}, {receiver_id}")
-    logger.info(f"donation data: {donation_data}")
+    logger.info("handle_new_donation args data: %s, %s", data, receiver_id)
+    logger.info("donation data: %s", donation_data)
 
     if "net_amount" in donation_data and donation_data["net_amount"] != "0":
         net_amount = int(donation_data["net_amount"])
@@ -938,12 +1132,17 @@ async def handle_new_donation(
                         token_defaults["icon"] = ft_metadata["icon"]
                     if "decimals" in ft_metadata:
                         token_defaults["decimals"] = ft_metadata["decimals"]
-        token, _ = await Token.objects.aupdate_or_create(
+        token, token_created = await Token.objects.aupdate_or_create(
             account=token_acct, defaults=token_defaults
         )
+        if token_created:
+            await asend_task(
+                "indexer_app.tasks.fetch_token_coingecko_id", args=[token.pk]
+            )
 
     except Exception as e:
         logger.error(f"Failed to create/get an account involved in donation: {e}")
+        await record_failed_event(e)
 
     try:
 
@@ -973,7 +1172,7 @@ async def handle_new_donation(
         if donation_type == "pot":
             default_data["pot"] = await Pot.objects.aget(account=receiver_id)
 
-        logger.info(f"default donation data: {default_data}")
+        logger.info("default donation data: %s", default_data)
 
         donation, donation_created = await Donation.objects.aupdate_or_create(
             on_chain_id=donation_data["id"],
@@ -981,10 +1180,14 @@ async def handle_new_donation(
             defaults=default_data,
         )
         logger.info(f"Created donation? {donation_created}")
-        logger.info(f"donation: {donation.to_dict()}")
+        logger.info("donation: %s", donation.to_dict())
 
-        # fetch USD prices
-        await donation.fetch_usd_prices_async()  # might not need to await this?
+        # USD prices are resolved in the background
+        await schedule_usd_price_resolution(donation)
+        await aqueue_donation_rollups(donation)
+        if donation.pot_id:
+            # the pot's matching pool balance / totals changed
+            await amark_contract_view_stale(receiver_id)
 
         # Insert or update activity record
         activity_type = (
@@ -1000,11 +1203,14 @@ async def handle_new_donation(
             "signer_id": signer_id,
             "receiver_id": receiver_id,
             "timestamp": donation.donated_at,
+            "action_result": donation_data,
             "tx_hash": receipt_obj.receipt_id,
         }
         try:
             activity, activity_created = await Activity.objects.aupdate_or_create(
-                action_result=donation_data, type=activity_type, defaults=defaults
+                action_result_hash=Activity.hash_action_result(donation_data),
+                type=activity_type,
+                defaults=defaults,
             )
             if activity_created:
                 logger.info(f"Activity created: {activity}")
@@ -1014,6 +1220,7 @@ async def handle_new_donation(
             logger.info(f"Failed to create Activity: {e}")
     except Exception as e:
         logger.error(f"Failed to create/update donation: {e}")
+        await record_failed_event(e)
 
     ### COMMENTING OUT FOR NOW SINCE WE HAVE PERIODIC JOB RUNNING TO UPDATE ACCOUNT STATS (NB: DOESN'T CURRENTLY COVER POT STATS)
     ### CAN ALWAYS ADD BACK IF DESIRED
@@ -1077,7 +1284,7 @@ async def handle_new_donation(
 
 
 async def handle_update_default_human_threshold(data: dict, receiverId: str):
-    logger.info(f"update threshold data... {data}")
+    logger.info("update threshold data... %s", data)
 
     try:
 
@@ -1087,10 +1294,11 @@ async def handle_update_default_human_threshold(data: dict, receiverId: str):
         logger.info("updated threshold..")
     except Exception as e:
         logger.error(f"Failed to update default threshold, Error: {e}")
+        await record_failed_event(e)
 
 
 async def handle_new_provider(data: dict, receiverId: str, signerId: str):
-    logger.info(f"new provider data: {data}, {receiverId}")
+    logger.info("new provider data: %s, %s", data, receiverId)
     data = data["provider"]
 
     logger.info(
@@ -1134,12 +1342,14 @@ async def handle_new_provider(data: dict, receiverId: str, signerId: str):
             custom_args=data.get("custom_args"),
             registry_id=receiverId,
         )
+        await ainvalidate_all_human_scores()
     except Exception as e:
         logger.error(f"Failed to add new stamp provider: {e}")
+        await record_failed_event(e)
 
 
 async def handle_add_stamp(data: dict, receiverId: str, signerId: str):
-    logger.info(f"new stamp data: {data}, {receiverId}")
+    logger.info("new stamp data: %s, %s", data, receiverId)
     data = data["stamp"]
 
     logger.info(f"upserting accounts involved, {data['user_id']}")
@@ -1153,12 +1363,14 @@ async def handle_add_stamp(data: dict, receiverId: str, signerId: str):
             provider=provider,
             verified_at=datetime.fromtimestamp(data["validated_at_ms"] / 1000),
         )
+        await ainvalidate_human_scores([user.id], receiverId)
     except Exception as e:
         logger.error(f"Failed to create stamp: {e}")
+        await record_failed_event(e)
 
 
 async def handle_new_group(data: dict, created_at: datetime):
-    logger.info(f"new group data: {data}")
+    logger.info("new group data: %s", data)
     group_data = data.get("group", {})
     try:
         # group enums can have values, they are represented as a dict in the events from the indexer, and enum choices without values are presented as normal strings:
@@ -1180,15 +1392,17 @@ async def handle_new_group(data: dict, created_at: datetime):
             rule_val=rule_val,
         )
 
-        logger.info(f"addding provider.... : {group_data['providers']}")
+        logger.info("addding provider.... : %s", group_data["providers"])
         if group_data.get("providers"):
             for provider_id in group_data["providers"]:
                 provider, _ = await Provider.objects.aget_or_create(
                     on_chain_id=provider_id
                 )
                 await group.providers.aadd(provider)
+        await ainvalidate_all_human_scores()
     except Exception as e:
         logger.error(f"Failed to create group, because: {e}")
+        await record_failed_event(e)
 
 
 async def save_block_height(block_height: int, block_timestamp: int):
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from base.admin import LargeTableAdmin
+
 from .models import Account, List, ListRegistration, ListUpvote
 
 
@@ -48,7 +50,7 @@ class ListUpvoteAdmin(admin.ModelAdmin):
 
 
 @admin.register(ListRegistration)
-class ListRegistrationAdmin(admin.ModelAdmin):
+class ListRegistrationAdmin(LargeTableAdmin):
     list_display = (
         "id",
         "list",
@@ -61,6 +63,9 @@ class ListRegistrationAdmin(admin.ModelAdmin):
     list_filter = ("status", "submitted_at", "updated_at")
     search_fields = ("list__name", "registrant__id", "registered_by__id")
     ordering = ("-submitted_at",)
+    list_select_related = ("list", "registrant", "registered_by")
+    autocomplete_fields = ("registrant", "registered_by")
+    raw_id_fields = ("list",)
 
     def has_add_permission(self, request):
         return False
@@ -16,6 +16,7 @@ from rest_framework.views import APIView
 
 from api.pagination import pagination_parameters
 from api.pagination import CustomSizePageNumberPagination
+from base.serializers import sparse_fieldset_parameters, sparse_queryset
 
 from .models import List, ListRegistrationStatus
 from .serializers import (
@@ -35,6 +36,7 @@ class ListsListAPI(APIView, CustomSizePageNumberPagination):
     @extend_schema(
         parameters=[
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -55,9 +57,10 @@ class ListsListAPI(APIView, CustomSizePageNumberPagination):
     )
     @method_decorator(cache_page(60 * 5))
     def get(self, request: Request, *args, **kwargs):
-        lists = List.objects.all()
+        lists = List.objects.select_related("owner").prefetch_related("admins")
+        lists = sparse_queryset(lists, request)
         results = self.paginate_queryset(lists, request, view=self)
-        serializer = ListSerializer(results, many=True)
+        serializer = ListSerializer(results, many=True, context={"request": request})
         return self.get_paginated_response(serializer.data)
 
 
@@ -66,6 +69,7 @@ class ListDetailAPI(APIView):
     @extend_schema(
         parameters=[
             OpenApiParameter("list_id", int, OpenApiParameter.PATH),
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -94,7 +98,7 @@ class ListDetailAPI(APIView):
             return Response(
                 {"message": f"List with ID {list_id} not found."}, status=404
             )
-        serializer = ListSerializer(list_obj)
+        serializer = ListSerializer(list_obj, context={"request": request})
         return Response(serializer.data)
 
 
@@ -116,6 +120,7 @@ class ListRegistrationsAPI(APIView, CustomSizePageNumberPagination):
                 description="Filter registrations by category",
             ),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -159,8 +164,11 @@ class ListRegistrationsAPI(APIView, CustomSizePageNumberPagination):
             registrations = registrations.filter(
                 registrant__near_social_profile_data__plCategories__iregex=category_regex_pattern
             )
+        registrations = sparse_queryset(registrations, request)
         results = self.paginate_queryset(registrations, request, view=self)
-        serializer = ListRegistrationSerializer(results, many=True)
+        serializer = ListRegistrationSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
 
 
@@ -175,6 +183,7 @@ class ListRandomRegistrationAPI(APIView):
                 OpenApiParameter.QUERY,
                 description="Filter registrations by status",
             ),
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -221,5 +230,7 @@ class ListRandomRegistrationAPI(APIView):
             )
 
         registration = random.choice(registrations_list)
-        serializer = ListRegistrationSerializer(registration)
+        serializer = ListRegistrationSerializer(
+            registration, context={"request": request}
+        )
         return Response(serializer.data)
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:20
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_account_search_text"),  # installs pg_trgm
+        ("lists", "0007_alter_list_cover_image_url_alter_list_description_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="list",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="list_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -79,7 +80,10 @@ class List(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=["created_at", "updated_at"], name="idx_list_stamps")
+            models.Index(fields=["created_at", "updated_at"], name="idx_list_stamps"),
+            GinIndex(
+                fields=["name"], name="list_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
         ]
 
 
@@ -1,12 +1,17 @@
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
-from accounts.serializers import SIMPLE_ACCOUNT_EXAMPLE, AccountSerializer
+from accounts.serializers import (
+    ACCOUNT_REFERENCE_EXAMPLE,
+    AccountReferenceSerializer,
+    AccountSerializer,
+)
+from base.serializers import SparseFieldsetsMixin
 
 from .models import List, ListRegistration
 
 
-class ListSerializer(ModelSerializer):
+class ListSerializer(SparseFieldsetsMixin, ModelSerializer):
     class Meta:
         model = List
         fields = [
@@ -22,9 +27,13 @@ class ListSerializer(ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        expandable_fields = {
+            "owner": AccountSerializer,
+            "admins": AccountSerializer,
+        }
 
-    owner = AccountSerializer()
-    admins = AccountSerializer(many=True)
+    owner = AccountReferenceSerializer()
+    admins = AccountReferenceSerializer(many=True)
 
     # def get_owner(self, obj):
     #     return AccountSerializer(obj.owner).data
@@ -33,7 +42,7 @@ class ListSerializer(ModelSerializer):
     #     return AccountSerializer(obj.admins.all(), many=True).data
 
 
-class ListRegistrationSerializer(ModelSerializer):
+class ListRegistrationSerializer(SparseFieldsetsMixin, ModelSerializer):
     class Meta:
         model = ListRegistration
         fields = [
@@ -48,17 +57,21 @@ class ListRegistrationSerializer(ModelSerializer):
             "admin_notes",
             "tx_hash",
         ]
+        expandable_fields = {
+            "registrant": AccountSerializer,
+            "registered_by": AccountSerializer,
+        }
 
     list = ListSerializer()
-    registrant = AccountSerializer()
-    registered_by = AccountSerializer()
+    registrant = AccountReferenceSerializer()
+    registered_by = AccountReferenceSerializer()
 
 
 SIMPLE_LIST_EXAMPLE = {
     "id": 1,
     "on_chain_id": 1,
-    "owner": SIMPLE_ACCOUNT_EXAMPLE,
-    "admins": [SIMPLE_ACCOUNT_EXAMPLE],
+    "owner": ACCOUNT_REFERENCE_EXAMPLE,
+    "admins": [ACCOUNT_REFERENCE_EXAMPLE],
     "name": "Potlock Public Goods Registry",
     "description": "The official NEAR Protocol Public Goods Registry",
     "cover_image_url": None,
@@ -92,8 +105,8 @@ SIMPLE_LIST_REGISTRATION_EXAMPLE = {
     "admin_notes": "This is a great project that I want on my list.",
     "tx_hash": "EVMQsXorrrxPLHfK9UnbzFUy1SVYWvc8hwSGQZs4RbTk",
     "list": SIMPLE_LIST_EXAMPLE,
-    "registrant": SIMPLE_ACCOUNT_EXAMPLE,
-    "registered_by": SIMPLE_ACCOUNT_EXAMPLE,
+    "registrant": ACCOUNT_REFERENCE_EXAMPLE,
+    "registered_by": ACCOUNT_REFERENCE_EXAMPLE,
 }
 
 PAGINATED_LIST_REGISTRATION_EXAMPLE = {
@@ -1 +1,92 @@
-# nadabot api
\ No newline at end of file
+# nadabot api
+from django.conf import settings
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .scoring import get_human_scores, get_human_threshold
+from .serializers import IS_HUMAN_EXAMPLE, IsHumanResponseSerializer
+
+
+class IsHumanAPI(APIView):
+    # scores are cached for a long time, so they must be computed from up-to-date stamps
+    read_replica = False
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "account_ids",
+                str,
+                OpenApiParameter.QUERY,
+                required=True,
+                description=f"Comma-separated account IDs (max {settings.IS_HUMAN_MAX_ACCOUNTS})",
+            ),
+            OpenApiParameter(
+                "registry_id",
+                str,
+                OpenApiParameter.QUERY,
+                required=False,
+                description=f"Nadabot registry to score against (defaults to {settings.NADABOT_REGISTRY_ID})",
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=IsHumanResponseSerializer,
+                description="Returns human scores and is_human flags for the accounts",
+                examples=[
+                    OpenApiExample(
+                        "example-1",
+                        summary="Simple example",
+                        description="Example response for is_human",
+                        value=IS_HUMAN_EXAMPLE,
+                        response_only=True,
+                    ),
+                ],
+            ),
+            400: OpenApiResponse(description="Missing or too many account IDs"),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs):
+        account_ids = list(
+            dict.fromkeys(
+                account_id.strip()
+                for account_id in request.query_params.get("account_ids", "").split(",")
+                if account_id.strip()
+            )
+        )
+        if not account_ids:
+            return Response({"message": "account_ids is required."}, status=400)
+        if len(account_ids) > settings.IS_HUMAN_MAX_ACCOUNTS:
+            return Response(
+                {
+                    "message": f"At most {settings.IS_HUMAN_MAX_ACCOUNTS} account IDs can be checked at once."
+                },
+                status=400,
+            )
+
+        registry_id = request.query_params.get(
+            "registry_id", settings.NADABOT_REGISTRY_ID
+        )
+        threshold = get_human_threshold(registry_id)
+        scores = get_human_scores(account_ids, registry_id)
+        serializer = IsHumanResponseSerializer(
+            {
+                "registry_id": registry_id,
+                "threshold": threshold,
+                "results": [
+                    {
+                        "account_id": account_id,
+                        "score": scores[account_id],
+                        "is_human": scores[account_id] >= threshold,
+                    }
+                    for account_id in account_ids
+                ],
+            }
+        )
+        return Response(serializer.data)
@@ -0,0 +1,179 @@
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import (
+    BlackList,
+    Group,
+    NadabotRegistry,
+    Provider,
+    ProviderStatus,
+    RuleType,
+    Stamp,
+)
+
+SCORES_VERSION_KEY = "human_scores_version"
+SCORE_CACHE_KEY = "human_score:{version}:{registry_id}:{account_id}"
+
+
+def _score_key(version, registry_id, account_id):
+    return SCORE_CACHE_KEY.format(
+        version=version, registry_id=registry_id, account_id=account_id
+    )
+
+
+def _ranks_within_accounts(account_index, weights):
+    """
+    Sorts stamps by account and descending weight; returns the sort order and each sorted stamp's
+    rank within its account (0 for the account's heaviest stamp).
+    """
+    order = np.lexsort((-weights, account_index))
+    sorted_accounts = account_index[order]
+    positions = np.arange(len(order))
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_accounts)) + 1]
+    first_positions = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    return order, positions - first_positions
+
+
+def _reduce_group(rule_type, rule_val, account_index, weights, n_accounts):
+    """Applies a group's rule to its stamps, reducing them to one score per account."""
+    if len(weights) == 0:
+        return np.zeros(n_accounts)
+    if rule_type == RuleType.HIGHEST:
+        scores = np.zeros(n_accounts)
+        np.maximum.at(scores, account_index, weights)
+        return scores
+    if rule_type == RuleType.LOWEST:
+        scores = np.full(n_accounts, np.inf)
+        np.minimum.at(scores, account_index, weights)
+        scores[np.isinf(scores)] = 0
+        return scores
+    if rule_type in (RuleType.DIMINISHING_RETURNS, RuleType.INCREASING_RETURNS):
+        # each further stamp (heaviest first) counts rule_val percent less (or more) than the previous one
+        order, ranks = _ranks_within_accounts(account_index, weights)
+        factor = (rule_val or 0) / 100
+        step = 1 - factor if rule_type == RuleType.DIMINISHING_RETURNS else 1 + factor
+        adjusted = weights[order] * np.power(max(step, 0), ranks)
+        return np.bincount(account_index[order], weights=adjusted, minlength=n_accounts)
+    # Sum (default), optionally capped at rule_val
+    scores = np.bincount(account_index, weights=weights, minlength=n_accounts)
+    if rule_type == RuleType.SUM and rule_val:
+        scores = np.minimum(scores, rule_val)
+    return scores
+
+
+def compute_human_scores(account_ids, registry_id):
+    """
+    Computes human scores for many accounts in one pass: the weights of each account's valid stamps are
+    summed for ungrouped providers and reduced per group rule for grouped ones. Blacklisted accounts score 0.
+    """
+    account_ids = list(account_ids)
+    n_accounts = len(account_ids)
+    account_positions = {account_id: i for i, account_id in enumerate(account_ids)}
+
+    providers = {
+        provider_id: (weight, validity_ms)
+        for provider_id, weight, validity_ms in Provider.objects.filter(
+            registry_id=registry_id, status=ProviderStatus.ACTIVE
+        ).values_list("id", "default_weight", "stamp_validity_ms")
+    }
+    now = timezone.now().date()
+    stamp_pairs = set()
+    for user_id, provider_id, verified_at in Stamp.objects.filter(
+        user_id__in=account_ids, provider_id__in=list(providers)
+    ).values_list("user_id", "provider_id", "verified_at"):
+        validity_ms = providers[provider_id][1]
+        if (
+            isinstance(validity_ms, int)
+            and verified_at + timedelta(milliseconds=validity_ms) < now
+        ):
+            continue  # expired
+        stamp_pairs.add((account_positions[user_id], provider_id))
+
+    scores = np.zeros(n_accounts)
+    if stamp_pairs:
+        account_index, provider_ids = (
+            np.array(values, dtype=np.int64) for values in zip(*stamp_pairs)
+        )
+        weights = np.array(
+            [providers[provider_id][0] for provider_id in provider_ids.tolist()],
+            dtype=np.float64,
+        )
+
+        grouped = np.zeros(len(provider_ids), dtype=bool)
+        group_providers = {}
+        for group_id, provider_id in Group.providers.through.objects.filter(
+            provider_id__in=list(providers)
+        ).values_list("group_id", "provider_id"):
+            group_providers.setdefault(group_id, []).append(provider_id)
+        for group in Group.objects.filter(id__in=group_providers):
+            in_group = np.isin(provider_ids, group_providers[group.id])
+            grouped |= in_group
+            scores += _reduce_group(
+                group.rule_type,
+                group.rule_val,
+                account_index[in_group],
+                weights[in_group],
+                n_accounts,
+            )
+        scores += np.bincount(
+            account_index[~grouped], weights=weights[~grouped], minlength=n_accounts
+        )
+
+    blacklisted = set(
+        BlackList.objects.filter(
+            registry_id=registry_id, account_id__in=account_ids
+        ).values_list("account_id", flat=True)
+    )
+    return {
+        account_id: 0 if account_id in blacklisted else int(scores[i])
+        for i, account_id in enumerate(account_ids)
+    }
+
+
+def get_human_scores(account_ids, registry_id=None):
+    """Returns {account_id: score}, computing scores only for accounts that aren't cached."""
+    registry_id = registry_id or settings.NADABOT_REGISTRY_ID
+    version = cache.get(SCORES_VERSION_KEY, 0)
+    keys = {
+        account_id: _score_key(version, registry_id, account_id)
+        for account_id in account_ids
+    }
+    cached = cache.get_many(keys.values())
+    scores = {
+        account_id: cached[key] for account_id, key in keys.items() if key in cached
+    }
+    missing = [account_id for account_id in keys if account_id not in scores]
+    if missing:
+        computed = compute_human_scores(missing, registry_id)
+        cache.set_many(
+            {keys[account_id]: score for account_id, score in computed.items()},
+            settings.HUMAN_SCORE_CACHE_TIMEOUT,
+        )
+        scores.update(computed)
+    return scores
+
+
+def get_human_threshold(registry_id=None):
+    registry_id = registry_id or settings.NADABOT_REGISTRY_ID
+    registry = NadabotRegistry.objects.filter(account_id=registry_id).first()
+    return registry.default_human_threshold if registry else 0
+
+
+async def ainvalidate_human_scores(account_ids, registry_id=None):
+    """Drops cached scores for the given accounts (e.g. after a stamp or blacklist change)."""
+    registry_id = registry_id or settings.NADABOT_REGISTRY_ID
+    version = await cache.aget(SCORES_VERSION_KEY, 0)
+    await cache.adelete_many(
+        [_score_key(version, registry_id, account_id) for account_id in account_ids]
+    )
+
+
+async def ainvalidate_all_human_scores():
+    """Invalidates every cached score (e.g. after a provider or group change) by bumping the cache version."""
+    # incr is atomic, so concurrent invalidations are never lost
+    await cache.aadd(SCORES_VERSION_KEY, 0, None)
+    await cache.aincr(SCORES_VERSION_KEY)
@@ -1,3 +1,4 @@
+from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
 from .models import NadabotRegistry, Provider, Stamp
@@ -13,3 +14,25 @@ class ProviderSerializer(ModelSerializer):
     class Meta:
         model = Provider
         fields = "__all__"  # TODO: potentially adjust this e.g. for formatting of datetimes, adding convenience fields etc
+
+
+class HumanScoreSerializer(serializers.Serializer):
+    account_id = serializers.CharField()
+    score = serializers.IntegerField()
+    is_human = serializers.BooleanField()
+
+
+class IsHumanResponseSerializer(serializers.Serializer):
+    registry_id = serializers.CharField()
+    threshold = serializers.IntegerField()
+    results = HumanScoreSerializer(many=True)
+
+
+IS_HUMAN_EXAMPLE = {
+    "registry_id": "v1.nadabot.near",
+    "threshold": 30,
+    "results": [
+        {"account_id": "user.near", "score": 45, "is_human": True},
+        {"account_id": "bot.near", "score": 0, "is_human": False},
+    ],
+}
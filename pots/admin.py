@@ -2,6 +2,7 @@ from django import forms
 from django.contrib import admin
 
 from accounts.models import Account
+from base.admin import LargeTableAdmin
 
 from .models import (
     Pot,
@@ -186,10 +187,13 @@ class PotApplicationReviewAdmin(admin.ModelAdmin):
 
 
 @admin.register(PotPayout)
-class PotPayoutAdmin(admin.ModelAdmin):
+class PotPayoutAdmin(LargeTableAdmin):
     list_display = ("id", "pot", "recipient", "amount", "amount_paid_usd", "paid_at")
     search_fields = ("pot__account", "recipient__id")
     list_filter = ("paid_at",)
+    list_select_related = ("pot", "recipient")
+    autocomplete_fields = ("recipient",)
+    raw_id_fields = ("pot", "token")
 
     def has_add_permission(self, request):
         return False
@@ -20,19 +20,23 @@ from accounts.serializers import (
 )
 from api.pagination import pagination_parameters
 from api.pagination import CustomSizePageNumberPagination
+from base.serializers import sparse_fieldset_parameters, sparse_queryset
 from donations.models import Donation
 from donations.serializers import (
     PAGINATED_DONATION_EXAMPLE,
     DonationSerializer,
     PaginatedDonationsResponseSerializer,
 )
+from donations.utils import donation_filter_parameters, filter_donations
 
+from .matching import get_pot_matching
 from .models import Pot, PotApplication, PotApplicationStatus, PotFactory
 from .serializers import (
     PAGINATED_PAYOUT_EXAMPLE,
     PAGINATED_POT_APPLICATION_EXAMPLE,
     PAGINATED_POT_EXAMPLE,
     PAGINATED_POT_FACTORY_EXAMPLE,
+    POT_MATCHING_EXAMPLE,
     SIMPLE_POT_EXAMPLE,
     PaginatedPotApplicationsResponseSerializer,
     PaginatedPotFactoriesResponseSerializer,
@@ -40,6 +44,7 @@ from .serializers import (
     PaginatedPotsResponseSerializer,
     PotApplicationSerializer,
     PotFactorySerializer,
+    PotMatchingSerializer,
     PotPayoutSerializer,
     PotSerializer,
 )
@@ -50,6 +55,7 @@ class PotsListAPI(APIView, CustomSizePageNumberPagination):
     @extend_schema(
         parameters=[
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -69,9 +75,12 @@ class PotsListAPI(APIView, CustomSizePageNumberPagination):
     )
     @method_decorator(cache_page(60 * 5))
     def get(self, request: Request, *args, **kwargs):
-        pots = Pot.objects.all()
+        pots = Pot.objects.select_related("deployer", "owner", "chef").prefetch_related(
+            "admins"
+        )
+        pots = sparse_queryset(pots, request)
         results = self.paginate_queryset(pots, request, view=self)
-        serializer = PotSerializer(results, many=True)
+        serializer = PotSerializer(results, many=True, context={"request": request})
         return self.get_paginated_response(serializer.data)
 
 
@@ -80,6 +89,7 @@ class PotFactoriesAPI(APIView, CustomSizePageNumberPagination):
     @extend_schema(
         parameters=[
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -99,9 +109,14 @@ class PotFactoriesAPI(APIView, CustomSizePageNumberPagination):
     )
     @method_decorator(cache_page(60 * 5))
     def get(self, request: Request, *args, **kwargs):
-        pot_factories = PotFactory.objects.all()
+        pot_factories = PotFactory.objects.select_related(
+            "owner", "protocol_fee_recipient"
+        ).prefetch_related("admins", "whitelisted_deployers")
+        pot_factories = sparse_queryset(pot_factories, request)
         results = self.paginate_queryset(pot_factories, request, view=self)
-        serializer = PotFactorySerializer(results, many=True)
+        serializer = PotFactorySerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
 
 
@@ -110,6 +125,7 @@ class PotDetailAPI(APIView):
     @extend_schema(
         parameters=[
             OpenApiParameter("pot_id", str, OpenApiParameter.PATH),
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -135,7 +151,7 @@ class PotDetailAPI(APIView):
             pot = Pot.objects.get(account=pot_id)
         except Pot.DoesNotExist:
             return Response({"message": f"Pot with ID {pot_id} not found."}, status=404)
-        serializer = PotSerializer(pot)
+        serializer = PotSerializer(pot, context={"request": request})
         return Response(serializer.data)
 
 
@@ -145,6 +161,7 @@ class PotApplicationsAPI(APIView, CustomSizePageNumberPagination):
         parameters=[
             OpenApiParameter("pot_id", str, OpenApiParameter.PATH),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -171,9 +188,12 @@ class PotApplicationsAPI(APIView, CustomSizePageNumberPagination):
         except Pot.DoesNotExist:
             return Response({"message": f"Pot with ID {pot_id} not found."}, status=404)
 
-        applications = pot.applications.all()
+        applications = pot.applications.select_related("applicant")
+        applications = sparse_queryset(applications, request)
         results = self.paginate_queryset(applications, request, view=self)
-        serializer = PotApplicationSerializer(results, many=True)
+        serializer = PotApplicationSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
 
 
@@ -182,7 +202,9 @@ class PotDonationsAPI(APIView, CustomSizePageNumberPagination):
     @extend_schema(
         parameters=[
             OpenApiParameter("pot_id", str, OpenApiParameter.PATH),
+            *donation_filter_parameters,
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -198,6 +220,7 @@ class PotDonationsAPI(APIView, CustomSizePageNumberPagination):
                     ),
                 ],
             ),
+            400: OpenApiResponse(description="Invalid filter or ordering value"),
             404: OpenApiResponse(description="Pot not found"),
         },
     )
@@ -209,9 +232,18 @@ class PotDonationsAPI(APIView, CustomSizePageNumberPagination):
         except Pot.DoesNotExist:
             return Response({"message": f"Pot with ID {pot_id} not found."}, status=404)
 
-        donations = pot.donations.all()
+        donations = pot.donations.select_related(
+            "donor", "recipient", "referrer", "chef", "token"
+        )
+        try:
+            donations = filter_donations(donations, request.query_params)
+        except ValueError as e:
+            return Response({"message": str(e)}, status=400)
+        donations = sparse_queryset(donations, request)
         results = self.paginate_queryset(donations, request, view=self)
-        serializer = DonationSerializer(results, many=True)
+        serializer = DonationSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
 
 
@@ -221,6 +253,7 @@ class PotSponsorsAPI(APIView, CustomSizePageNumberPagination):
         parameters=[
             OpenApiParameter("pot_id", str, OpenApiParameter.PATH),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -253,8 +286,9 @@ class PotSponsorsAPI(APIView, CustomSizePageNumberPagination):
             .distinct()
         )
         sponsors = Account.objects.filter(id__in=sponsor_ids)
+        sponsors = sparse_queryset(sponsors, request)
         results = self.paginate_queryset(sponsors, request, view=self)
-        serializer = AccountSerializer(results, many=True)
+        serializer = AccountSerializer(results, many=True, context={"request": request})
         return self.get_paginated_response(serializer.data)
 
 
@@ -264,6 +298,7 @@ class PotPayoutsAPI(APIView, CustomSizePageNumberPagination):
         parameters=[
             OpenApiParameter("pot_id", str, OpenApiParameter.PATH),
             *pagination_parameters,
+            *sparse_fieldset_parameters,
         ],
         responses={
             200: OpenApiResponse(
@@ -290,7 +325,46 @@ class PotPayoutsAPI(APIView, CustomSizePageNumberPagination):
         except Pot.DoesNotExist:
             return Response({"message": f"Pot with ID {pot_id} not found."}, status=404)
 
-        payouts = pot.payouts.all()
+        payouts = pot.payouts.select_related("recipient", "token")
+        payouts = sparse_queryset(payouts, request)
         results = self.paginate_queryset(payouts, request, view=self)
-        serializer = PotPayoutSerializer(results, many=True)
+        serializer = PotPayoutSerializer(
+            results, many=True, context={"request": request}
+        )
         return self.get_paginated_response(serializer.data)
+
+
+class PotMatchingAPI(APIView):
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("pot_id", str, OpenApiParameter.PATH),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=PotMatchingSerializer,
+                description="Returns estimated quadratic funding matching for the pot's projects",
+                examples=[
+                    OpenApiExample(
+                        "example-1",
+                        summary="Simple example",
+                        description="Example response for pot matching",
+                        value=POT_MATCHING_EXAMPLE,
+                        response_only=True,
+                    ),
+                ],
+            ),
+            404: OpenApiResponse(description="Pot not found"),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs):
+        pot_id = kwargs.get("pot_id")
+        try:
+            pot = Pot.objects.get(account=pot_id)
+        except Pot.DoesNotExist:
+            return Response({"message": f"Pot with ID {pot_id} not found."}, status=404)
+
+        # cached by the engine until a new donation arrives
+        matching = get_pot_matching(pot)
+        serializer = PotMatchingSerializer(matching)
+        return Response(serializer.data)
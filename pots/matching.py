@@ -0,0 +1,183 @@
+from fractions import Fraction
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Sum
+
+from base.logging import logger
+from nadabot.scoring import SCORES_VERSION_KEY, get_human_scores, get_human_threshold
+
+from .models import Pot
+
+MATCHING_CACHE_KEY = (
+    "pot_matching:{pot_id}:{latest_donation_id}:{matching_pool}:{sybil_config}"
+)
+
+
+def get_matching_pool_amount(pot: Pot) -> int:
+    """Amount available for matching: the contract's matching pool balance, or the indexed total as a fallback."""
+    for amount in (pot.matching_pool_balance, pot.total_matching_pool):
+        if amount and str(amount).isdigit():
+            return int(amount)
+    return 0
+
+
+def get_sybil_requirement(pot: Pot):
+    """
+    (nadabot registry id, min human score) a pot's donors must meet to count towards matching, or None if
+    the pot has no sybil provider. The provider is "<registry id>:<method>", e.g. "v1.nadabot.near:is_human".
+    """
+    if not pot.sybil_wrapper_provider:
+        return None
+    registry_id = pot.sybil_wrapper_provider.split(":")[0]
+    threshold = pot.custom_min_threshold_score
+    if threshold is None:
+        threshold = get_human_threshold(registry_id)
+    return registry_id, threshold
+
+
+def public_donations(pot: Pot, donor_ids=None):
+    """A pot's public round donations that count towards matching (only those of `donor_ids`, if given)."""
+    donations = pot.donations.filter(
+        matching_pool=False,
+        recipient__isnull=False,
+        net_amount_numeric__isnull=False,
+    )
+    if donor_ids is not None:
+        donations = donations.filter(donor_id__in=donor_ids)
+    return donations
+
+
+def get_human_donors(pot: Pot, registry_id, threshold) -> list:
+    """Public round donors of a pot whose nadabot human score meets `threshold`."""
+    donor_ids = list(
+        public_donations(pot).values_list("donor_id", flat=True).distinct()
+    )
+    scores = get_human_scores(donor_ids, registry_id)
+    return [donor_id for donor_id in donor_ids if scores.get(donor_id, 0) >= threshold]
+
+
+def load_public_donations(pot: Pot, donor_ids=None):
+    """
+    Loads a pot's public round donations as compact arrays:
+    (donor ids, project ids, donor index per donation, project index per donation, net amounts).
+    Amounts are floats, which is precise enough for scoring but not for reporting totals.
+    """
+    rows = list(
+        public_donations(pot, donor_ids).values_list(
+            "donor_id", "recipient_id", "net_amount_numeric"
+        )
+    )
+    if not rows:
+        empty = np.array([], dtype=np.int64)
+        return np.array([], dtype=str), np.array([], dtype=str), empty, empty, empty
+    donor_ids, project_ids, amounts = zip(*rows)
+    donors, donor_index = np.unique(np.array(donor_ids, dtype=str), return_inverse=True)
+    projects, project_index = np.unique(
+        np.array(project_ids, dtype=str), return_inverse=True
+    )
+    amounts = np.fromiter(amounts, dtype=np.float64, count=len(rows))
+    return donors, projects, donor_index, project_index, amounts
+
+
+def load_project_donation_totals(pot: Pot, donor_ids=None) -> dict:
+    """Exact net amount (yocto) donated to each project in a pot's public round, by project id."""
+    return {
+        row["recipient_id"]: int(row["total"])
+        for row in public_donations(pot, donor_ids)
+        .values("recipient_id")
+        .annotate(total=Sum("net_amount_numeric"))
+        .order_by()
+    }
+
+
+def compute_qf_matching(donor_index, project_index, amounts, n_projects):
+    """
+    Computes quadratic funding allocations. Contributions are first summed per (donor, project) pair,
+    then each project's score is (sum of sqrt(contributions))^2 - sum(contributions), and the matching
+    pool is split pro rata by score.
+    Returns (unique donors, matching pool shares) per project.
+    """
+    pair_keys = donor_index.astype(np.int64) * n_projects + project_index
+    unique_pairs, pair_index = np.unique(pair_keys, return_inverse=True)
+    pair_totals = np.bincount(pair_index, weights=amounts)
+    pair_projects = unique_pairs % n_projects
+
+    donation_totals = np.bincount(
+        pair_projects, weights=pair_totals, minlength=n_projects
+    )
+    donors_count = np.bincount(pair_projects, minlength=n_projects)
+    sqrt_sums = np.bincount(
+        pair_projects, weights=np.sqrt(pair_totals), minlength=n_projects
+    )
+    scores = np.maximum(sqrt_sums**2 - donation_totals, 0)
+    total_score = scores.sum()
+    if total_score > 0:
+        shares = scores / total_score
+    else:
+        shares = np.zeros(n_projects)
+    return donors_count, shares
+
+
+def get_pot_matching(pot: Pot) -> dict:
+    """
+    Returns the QF matching estimate for a pot. If the pot has a sybil provider, only donations from donors
+    passing its nadabot human check count. Results are cached under the pot's latest public donation id and
+    sybil config (and the human scores' version), so they are only recomputed when those change.
+    """
+    latest_donation_id = pot.donations.filter(matching_pool=False).aggregate(
+        latest=Max("id")
+    )["latest"]
+    matching_pool = get_matching_pool_amount(pot)
+    sybil_requirement = get_sybil_requirement(pot)
+    if sybil_requirement:
+        registry_id, threshold = sybil_requirement
+        scores_version = cache.get(SCORES_VERSION_KEY, 0)
+        sybil_config = f"{registry_id}:{threshold}:{scores_version}"
+    else:
+        sybil_config = "-"
+    cache_key = MATCHING_CACHE_KEY.format(
+        pot_id=pot.account_id,
+        latest_donation_id=latest_donation_id,
+        matching_pool=matching_pool,
+        sybil_config=sybil_config,
+    )
+    result = cache.get(cache_key)
+    if result is not None:
+        return result
+
+    donor_ids = get_human_donors(pot, *sybil_requirement) if sybil_requirement else None
+    donors, projects, donor_index, project_index, amounts = load_public_donations(
+        pot, donor_ids
+    )
+    donors_count, shares = compute_qf_matching(
+        donor_index, project_index, amounts, len(projects)
+    )
+    donation_totals = load_project_donation_totals(pot, donor_ids)
+    project_results = [
+        {
+            "project_id": project_id,
+            "donors_count": int(donors_count[i]),
+            "donations_total": str(donation_totals.get(project_id, 0)),
+            # the pool (often > 2^53 yocto) is scaled exactly rather than as a float
+            "matching_amount": str(int(matching_pool * Fraction(float(shares[i])))),
+            "matching_share": float(shares[i]) if matching_pool else 0.0,
+        }
+        for i, project_id in enumerate(projects.tolist())
+    ]
+    project_results.sort(key=lambda project: project["matching_share"], reverse=True)
+    result = {
+        "pot_id": pot.account_id,
+        "matching_pool": str(matching_pool),
+        "latest_donation_id": latest_donation_id,
+        "min_human_score": sybil_requirement[1] if sybil_requirement else None,
+        "donations_count": len(amounts),
+        "donors_count": len(donors),
+        "projects": project_results,
+    }
+    cache.set(cache_key, result, settings.POT_MATCHING_CACHE_TIMEOUT)
+    logger.info(
+        f"Computed QF matching for pot {pot.account_id} ({len(amounts)} donations)"
+    )
+    return result
@@ -0,0 +1,70 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:05
+
+import base.fields
+from django.db import migrations
+
+BACKFILL_POT_SQL = """
+UPDATE pots_pot SET
+    total_matching_pool_numeric = CASE WHEN total_matching_pool ~ '^[0-9]{1,40}$' THEN total_matching_pool::numeric END,
+    total_public_donations_numeric = CASE WHEN total_public_donations ~ '^[0-9]{1,40}$' THEN total_public_donations::numeric END;
+"""
+
+BACKFILL_POTPAYOUT_SQL = """
+UPDATE pots_potpayout SET
+    amount_numeric = CASE WHEN amount ~ '^[0-9]{1,40}$' THEN amount::numeric END;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pots", "0013_potpayoutchallenge_tx_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pot",
+            name="total_matching_pool_numeric",
+            field=base.fields.NumericAmountField(
+                blank=True,
+                decimal_places=0,
+                editable=False,
+                help_text="Total matching pool as a number, for SQL aggregation and sorting.",
+                max_digits=40,
+                null=True,
+                source="total_matching_pool",
+                verbose_name="total matching pool (numeric)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pot",
+            name="total_public_donations_numeric",
+            field=base.fields.NumericAmountField(
+                blank=True,
+                decimal_places=0,
+                editable=False,
+                help_text="Total public donations as a number, for SQL aggregation and sorting.",
+                max_digits=40,
+                null=True,
+                source="total_public_donations",
+                verbose_name="total public donations (numeric)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="potpayout",
+            name="amount_numeric",
+            field=base.fields.NumericAmountField(
+                blank=True,
+                db_index=True,
+                decimal_places=0,
+                editable=False,
+                help_text="Amount as a number, for SQL aggregation and sorting.",
+                max_digits=40,
+                null=True,
+                source="amount",
+                verbose_name="amount (numeric)",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_POT_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(BACKFILL_POTPAYOUT_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
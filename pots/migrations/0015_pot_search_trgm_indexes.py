@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:20
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_account_search_text"),  # installs pg_trgm
+        ("pots", "0014_pot_numeric_amounts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pot",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="pot_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pot",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["description"],
+                name="pot_description_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -1,13 +1,14 @@
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-import requests
-from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from accounts.models import Account
+from base.fields import NumericAmountField
 from base.logging import logger
+from base.rpc import ContractViewError, view_contract
 from base.utils import format_date
 from tokens.models import Token, TokenHistoricalPrice
 
@@ -69,19 +70,17 @@ class PotFactory(models.Model):
     class Meta:
         verbose_name_plural = "Pot Factories"
 
-    def update_configs(self):
+    def update_configs(self, block_height=None):
         try:
-
-            url = (
-                f"{settings.FASTNEAR_RPC_URL}/account/{self.account.id}/view/get_config"
-            )
-            response = requests.get(url)
-            if response.status_code != 200:
+            try:
+                config = view_contract(
+                    self.account.id, "get_config", block_height=block_height
+                )
+            except ContractViewError as e:
                 logger.error(
-                    f"Failed to get config for pot {self.account}: {response.text}"
+                    f"Failed to get config for pot factory {self.account}: {e}"
                 )
             else:
-                config = response.json()
                 print(config)
                 self.protocol_fee_basis_points = config.get("protocol_fee_basis_points")
                 acct, created = Account.objects.get_or_create(
@@ -250,6 +249,13 @@ class Pot(models.Model):
         null=False,
         help_text=_("Total matching pool."),
     )
+    total_matching_pool_numeric = NumericAmountField(
+        _("total matching pool (numeric)"),
+        source="total_matching_pool",
+        help_text=_(
+            "Total matching pool as a number, for SQL aggregation and sorting."
+        ),
+    )
     total_matching_pool_usd = models.DecimalField(
         _("total matching pool in USD"),
         max_digits=20,
@@ -273,6 +279,13 @@ class Pot(models.Model):
         null=False,
         help_text=_("Total public donations."),
     )
+    total_public_donations_numeric = NumericAmountField(
+        _("total public donations (numeric)"),
+        source="total_public_donations",
+        help_text=_(
+            "Total public donations as a number, for SQL aggregation and sorting."
+        ),
+    )
     total_public_donations_usd = models.DecimalField(
         _("total public donations in USD"),
         max_digits=20,
@@ -320,20 +333,27 @@ class Pot(models.Model):
                 fields=["matching_round_start", "matching_round_end"],
                 name="idx_matching_period",
             ),
+            GinIndex(
+                fields=["name"],
+                name="pot_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["description"],
+                name="pot_description_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
-    def update_configs(self):
+    def update_configs(self, block_height=None):
         try:
-            url = (
-                f"{settings.FASTNEAR_RPC_URL}/account/{self.account.id}/view/get_config"
-            )
-            response = requests.get(url)
-            if response.status_code != 200:
-                logger.error(
-                    f"Failed to get config for pot {self.account}: {response.text}"
+            try:
+                config = view_contract(
+                    self.account.id, "get_config", block_height=block_height
                 )
+            except ContractViewError as e:
+                logger.error(f"Failed to get config for pot {self.account}: {e}")
             else:
-                config = response.json()
                 print(config)
                 self.owner, created = Account.objects.get_or_create(
                     id=config.get("owner")
@@ -537,6 +557,12 @@ class PotPayout(models.Model):
         null=False,
         help_text=_("Payout amount."),
     )
+    amount_numeric = NumericAmountField(
+        _("amount (numeric)"),
+        source="amount",
+        help_text=_("Amount as a number, for SQL aggregation and sorting."),
+        db_index=True,
+    )
     amount_paid_usd = models.DecimalField(
         _("amount paid in USD"),
         max_digits=20,
@@ -1,14 +1,18 @@
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
-from accounts.serializers import SIMPLE_ACCOUNT_EXAMPLE, AccountSerializer
-from base.serializers import TwoDecimalPlacesField
+from accounts.serializers import (
+    ACCOUNT_REFERENCE_EXAMPLE,
+    AccountReferenceSerializer,
+    AccountSerializer,
+)
+from base.serializers import SparseFieldsetsMixin, TwoDecimalPlacesField
 from tokens.serializers import SIMPLE_TOKEN_EXAMPLE, TokenSerializer
 
 from .models import Pot, PotApplication, PotFactory, PotPayout
 
 
-class PotSerializer(ModelSerializer):
+class PotSerializer(SparseFieldsetsMixin, ModelSerializer):
     total_matching_pool_usd = TwoDecimalPlacesField(max_digits=20, decimal_places=2)
     total_public_donations_usd = TwoDecimalPlacesField(max_digits=20, decimal_places=2)
 
@@ -51,14 +55,20 @@ class PotSerializer(ModelSerializer):
             "all_paid_out",
             "protocol_config_provider",
         ]
+        expandable_fields = {
+            "deployer": AccountSerializer,
+            "owner": AccountSerializer,
+            "admins": AccountSerializer,
+            "chef": AccountSerializer,
+        }
 
-    deployer = AccountSerializer()
-    owner = AccountSerializer()
-    admins = AccountSerializer(many=True)
-    chef = AccountSerializer()
+    deployer = AccountReferenceSerializer()
+    owner = AccountReferenceSerializer()
+    admins = AccountReferenceSerializer(many=True)
+    chef = AccountReferenceSerializer()
 
 
-class PotFactorySerializer(ModelSerializer):
+class PotFactorySerializer(SparseFieldsetsMixin, ModelSerializer):
 
     class Meta:
         model = PotFactory
@@ -73,14 +83,20 @@ class PotFactorySerializer(ModelSerializer):
             "require_whitelist",
             "protocol_fee_recipient",
         ]
+        expandable_fields = {
+            "owner": AccountSerializer,
+            "protocol_fee_recipient": AccountSerializer,
+            "admins": AccountSerializer,
+            "whitelisted_deployers": AccountSerializer,
+        }
 
-    owner = AccountSerializer()
-    protocol_fee_recipient = AccountSerializer()
-    admins = AccountSerializer(many=True)
-    whitelisted_deployers = AccountSerializer(many=True)
+    owner = AccountReferenceSerializer()
+    protocol_fee_recipient = AccountReferenceSerializer()
+    admins = AccountReferenceSerializer(many=True)
+    whitelisted_deployers = AccountReferenceSerializer(many=True)
 
 
-class PotApplicationSerializer(ModelSerializer):
+class PotApplicationSerializer(SparseFieldsetsMixin, ModelSerializer):
 
     class Meta:
         model = PotApplication
@@ -94,12 +110,15 @@ class PotApplicationSerializer(ModelSerializer):
             "updated_at",
             "tx_hash",
         ]
+        expandable_fields = {
+            "applicant": AccountSerializer,
+        }
 
     pot = PotSerializer()
-    applicant = AccountSerializer()
+    applicant = AccountReferenceSerializer()
 
 
-class PotPayoutSerializer(ModelSerializer):
+class PotPayoutSerializer(SparseFieldsetsMixin, ModelSerializer):
     class Meta:
         model = PotPayout
         fields = [
@@ -112,9 +131,12 @@ class PotPayoutSerializer(ModelSerializer):
             "paid_at",
             "tx_hash",
         ]
+        expandable_fields = {
+            "recipient": AccountSerializer,
+        }
 
     pot = PotSerializer()
-    recipient = AccountSerializer()
+    recipient = AccountReferenceSerializer()
     token = TokenSerializer()
 
 
@@ -159,10 +181,10 @@ SIMPLE_POT_EXAMPLE = {
     "all_paid_out": False,
     "protocol_config_provider": "v1.potfactory.potlock.near:get_protocol_config",
     "pot_factory": "v1.potfactory.potlock.near",
-    "deployer": SIMPLE_ACCOUNT_EXAMPLE,
-    "owner": SIMPLE_ACCOUNT_EXAMPLE,
-    "chef": SIMPLE_ACCOUNT_EXAMPLE,
-    "admins": [SIMPLE_ACCOUNT_EXAMPLE],
+    "deployer": ACCOUNT_REFERENCE_EXAMPLE,
+    "owner": ACCOUNT_REFERENCE_EXAMPLE,
+    "chef": ACCOUNT_REFERENCE_EXAMPLE,
+    "admins": [ACCOUNT_REFERENCE_EXAMPLE],
 }
 
 PAGINATED_POT_EXAMPLE = {
@@ -182,9 +204,9 @@ class PaginatedPotsResponseSerializer(serializers.Serializer):
 
 SIMPLE_POT_FACTORY_EXAMPLE = {
     "account": "v1.potfactory.potlock.near",
-    "owner": SIMPLE_ACCOUNT_EXAMPLE,
-    "admins": [SIMPLE_ACCOUNT_EXAMPLE],
-    "whitelisted_deployers": [SIMPLE_ACCOUNT_EXAMPLE],
+    "owner": ACCOUNT_REFERENCE_EXAMPLE,
+    "admins": [ACCOUNT_REFERENCE_EXAMPLE],
+    "whitelisted_deployers": [ACCOUNT_REFERENCE_EXAMPLE],
     "source_metadata": {
         "link": "https://github.com/PotLock/core",
         "version": "1.0.0",
@@ -193,7 +215,7 @@ SIMPLE_POT_FACTORY_EXAMPLE = {
     "deployed_at": "2024-02-12T13:49:58.940854Z",
     "protocol_fee_basis_points": 200,
     "require_whitelist": False,
-    "protocol_fee_recipient": SIMPLE_ACCOUNT_EXAMPLE,
+    "protocol_fee_recipient": ACCOUNT_REFERENCE_EXAMPLE,
 }
 
 
@@ -220,7 +242,7 @@ SIMPLE_POT_APPLICATION_EXAMPLE = {
     "updated_at": "2024-06-05T18:06:45.519Z",
     "tx_hash": "EVMQsXorrrxPLHfK9UnbzFUy1SVYWvc8hwSGQZs4RbTk",
     "pot": SIMPLE_POT_EXAMPLE,
-    "applicant": SIMPLE_ACCOUNT_EXAMPLE,
+    "applicant": ACCOUNT_REFERENCE_EXAMPLE,
 }
 
 PAGINATED_POT_APPLICATION_EXAMPLE = {
@@ -262,3 +284,50 @@ class PaginatedPotPayoutsResponseSerializer(serializers.Serializer):
     next = serializers.CharField(allow_null=True)
     previous = serializers.CharField(allow_null=True)
     results = PotPayoutSerializer(many=True)
+
+
+class PotMatchingProjectSerializer(serializers.Serializer):
+    project_id = serializers.CharField()
+    donors_count = serializers.IntegerField()
+    donations_total = serializers.CharField()
+    matching_amount = serializers.CharField()
+    matching_share = serializers.FloatField()
+
+
+class PotMatchingSerializer(serializers.Serializer):
+    pot_id = serializers.CharField()
+    matching_pool = serializers.CharField()
+    latest_donation_id = serializers.IntegerField(allow_null=True)
+    min_human_score = serializers.IntegerField(
+        allow_null=True,
+        help_text="Nadabot human score donors need to count towards matching (null if the pot has no sybil provider).",
+    )
+    donations_count = serializers.IntegerField()
+    donors_count = serializers.IntegerField()
+    projects = PotMatchingProjectSerializer(many=True)
+
+
+POT_MATCHING_EXAMPLE = {
+    "pot_id": EXAMPLE_POT_ID,
+    "matching_pool": "10000000000000000000000000",
+    "latest_donation_id": 12345,
+    "min_human_score": None,
+    "donations_count": 3,
+    "donors_count": 2,
+    "projects": [
+        {
+            "project_id": "project1.near",
+            "donors_count": 2,
+            "donations_total": "2000000000000000000000000",
+            "matching_amount": "10000000000000000000000000",
+            "matching_share": 1.0,
+        },
+        {
+            "project_id": "project2.near",
+            "donors_count": 1,
+            "donations_total": "5000000000000000000000000",
+            "matching_amount": "0",
+            "matching_share": 0.0,
+        },
+    ],
+}
@@ -0,0 +1,49 @@
+from django.http import HttpResponse, HttpResponseNotModified
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Token
+
+# icons are addressed by the hash of their content, so a URL's response never changes
+ICON_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# icons can be SVGs, which must not be able to run scripts on this origin
+ICON_CONTENT_SECURITY_POLICY = "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+
+
+class TokenIconAPI(APIView):
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("icon_hash", str, OpenApiParameter.PATH),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=OpenApiTypes.BINARY,
+                description="Returns the token icon image (cacheable indefinitely)",
+            ),
+            304: OpenApiResponse(description="Icon not modified"),
+            404: OpenApiResponse(description="Icon not found"),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs):
+        icon_hash = kwargs.get("icon_hash")
+        etag = f'"{icon_hash}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            token = Token.objects.filter(icon_hash=icon_hash).only("icon").first()
+            icon = token.decode_icon() if token else None
+            if icon is None:
+                return Response(
+                    {"message": f"Icon with hash {icon_hash} not found."}, status=404
+                )
+            content_type, content = icon
+            response = HttpResponse(content, content_type=content_type)
+            response["Content-Security-Policy"] = ICON_CONTENT_SECURITY_POLICY
+            response["X-Content-Type-Options"] = "nosniff"
+        response["ETag"] = etag
+        response["Cache-Control"] = ICON_CACHE_CONTROL
+        return response
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-19 15:05
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_icon_hash(apps, schema_editor):
+    Token = apps.get_model("tokens", "Token")
+    tokens = []
+    for token in Token.objects.filter(icon__startswith="data:").only("account", "icon"):
+        token.icon_hash = hashlib.sha256(token.icon.encode()).hexdigest()
+        tokens.append(token)
+    Token.objects.bulk_update(tokens, ["icon_hash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tokens", "0006_rename_id_token_account"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="token",
+            name="icon_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="SHA-256 of the icon data URL, used in its asset URL.",
+                max_length=64,
+                null=True,
+                verbose_name="icon hash",
+            ),
+        ),
+        migrations.RunPython(
+            backfill_icon_hash, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -1,6 +1,10 @@
+import base64
+import binascii
+import hashlib
 from datetime import timedelta
 from decimal import Decimal
 from os import name
+from urllib.parse import unquote_to_bytes
 
 import requests
 from django.conf import settings
@@ -40,6 +44,14 @@ class Token(models.Model):
         blank=True,
         help_text=_("Token icon (base64 data URL)."),
     )
+    icon_hash = models.CharField(
+        _("icon hash"),
+        max_length=64,
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text=_("SHA-256 of the icon data URL, used in its asset URL."),
+    )
     decimals = models.PositiveIntegerField(
         _("decimals"),
         null=False,
@@ -53,6 +65,36 @@ class Token(models.Model):
         help_text=_("Token id on coingecko."),
     )
 
+    @staticmethod
+    def hash_icon(icon):
+        if not icon or not icon.startswith("data:"):
+            return None  # icons given as URLs are linked to directly
+        return hashlib.sha256(icon.encode()).hexdigest()
+
+    def decode_icon(self):
+        """(content type, bytes) of the icon data URL, or None if it isn't a valid image data URL."""
+        header, sep, data = (self.icon or "").partition(",")
+        if not sep or not header.startswith("data:"):
+            return None
+        content_type, *params = header[len("data:") :].split(";")
+        if not content_type.startswith("image/"):
+            return None
+        try:
+            if "base64" in params:
+                return content_type, base64.b64decode(data)
+            return content_type, unquote_to_bytes(data)
+        except (binascii.Error, ValueError):
+            return None
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        # saves that don't write the icon (e.g. price updates) needn't hash it
+        if update_fields is None or "icon" in update_fields:
+            self.icon_hash = self.hash_icon(self.icon)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "icon_hash"}
+        super().save(*args, **kwargs)
+
     def get_most_recent_price(self):
         return self.historical_prices.order_by("-timestamp").first()
 
@@ -103,29 +145,29 @@ class Token(models.Model):
                 return Decimal(price_usd)
         return None
 
-    def save(self, *args, **kwargs):
+    ### Looks up the token's coingecko id by symbol (run as a background job, never from the indexer)
+    def fetch_coingecko_id(self):
         try:
-            if self._state.adding:
-                endpoint = f"{settings.COINGECKO_URL}/coins/list?include_platform=true"
-                if settings.COINGECKO_API_KEY:
-                    endpoint += f"&x_cg_pro_api_key={settings.COINGECKO_API_KEY}"
-                response = requests.get(endpoint)
-                logger.info(f"coingecko response: {response}")
-                if response.status_code == 429:
-                    logger.warning("Coingecko rate limit exceeded")
-                price_data = response.json()
-                coin_data = list(
-                    filter(
-                        lambda x: x["symbol"] == kwargs["symbol"]
-                        and x["platforms"].get("near-protocol"),
-                        price_data,
-                    )
+            endpoint = f"{settings.COINGECKO_URL}/coins/list?include_platform=true"
+            if settings.COINGECKO_API_KEY:
+                endpoint += f"&x_cg_pro_api_key={settings.COINGECKO_API_KEY}"
+            response = requests.get(endpoint)
+            logger.info(f"coingecko response: {response}")
+            if response.status_code == 429:
+                logger.warning("Coingecko rate limit exceeded")
+            price_data = response.json()
+            coin_data = list(
+                filter(
+                    lambda x: x["symbol"] == self.symbol
+                    and x["platforms"].get("near-protocol"),
+                    price_data,
                 )
-                if coin_data:
-                    self.coingecko_id = coin_data[0]["id"]
+            )
+            if coin_data:
+                self.coingecko_id = coin_data[0]["id"]
+                self.save(update_fields=["coingecko_id"])
         except Exception as e:
             logger.error(f"Failed to fetch token id from coingecko: {e}")
-        super().save(*args, **kwargs)
 
 
 class TokenHistoricalPrice(models.Model):
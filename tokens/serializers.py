@@ -1,4 +1,5 @@
-from rest_framework.serializers import ModelSerializer
+from django.urls import reverse
+from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
 from tokens.models import Token
 
@@ -7,7 +8,16 @@ class TokenSerializer(ModelSerializer):
 
     class Meta:
         model = Token
-        fields = "__all__"
+        exclude = ["icon"]
+
+    icon_url = SerializerMethodField()
+
+    def get_icon_url(self, obj) -> str | None:
+        if obj.icon_hash is None:
+            return obj.icon or None  # URL icons (data URLs always have a hash)
+        url = reverse("token_icon_api", kwargs={"icon_hash": obj.icon_hash})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
 
 
 SIMPLE_TOKEN_EXAMPLE = {"id": "near", "decimals": 24}